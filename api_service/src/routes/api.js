@@ -265,6 +265,62 @@ router.get('/model-stats/:modelName', async (req, res) => {
     }
 });
 
+/**
+ * GET /api/price-grid/:modelId
+ * Modelin tüm storage x durum fiyatları - hücre başına ayrı tahmin çağrısı yerine
+ */
+router.get('/price-grid/:modelId', async (req, res) => {
+    try {
+        const grid = await grpcClient.getPriceGrid(parseInt(req.params.modelId));
+        
+        res.json({
+            success: true,
+            data: grid
+        });
+    } catch (error) {
+        console.error('Fiyat matrisi hatası:', error);
+        res.status(503).json({
+            success: false,
+            error: error.message || 'Fiyat matrisi alınamadı'
+        });
+    }
+});
+
+/**
+ * POST /api/explain
+ * Tahminin feature katkıları - fiyatın neden bu çıktığını gösterir
+ */
+router.post('/explain', async (req, res) => {
+    try {
+        const { model_id, ram_gb, storage_gb, condition } = req.body;
+        
+        if (!model_id || !ram_gb || !storage_gb || !condition) {
+            return res.status(400).json({
+                success: false,
+                error: 'Eksik parametreler: model_id, ram_gb, storage_gb, condition gerekli'
+            });
+        }
+        
+        const explanation = await grpcClient.explainPrice({
+            model_id: parseInt(model_id),
+            ram_gb: parseInt(ram_gb),
+            storage_gb: parseInt(storage_gb),
+            condition
+        });
+        
+        res.json({
+            success: true,
+            data: explanation
+        });
+    } catch (error) {
+        console.error('Açıklama hatası:', error);
+        res.status(503).json({
+            success: false,
+            error: error.message || 'Açıklama alınamadı'
+        });
+    }
+});
+
 /**
  * POST /api/predict
  * Fiyat tahmini yap (Ana endpoint)
@@ -313,7 +369,9 @@ router.post('/predict', async (req, res) => {
                     price_tl: prediction.predicted_price,
                     price_usd: usdConversion.amount_usd,
                     confidence: prediction.confidence_score,
-                    range: prediction.price_range
+                    range: prediction.price_range,
+                    // Sunucu aşırı yükte yedek modeli kullandıysa veya gRPC'ye ulaşılamadıysa true
+                    degraded: prediction.degraded
                 },
                 exchange_rate: usdConversion.exchange_rate,
                 input: {
@@ -369,6 +427,7 @@ function calculateFallbackPrice(model_id, ram_gb, storage_gb, condition) {
     return {
         predicted_price: predictedPrice,
         confidence_score: 75.0,
+        degraded: true,
         price_range: {
             min: Math.round(predictedPrice - variance),
             max: Math.round(predictedPrice + variance)
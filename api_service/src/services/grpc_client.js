@@ -59,7 +59,8 @@ function predictPrice(phoneSpec) {
                         max: response.price_range.max_price
                     },
                     status: response.status,
-                    message: response.message
+                    message: response.message,
+                    degraded: response.degraded || false
                 });
             }
         });
@@ -87,6 +88,74 @@ function getModelInfo(modelId) {
     });
 }
 
+/**
+ * Modelin tüm storage x durum kombinasyonlarının fiyatları (tek çağrı)
+ */
+function getPriceGrid(modelId) {
+    return new Promise((resolve, reject) => {
+        client.GetPriceGrid({ model_id: modelId }, (error, response) => {
+            if (error) {
+                reject(error);
+            } else if (response.status !== 'success') {
+                reject(new Error(response.message));
+            } else {
+                resolve({
+                    model_name: response.model_name,
+                    model_version: response.model_version,
+                    cells: response.cells.map(cell => ({
+                        storage_gb: cell.storage_gb,
+                        ram_gb: cell.ram_gb,
+                        condition: cell.condition,
+                        predicted_price: cell.predicted_price,
+                        confidence_score: cell.confidence_score,
+                        price_range: {
+                            min: cell.price_range.min_price,
+                            max: cell.price_range.max_price
+                        }
+                    }))
+                });
+            }
+        });
+    });
+}
+
+/**
+ * Tahmini feature katkılarına ayır (TreeSHAP): base_value + katkılar = predicted_price
+ */
+function explainPrice(phoneSpec) {
+    return new Promise((resolve, reject) => {
+        const request = {
+            specs: [{
+                model_id: phoneSpec.model_id,
+                ram_gb: phoneSpec.ram_gb,
+                storage_gb: phoneSpec.storage_gb,
+                condition: phoneSpec.condition
+            }]
+        };
+        
+        client.ExplainPrice(request, (error, response) => {
+            if (error) {
+                reject(error);
+            } else if (response.status !== 'success') {
+                reject(new Error(response.message));
+            } else {
+                const explanation = response.explanations[0];
+                resolve({
+                    predicted_price: explanation.predicted_price,
+                    base_value: explanation.base_value,
+                    contributions: explanation.contributions.map(item => ({
+                        feature: item.feature,
+                        value: item.value,
+                        contribution: item.contribution
+                    })),
+                    model_version: response.model_version,
+                    degraded: response.degraded || false
+                });
+            }
+        });
+    });
+}
+
 /**
  * Health check
  */
@@ -110,6 +179,8 @@ function healthCheck() {
 module.exports = {
     predictPrice,
     getModelInfo,
+    getPriceGrid,
+    explainPrice,
     healthCheck
 };
 
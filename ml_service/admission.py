@@ -0,0 +1,142 @@
+"""
+Admission control - aşırı yükte isteği işlemeden önce reddeder (load shedding)
+
+Eşzamanlı istek limiti gözlenen gecikmeye göre uyarlanır (gradient yöntemi):
+    gradient = clamp(tolerance * uzun_vadeli_gecikme / son_gecikme, 0.5, 1.0)
+    yeni_limit = limit * gradient + sqrt(limit)
+Gecikme taban değerin üstüne çıktıkça limit küçülür, sistem rahatladıkça yavaşça büyür.
+Deadline'ı aşan isteklerde limit çarpımsal olarak düşürülür (AIMD).
+
+Gecikmeler RPC türüne göre ayrı ve satır başına tutulur (gecikme / satır sayısı): 5000
+satırlık bir batch'in süresi tek tahminlerin tabanını şişirmez; gradient sadece aynı
+türün kendi tabanıyla karşılaştırılmasından hesaplanır. Deadline kontrolü de türün
+satır başı gecikmesi x istekteki satır sayısıyla yapılır.
+
+Limit dolduysa RESOURCE_EXHAUSTED, kalan deadline tahmini servis süresinden kısaysa
+DEADLINE_EXCEEDED ile hemen dönülür; kuyrukta bekleyip zaten zaman aşımına uğrayacak
+isteklere CPU harcanmaz.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import grpc
+
+
+class _MethodLatency:
+    """Bir RPC türünün satır başına gecikme EWMA'ları (saniye)"""
+    __slots__ = ('recent', 'baseline')
+
+    def __init__(self, per_row: float):
+        self.recent = per_row      # kısa vadeli, deadline tahmini için
+        self.baseline = per_row    # uzun vadeli taban
+
+
+class AdmissionController:
+    """Gecikmeye göre uyarlanan eşzamanlılık limiti"""
+
+    def __init__(self, initial_limit: float, min_limit: int, max_limit: int,
+                 tolerance: float = 2.0, smoothing: float = 0.2, baseline_alpha: float = 0.01,
+                 backoff: float = 0.9):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline_alpha = baseline_alpha
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.latency: Dict[str, _MethodLatency] = {}
+        self.admitted = 0
+        self.rejected = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, max_workers: int) -> 'AdmissionController':
+        # HealthCheck'in her zaman boş bir worker bulabilmesi için birkaç thread ayrılır
+        max_limit = max(config['min_limit'], max_workers - config['reserved_workers'])
+        return cls(
+            initial_limit=min(config['initial_limit'], max_limit),
+            min_limit=config['min_limit'],
+            max_limit=max_limit,
+            tolerance=config['tolerance'],
+            smoothing=config['smoothing'],
+            baseline_alpha=config['baseline_alpha'],
+            backoff=config['backoff']
+        )
+
+    def try_acquire(self, time_remaining=None, method: str = '', rows: int = 1) -> grpc.StatusCode:
+        """Kabul edilirse None, edilmezse reddetme kodu"""
+        with self._lock:
+            stats = self.latency.get(method)
+            if time_remaining is not None and stats is not None \
+                    and time_remaining < stats.recent * max(rows, 1):
+                self.expired += 1
+                return grpc.StatusCode.DEADLINE_EXCEEDED
+            if self.in_flight >= int(self.limit):
+                self.rejected += 1
+                return grpc.StatusCode.RESOURCE_EXHAUSTED
+            self.in_flight += 1
+            self.admitted += 1
+            return None
+
+    def release(self, latency: float, dropped: bool = False, method: str = '', rows: int = 1):
+        """İstek bitti: gözlenen (satır başı) gecikmeyle limiti güncelle"""
+        with self._lock:
+            self.in_flight -= 1
+            if dropped:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                return
+
+            per_row = latency / max(rows, 1)
+            stats = self.latency.get(method)
+            if stats is None:
+                self.latency[method] = _MethodLatency(per_row)
+                return
+            stats.recent += 0.2 * (per_row - stats.recent)
+            stats.baseline += self.baseline_alpha * (per_row - stats.baseline)
+            # Taban değer gecikme artışını yavaşça takip eder; tolerance katına kadar fark edilmez
+            gradient = min(1.0, max(0.5, self.tolerance * stats.baseline / max(per_row, 1e-9)))
+            new_limit = self.limit * gradient + math.sqrt(self.limit)
+            self.limit += self.smoothing * (new_limit - self.limit)
+            self.limit = min(self.max_limit, max(self.min_limit, self.limit))
+
+    @contextmanager
+    def admit(self, context, method: str = '', rows: int = 1):
+        """
+        RPC gövdesini sarar; reddedilirse context.abort ile hemen döner
+
+        method: gecikme istatistiğinin tutulduğu RPC türü
+        rows: istekteki satır (spec) sayısı
+        """
+        status = self.try_acquire(context.time_remaining(), method, rows)
+        if status == grpc.StatusCode.RESOURCE_EXHAUSTED:
+            context.abort(status, 'Sunucu aşırı yüklü, daha sonra tekrar deneyin')
+        elif status == grpc.StatusCode.DEADLINE_EXCEEDED:
+            context.abort(status, 'Deadline işlem süresinden kısa')
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            remaining = context.time_remaining()
+            self.release(time.perf_counter() - started, dropped=remaining is not None and remaining <= 0,
+                         method=method, rows=rows)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'limit': round(self.limit, 2),
+                'in_flight': self.in_flight,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'expired': self.expired,
+                # Satır başına gecikmeler (ms)
+                'latency_ms': {method: round(stats.recent * 1000, 3) for method, stats in self.latency.items()},
+                'baseline_ms': {method: round(stats.baseline * 1000, 3) for method, stats in self.latency.items()}
+            }
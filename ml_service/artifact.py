@@ -0,0 +1,294 @@
+"""
+Model artifact bundle - joblib pickle yerine manifest + ham .npy dizileri
+
+Bundle yapısı (models/bundle/):
+    manifest.json     feature_cols, use_scaler, metrics, scaler mean/scale, dizi listesi
+    left.npy          sol çocuk (global node index)
+    right.npy         sağ çocuk (global node index)
+    feature.npy       bölünen feature
+    threshold.npy     eşik (x <= threshold ise sola)
+    value.npy         node değeri (yapraklarda tahmin)
+    cover.npy         node'a düşen (ağırlıklı) örnek sayısı
+    tree_offsets.npy  her ağacın kök index'i + sonda toplam node sayısı
+    residual_*.npy    conformal aralıklar için out-of-fold residual index'i (intervals.py)
+
+Tüm ağaçlar tek dizide art arda durur. Yapraklarda left == right == node
+(self-loop) olduğundan tahmin, maske kullanmadan max_depth adım ilerlenerek
+vektörize yapılır. Diziler np.load(mmap_mode='r') ile açılır; aynı makinedeki
+process'ler sayfaları paylaşır ve yükleme süresi model boyutuyla büyümez.
+Sadece numpy gerekir - servis yolunda sklearn/joblib import edilmez.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# Random Forest güven skoru ilk 20 ağaçtan, Gradient Boosting son 10 stage'den hesaplanır
+FOREST_SPREAD_TREES = 20
+BOOSTING_SPREAD_STAGES = 10
+
+# Büyük batch'ler bu kadar satırlık bloklarla değerlendirilir
+ROW_BLOCK = 1024
+
+
+def _atomic_write_bytes(path: str, data: bytes):
+    """Yeni inode'a yaz ve rename et - eski dosyayı mmap'lemiş process'ler etkilenmez"""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _atomic_save_array(path: str, array: np.ndarray):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp_path, path)
+
+
+def _flatten_trees(trees) -> Dict[str, np.ndarray]:
+    """sklearn Tree nesnelerini tek bir global node dizisine aç"""
+    lefts, rights, features, thresholds, values, covers = [], [], [], [], [], []
+    offsets = [0]
+
+    for tree in trees:
+        base = offsets[-1]
+        node_ids = np.arange(tree.node_count, dtype=np.int64) + base
+        is_leaf = tree.children_left == -1
+
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left + base))
+        rights.append(np.where(is_leaf, node_ids, tree.children_right + base))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        values.append(tree.value[:, 0, 0])
+        covers.append(tree.weighted_n_node_samples)
+        offsets.append(base + tree.node_count)
+
+    return {
+        'left': np.concatenate(lefts).astype(np.int32),
+        'right': np.concatenate(rights).astype(np.int32),
+        'feature': np.concatenate(features).astype(np.int32),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'value': np.concatenate(values).astype(np.float64),
+        'cover': np.concatenate(covers).astype(np.float64),
+        'tree_offsets': np.asarray(offsets, dtype=np.int32)
+    }
+
+
+def export_bundle(model, scaler, config: Dict, bundle_dir: str,
+                  extra_arrays: Optional[Dict[str, np.ndarray]] = None) -> str:
+    """
+    Eğitilmiş sklearn modelini bundle olarak yaz
+
+    Desteklenen modeller: RandomForestRegressor, GradientBoostingRegressor,
+    DecisionTreeRegressor ve doğrusal modeller (coef_/intercept_).
+    extra_arrays: modelle birlikte yazılacak ek diziler (örn. intervals.py residual index'i)
+    """
+    manifest = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'variant': 'full',
+        'model_name': config['model_name'],
+        'feature_cols': list(config['feature_cols']),
+        'use_scaler': bool(config['use_scaler']),
+        'metrics': {k: float(v) for k, v in config['metrics'].items()},
+        'scaler': {
+            'mean': [float(v) for v in scaler.mean_],
+            'scale': [float(v) for v in scaler.scale_]
+        },
+        'created_at': datetime.now().isoformat(timespec='seconds')
+    }
+
+    arrays = {}
+    if hasattr(model, 'staged_predict') and hasattr(model, 'estimators_'):
+        # Gradient Boosting: estimators_ (n_stages, 1) şeklinde
+        trees = [stage[0].tree_ for stage in model.estimators_]
+        manifest['kind'] = 'boosting'
+        manifest['learning_rate'] = float(model.learning_rate)
+        init = getattr(model, 'init_', None)
+        manifest['init_value'] = float(np.ravel(init.constant_)[0]) if hasattr(init, 'constant_') else 0.0
+    elif hasattr(model, 'estimators_'):
+        trees = [est.tree_ for est in model.estimators_]
+        manifest['kind'] = 'forest'
+    elif hasattr(model, 'tree_'):
+        trees = [model.tree_]
+        manifest['kind'] = 'tree'
+    elif hasattr(model, 'coef_'):
+        trees = []
+        manifest['kind'] = 'linear'
+        manifest['coef'] = [float(v) for v in np.ravel(model.coef_)]
+        manifest['intercept'] = float(np.ravel(model.intercept_)[0])
+    else:
+        raise ValueError(f"Bundle'a yazılamayan model tipi: {type(model).__name__}")
+
+    if trees:
+        arrays = _flatten_trees(trees)
+        manifest['n_trees'] = len(trees)
+        manifest['max_depth'] = int(max(tree.max_depth for tree in trees))
+    arrays.update(extra_arrays or {})
+
+    return write_bundle(manifest, arrays, bundle_dir)
+
+
+def write_bundle(manifest: Dict, arrays: Dict[str, np.ndarray], bundle_dir: str) -> str:
+    """Dizileri ve manifest'i yaz; model_version dizi içeriğinden türetilir"""
+    os.makedirs(bundle_dir, exist_ok=True)
+    manifest = dict(manifest)
+
+    digest = hashlib.sha1(json.dumps(manifest, sort_keys=True).encode('utf-8'))
+    manifest['arrays'] = {}
+    for name, array in arrays.items():
+        _atomic_save_array(os.path.join(bundle_dir, f"{name}.npy"), array)
+        manifest['arrays'][name] = {'dtype': str(array.dtype), 'shape': list(array.shape)}
+        digest.update(array.tobytes())
+    manifest['model_version'] = digest.hexdigest()[:12]
+
+    # Manifest en son yazılır: okuyucular yarım bir bundle görmez
+    _atomic_write_bytes(
+        os.path.join(bundle_dir, MANIFEST_NAME),
+        json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+    )
+    return bundle_dir
+
+
+def bundle_exists(bundle_dir: str) -> bool:
+    return os.path.exists(os.path.join(bundle_dir, MANIFEST_NAME))
+
+
+def read_manifest(bundle_dir: str) -> Dict:
+    with open(os.path.join(bundle_dir, MANIFEST_NAME), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen bundle formatı: {manifest.get('format_version')}")
+    return manifest
+
+
+def load_bundle(bundle_dir: str, mmap: bool = True):
+    """Bundle'ı yükle, (model, config) döndür - config joblib'deki model_config ile aynı şekilde"""
+    manifest = read_manifest(bundle_dir)
+
+    arrays = {}
+    for name in manifest.get('arrays', {}):
+        array = np.load(os.path.join(bundle_dir, f"{name}.npy"), mmap_mode='r' if mmap else None)
+        # np.memmap alt sınıfını at: indexleme sonuçları düz ndarray olsun (kopya yok)
+        arrays[name] = array.view(np.ndarray)
+
+    if manifest['kind'] == 'linear':
+        model = LinearBundleModel(manifest)
+    else:
+        model = TreeEnsembleModel(manifest, arrays)
+
+    config = {
+        'model_name': manifest['model_name'],
+        'feature_cols': manifest['feature_cols'],
+        'use_scaler': manifest['use_scaler'],
+        'metrics': manifest['metrics'],
+        'model_version': manifest['model_version'],
+        'bundle_variant': manifest.get('variant', 'full')
+    }
+    return model, config
+
+
+class TreeEnsembleModel:
+    """Bundle dizileri üzerinde çalışan vektörize ağaç değerlendirici"""
+
+    def __init__(self, manifest: Dict, arrays: Dict[str, np.ndarray]):
+        self.manifest = manifest
+        self.kind = manifest['kind']
+        self.n_trees = manifest['n_trees']
+        self.max_depth = manifest['max_depth']
+        self.learning_rate = manifest.get('learning_rate', 1.0)
+        self.init_value = manifest.get('init_value', 0.0)
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.value = arrays['value']
+        self.cover = arrays['cover']
+        self.tree_offsets = arrays['tree_offsets']
+        # Compact varyantta değerler int16: value = offset + q * scale
+        quantization = manifest.get('quantization') or {}
+        self.value_scale = quantization.get('value_scale')
+        self.value_offset = quantization.get('value_offset', 0.0)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.left, self.right, self.feature, self.threshold,
+                                      self.value, self.cover, self.tree_offsets))
+
+    def leaf_indices(self, X: np.ndarray, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """[start, stop) aralığındaki ağaçlar için her satırın düştüğü yaprak: (n_trees, n)"""
+        # sklearn de karşılaştırmayı float32'ye çevrilmiş X ile yapar
+        X = np.asarray(X, dtype=np.float32)
+        roots = self.tree_offsets[start:self.n_trees if stop is None else stop]
+        if X.shape[0] > ROW_BLOCK:
+            # Büyük batch'lerde ara diziler cache'te kalsın diye satır blokları halinde ilerle
+            return np.concatenate([self._walk(X[i:i + ROW_BLOCK], roots)
+                                   for i in range(0, X.shape[0], ROW_BLOCK)], axis=1)
+        return self._walk(X, roots)
+
+    def _walk(self, X: np.ndarray, roots: np.ndarray) -> np.ndarray:
+        rows = np.arange(X.shape[0])[None, :]
+        node = np.repeat(roots[:, None], X.shape[0], axis=1)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def tree_values(self, X: np.ndarray, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Her ağacın ham çıktısı: (n_trees, n)"""
+        return self.node_values(self.leaf_indices(X, start, stop))
+
+    def node_values(self, nodes: np.ndarray) -> np.ndarray:
+        """Node değerlerini float64 olarak oku (gerekirse dequantize et)"""
+        values = self.value[nodes]
+        if self.value_scale is not None:
+            return values * self.value_scale + self.value_offset
+        return values.astype(np.float64, copy=False)
+
+    def combine(self, tree_values: np.ndarray) -> np.ndarray:
+        """Ağaç çıktılarını ensemble tahminine çevir"""
+        if self.kind == 'boosting':
+            return self.init_value + self.learning_rate * tree_values.sum(axis=0)
+        return tree_values.mean(axis=0)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.combine(self.tree_values(X))
+
+    def predict_with_spread(self, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Tahmin + güven skoru için üye tahminleri (k, n)"""
+        values = self.tree_values(X)
+        if self.kind == 'boosting':
+            staged = self.init_value + self.learning_rate * np.cumsum(values, axis=0)
+            return staged[-1], staged[-BOOSTING_SPREAD_STAGES:]
+        if self.kind == 'forest':
+            return values.mean(axis=0), values[:FOREST_SPREAD_TREES]
+        return values[0], None
+
+
+class LinearBundleModel:
+    """Doğrusal model (Linear/Ridge) - scaler bundle içinde uygulanır"""
+
+    def __init__(self, manifest: Dict):
+        self.kind = 'linear'
+        self.use_scaler = manifest['use_scaler']
+        self.mean = np.asarray(manifest['scaler']['mean'])
+        self.scale = np.asarray(manifest['scaler']['scale'])
+        self.coef = np.asarray(manifest['coef'])
+        self.intercept = manifest['intercept']
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.use_scaler:
+            X = (X - self.mean) / self.scale
+        return X @ self.coef + self.intercept
+
+    def predict_with_spread(self, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        return self.predict(X), None
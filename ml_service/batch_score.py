@@ -0,0 +1,162 @@
+"""
+Toplu fiyatlama - CSV/Parquet envanter dosyalarını çok process'li olarak skorlar
+Kullanım:
+    python batch_score.py envanter.csv fiyatli.csv [--workers 8] [--chunk-size 50000]
+
+Girdi kolonları: model_name (veya model_id), storage_gb, condition, ram_gb (opsiyonel)
+Eksik değerler predictor ile aynı kurallarla doldurulur. Çıktı, girdinin tüm kolonlarına
+predicted_price, confidence_score, min_price, max_price eklenmiş halidir.
+Dosya parça parça okunur/yazılır; bellek kullanımı girdi boyutuyla büyümez.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+
+from config import BATCH_SCORE_CONFIG
+from encoder import FeatureEncoder
+
+OUTPUT_COLUMNS = ['predicted_price', 'confidence_score', 'min_price', 'max_price']
+
+# Her worker process'te bir kez yüklenir (bundle mmap'li olduğundan sayfalar paylaşılır)
+_predictor = None
+
+
+def _init_worker():
+    global _predictor
+    from predictor import PricePredictor
+    _predictor = PricePredictor(with_shadow=False, with_fallback=False)
+
+
+def _score_chunk(model_index: np.ndarray, ram_gb: np.ndarray, storage_gb: np.ndarray,
+                 condition_code: np.ndarray) -> Dict[str, np.ndarray]:
+    """Worker: kodlanmış kolonlardan feature matrisi kur ve skorla"""
+    encoder = _predictor.encoder
+    if encoder.ram_col >= 0:
+        # RAM verilmemiş satırlar modelin varsayılan RAM'ini alır
+        default_ram = encoder.matrix[model_index, encoder.ram_col]
+        ram_gb = np.where(np.isnan(ram_gb), default_ram, ram_gb)
+    X = encoder.encode_batch(model_index, ram_gb, storage_gb, condition_code)
+    scores = _predictor.predict_matrix(X)
+    return {name: np.round(scores[name], 2) for name in OUTPUT_COLUMNS}
+
+
+def _encode_columns(chunk: pd.DataFrame, encoder) -> tuple:
+    """Ana process: isim/durum kolonlarını tamsayı kodlara çevir (worker'a küçük diziler gider)"""
+    n = len(chunk)
+    if 'model_name' in chunk:
+        model_index = chunk['model_name'].map(encoder.name_to_index).fillna(encoder.default_index).to_numpy(np.intp)
+    elif 'model_id' in chunk:
+        model_index = encoder.db_indices(chunk['model_id'].fillna(-1).to_numpy(np.intp))
+    else:
+        model_index = np.full(n, encoder.default_index, dtype=np.intp)
+
+    if 'condition' in chunk:
+        condition_code = (chunk['condition'].map(encoder.condition_to_code)
+                          .fillna(encoder.default_condition_code).to_numpy(np.intp))
+    else:
+        condition_code = np.full(n, encoder.default_condition_code, dtype=np.intp)
+
+    storage_gb = (pd.to_numeric(chunk['storage_gb'], errors='coerce').fillna(128).to_numpy(np.float32)
+                  if 'storage_gb' in chunk else np.full(n, 128, dtype=np.float32))
+    ram_gb = (pd.to_numeric(chunk['ram_gb'], errors='coerce').to_numpy(np.float32)
+              if 'ram_gb' in chunk else np.full(n, np.nan, dtype=np.float32))
+    return model_index, ram_gb, storage_gb, condition_code
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            sys.exit("Parquet için pyarrow gerekli: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class _ChunkWriter:
+    """Sonuçları girdiyle aynı formatta parça parça yazar"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet_writer = None
+        self.first = True
+
+    def write(self, chunk: pd.DataFrame):
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self.path, mode='w' if self.first else 'a', header=self.first, index=False)
+        self.first = False
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+
+def score_file(input_path: str, output_path: str, workers: int, chunk_size: int) -> int:
+    """Dosyayı skorla, toplam satır sayısını döndür"""
+    # Kodlama feature sırasından bağımsız; isim/durum tabloları için encoder yeterli
+    encoder = FeatureEncoder([])
+    writer = _ChunkWriter(output_path)
+    pending = deque()
+    total = 0
+    started = time.perf_counter()
+
+    def flush_one():
+        nonlocal total
+        chunk, future = pending.popleft()
+        for name, values in future.result().items():
+            chunk[name] = values
+        writer.write(chunk)
+        total += len(chunk)
+        elapsed = time.perf_counter() - started
+        print(f"\r  {total:,} satır  |  {total / max(elapsed, 1e-9):,.0f} satır/sn",
+              end='', file=sys.stderr, flush=True)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for chunk in _read_chunks(input_path, chunk_size):
+            pending.append((chunk, pool.submit(_score_chunk, *_encode_columns(chunk, encoder))))
+            # Uçuştaki parça sayısı sınırlı: bellek girdi boyutuyla büyümez, sıra korunur
+            while len(pending) > workers * 2:
+                flush_one()
+        while pending:
+            flush_one()
+
+    writer.close()
+    print(file=sys.stderr)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CSV/Parquet envanter dosyasını toplu fiyatla')
+    parser.add_argument('input', help='Girdi dosyası (.csv veya .parquet)')
+    parser.add_argument('output', help='Çıktı dosyası (.csv veya .parquet)')
+    parser.add_argument('--workers', type=int, default=BATCH_SCORE_CONFIG['workers'])
+    parser.add_argument('--chunk-size', type=int, default=BATCH_SCORE_CONFIG['chunk_size'])
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    total = score_file(args.input, args.output, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    print(f"[OK] {total:,} satır skorlandı: {os.path.abspath(args.output)}")
+    print(f"     Süre: {elapsed:.1f} sn ({total / max(elapsed, 1e-9):,.0f} satır/sn, {args.workers} worker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Canlı trafik kaydı (capture) - örneklenen tahmin isteklerini ikili bir log'a yazar
+
+Dosya yapısı (captures/capture-<zaman>-<pid>.bin):
+    MAGIC
+    <I  header uzunluğu, ardından JSON header (model_version, pid, created_at)
+    kayıtlar:
+        <qBII  varış zamanı (unix ns), RPC türü, istek uzunluğu, yanıt uzunluğu
+        istek bytes   (PhoneSpec / PriceBatchRequest / ColumnarPriceRequest, serialize)
+        yanıt bytes   (reddedilen/abort edilen çağrılarda boş)
+
+İstek thread'i sadece serialize edip bellek tamponuna ekler; diske yazma, dosya
+döndürme (max_file_bytes) ve eski dosyaları silme (max_files) arka plandaki flush
+thread'inde yapılır. Tampon max_buffer_bytes'ı aşarsa kayıt düşürülür.
+
+Okuma: read_capture(path) / read_captures(paths) - replay.py kullanır.
+"""
+
+import atexit
+import glob
+import heapq
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from structured_logging import RequestLogSampler
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'IPCAP1\n'
+_HEADER_LEN = struct.Struct('<I')
+_RECORD = struct.Struct('<qBII')
+
+# RPC türleri
+KIND_PREDICT = 0
+KIND_BATCH = 1
+KIND_COLUMNAR = 2
+KIND_NAMES = {KIND_PREDICT: 'PredictPrice', KIND_BATCH: 'PredictPriceBatch',
+              KIND_COLUMNAR: 'PredictPriceColumnar'}
+
+
+class CapturedCall:
+    """RPC gövdesinin yanıtı bıraktığı yer (servicer: call.response = ...)"""
+    __slots__ = ('response',)
+
+    def __init__(self):
+        self.response = None
+
+
+class CaptureRecord(NamedTuple):
+    arrival_ns: int
+    kind: int
+    request: bytes
+    response: bytes
+    model_version: str
+
+
+class TrafficCapture:
+    """Örneklenen istekleri tamponlayıp dönen dosyalara yazan kaydedici"""
+
+    def __init__(self, directory: str, config: Dict):
+        self.directory = directory
+        self.config = config
+        self.sampler = RequestLogSampler(config['sample_rate'])
+        self.model_version = ''
+        self.records = 0
+        self.dropped = 0
+        self.files_written = 0
+
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._file = None
+        self._file_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self._thread = threading.Thread(target=self._run, name='capture-flush', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'TrafficCapture':
+        return cls(config['dir'], config)
+
+    @contextmanager
+    def call(self, kind: int, request, arrival_ns: Optional[int] = None):
+        """
+        RPC'yi sarar; örneklendiyse bitişte (abort dahil) istek + yanıtı kaydeder
+
+        arrival_ns: isteğin sunucuya geliş anı (unix ns); verilmezse şimdi. Kuyrukta
+        bekleme dahil edilmezse replay yük altındaki gelişleri sıkıştırılmış oynatır.
+        """
+        call = CapturedCall()
+        if not self.sampler.sample():
+            yield call
+            return
+        if arrival_ns is None:
+            arrival_ns = time.time_ns()
+        try:
+            yield call
+        finally:
+            self.record(kind, arrival_ns, request, call.response)
+
+    def record(self, kind: int, arrival_ns: int, request, response=None):
+        request_bytes = request.SerializeToString()
+        response_bytes = response.SerializeToString() if response is not None else b''
+        with self._lock:
+            if len(self._buffer) >= self.config['max_buffer_bytes']:
+                self.dropped += 1
+                return
+            self._buffer += _RECORD.pack(arrival_ns, kind, len(request_bytes), len(response_bytes))
+            self._buffer += request_bytes
+            self._buffer += response_bytes
+            self.records += 1
+            full = len(self._buffer) >= self.config['flush_bytes']
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.config['flush_interval_sec'])
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning("Capture yazılamadı: %s", e)
+
+    def flush(self):
+        """Tamponu diske yaz (sadece flush thread'i ve close çağırır)"""
+        with self._lock:
+            data, self._buffer = self._buffer, bytearray()
+        if not data:
+            return
+        if self._file is None or self._file_bytes >= self.config['max_file_bytes']:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._file_bytes += len(data)
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.directory, f"capture-{stamp}-{os.getpid()}.bin")
+        header = json.dumps({
+            'model_version': self.model_version,
+            'pid': os.getpid(),
+            'created_at': datetime.now().isoformat(timespec='seconds')
+        }).encode('utf-8')
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + _HEADER_LEN.pack(len(header)) + header)
+        self._file_bytes = self._file.tell()
+        self.files_written += 1
+
+        # En eski dosyalar silinir (tüm process'lerin dosyaları birlikte sayılır)
+        paths = sorted(glob.glob(os.path.join(self.directory, 'capture-*.bin')))
+        for old in paths[:max(0, len(paths) - self.config['max_files'])]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'records': self.records,
+                'dropped': self.dropped,
+                'buffered_bytes': len(self._buffer),
+                'files_written': self.files_written
+            }
+
+    def close(self):
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_capture(path: str) -> List[CaptureRecord]:
+    """
+    Tek capture dosyasının kayıtları, varış zamanına göre sıralı
+
+    Kayıtlar RPC bitişinde yazıldığından dosyadaki sıra varış sırasından biraz
+    farklı olabilir. Yarım kalan son kayıt (örn. process öldürüldüyse) atlanır.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Capture dosyası değil: {path}")
+    pos = len(MAGIC)
+    (header_len,) = _HEADER_LEN.unpack_from(data, pos)
+    pos += _HEADER_LEN.size
+    header = json.loads(data[pos:pos + header_len].decode('utf-8'))
+    pos += header_len
+
+    model_version = header.get('model_version', '')
+    records = []
+    while pos + _RECORD.size <= len(data):
+        arrival_ns, kind, request_len, response_len = _RECORD.unpack_from(data, pos)
+        pos += _RECORD.size
+        end = pos + request_len + response_len
+        if end > len(data):
+            break
+        records.append(CaptureRecord(arrival_ns, kind, data[pos:pos + request_len],
+                                     data[pos + request_len:end], model_version))
+        pos = end
+    records.sort(key=lambda record: record.arrival_ns)
+    return records
+
+
+def read_captures(paths: List[str]) -> Iterator[CaptureRecord]:
+    """Birden çok dosyayı (örn. farklı process'ler) varış zamanına göre birleştir"""
+    return heapq.merge(*(read_capture(path) for path in paths), key=lambda record: record.arrival_ns)
+
+
+def capture_paths(target: str) -> List[str]:
+    """Dizin verilirse içindeki capture dosyaları, dosya verilirse kendisi"""
+    if os.path.isdir(target):
+        return sorted(glob.glob(os.path.join(target, 'capture-*.bin')))
+    return [target]
@@ -0,0 +1,397 @@
+"""
+ML servisi için Python client - kanal havuzu, keepalive/retry ve otomatik batching
+
+Kullanım (senkron):
+    from client import PredictionClient
+    with PredictionClient('localhost:50051') as client:
+        result = client.predict(12, 4, 128, 'İyi')
+        print(result['predicted_price'], client.metrics())
+
+Kullanım (asyncio):
+    async with AsyncPredictionClient('localhost:50051') as client:
+        results = await asyncio.gather(*(client.predict(12, 4, s, 'İyi') for s in (128, 256)))
+
+Eşzamanlı predict() çağrıları arka planda PredictPriceBatch isteklerinde birleştirilir.
+Büyük diziler için predict_columns() kolon bazlı PredictPriceColumnar RPC'sini kullanır:
+    prices = client.predict_columns(model_ids, ram, storage, conditions)['predicted_price']
+Fiyatın feature katkıları (ExplainPrice) için:
+    client.explain([{'model_id': 12, 'ram_gb': 4, 'storage_gb': 128, 'condition': 'İyi'}])
+"""
+
+import asyncio
+import itertools
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import grpc
+import numpy as np
+
+from proto import prediction_pb2
+from proto import prediction_pb2_grpc
+from columnar import double_column, int_field, split_fields
+from config import CLIENT_CONFIG
+
+SERVICE_NAME = 'iphone_price_prediction.PricePrediction'
+
+
+class PredictionError(Exception):
+    """Servis bir spec için status='error' döndürdüğünde"""
+
+
+class LatencyStats:
+    """
+    Son N çağrının client tarafı gecikmesi (thread-safe halka tampon)
+
+    Her predict() çağrısı ve her kolon bazlı RPC tek örnektir; tahmin (satır) sayısı
+    ayrıca sayılır, böylece büyük bir predict_columns() halkayı tek bir değerle doldurmaz.
+    """
+
+    def __init__(self, window: int):
+        self._samples = np.zeros(window, dtype=np.float64)
+        self._lock = threading.Lock()
+        self.samples = 0
+        self.count = 0
+        self.errors = 0
+        self.batches = 0
+
+    def record(self, seconds: float, rows: int = 1):
+        with self._lock:
+            self._samples[self.samples % len(self._samples)] = seconds
+            self.samples += 1
+            self.count += rows
+
+    def record_batch(self, error: bool = False):
+        with self._lock:
+            self.batches += 1
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            filled = self._samples[:min(self.samples, len(self._samples))] * 1000
+            count, batches, errors = self.count, self.batches, self.errors
+        if len(filled) == 0:
+            return {'requests': 0, 'batches': batches, 'errors': errors}
+        p50, p95, p99 = np.percentile(filled, [50, 95, 99])
+        return {
+            'requests': count,
+            'batches': batches,
+            'errors': errors,
+            'avg_batch_size': round(count / max(batches, 1), 2),
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'p99_ms': round(float(p99), 3),
+            'max_ms': round(float(filled.max()), 3)
+        }
+
+
+def _channel_options(config: Dict) -> List:
+    """Keepalive + retry politikası (gRPC service config ile)"""
+    service_config = {
+        'methodConfig': [{
+            'name': [{'service': SERVICE_NAME}],
+            'retryPolicy': {
+                'maxAttempts': config['retry_max_attempts'],
+                'initialBackoff': '0.05s',
+                'maxBackoff': '1s',
+                'backoffMultiplier': 2,
+                'retryableStatusCodes': ['UNAVAILABLE']
+            }
+        }]
+    }
+    return [
+        ('grpc.keepalive_time_ms', config['keepalive_time_ms']),
+        ('grpc.keepalive_timeout_ms', config['keepalive_timeout_ms']),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+        ('grpc.enable_retries', 1),
+        ('grpc.service_config', json.dumps(service_config)),
+        # Her kanal kendi subchannel'ını (TCP bağlantısını) kullansın
+        ('grpc.use_local_subchannel_pool', 1)
+    ]
+
+
+def _spec(model_id: int, ram_gb: int, storage_gb: int, condition: str) -> prediction_pb2.PhoneSpec:
+    return prediction_pb2.PhoneSpec(model_id=model_id, ram_gb=ram_gb,
+                                    storage_gb=storage_gb, condition=condition)
+
+
+def _to_result(response: prediction_pb2.PriceResponse) -> Dict:
+    if response.status != 'success':
+        raise PredictionError(response.message or 'Tahmin başarısız')
+    return {
+        'predicted_price': response.predicted_price,
+        'confidence_score': response.confidence_score,
+        'price_range': {
+            'min': response.price_range.min_price,
+            'max': response.price_range.max_price
+        },
+        'degraded': response.degraded
+    }
+
+
+COLUMN_NAMES = ('predicted_price', 'confidence_score', 'min_price', 'max_price')
+
+
+def _columnar_request(model_id, ram_gb, storage_gb, condition) -> prediction_pb2.ColumnarPriceRequest:
+    """NumPy dizilerinden packed istek (durumlar sözlükle kodlanır)"""
+    dictionary, codes = np.unique(np.asarray(condition, dtype=str), return_inverse=True)
+    payload = b''.join([int_field(1, model_id), int_field(2, ram_gb), int_field(3, storage_gb),
+                        int_field(4, codes)])
+    request = prediction_pb2.ColumnarPriceRequest.FromString(payload)
+    request.condition_dictionary.extend(dictionary.tolist())
+    return request
+
+
+def _columnar_result(response: prediction_pb2.ColumnarPriceResponse) -> Dict[str, np.ndarray]:
+    if response.status != 'success':
+        raise PredictionError(response.message or 'Tahmin başarısız')
+    fields = split_fields(response.SerializeToString())
+    result = {name: double_column(fields, number) for number, name in enumerate(COLUMN_NAMES, 1)}
+    result['degraded'] = response.degraded
+    return result
+
+
+def _explain_request(specs: List[Dict]) -> prediction_pb2.ExplainRequest:
+    return prediction_pb2.ExplainRequest(specs=[
+        _spec(s['model_id'], s['ram_gb'], s['storage_gb'], s['condition']) for s in specs])
+
+
+def _explain_result(response: prediction_pb2.ExplainResponse) -> List[Dict]:
+    if response.status != 'success':
+        raise PredictionError(response.message or 'Açıklama başarısız')
+    return [
+        {
+            'predicted_price': explanation.predicted_price,
+            'base_value': explanation.base_value,
+            'contributions': {item.feature: item.contribution for item in explanation.contributions},
+            'degraded': response.degraded
+        }
+        for explanation in response.explanations
+    ]
+
+
+class PredictionClient:
+    """Senkron client: predict() çağrıları arka plan thread'inde batch'lenir"""
+
+    def __init__(self, target: Optional[str] = None, **overrides):
+        self.config = {**CLIENT_CONFIG, **overrides}
+        options = _channel_options(self.config)
+        self.channels = [grpc.insecure_channel(target or self.config['target'], options=options)
+                         for _ in range(self.config['pool_size'])]
+        self._stubs = itertools.cycle([prediction_pb2_grpc.PricePredictionStub(c) for c in self.channels])
+        self.stats = LatencyStats(self.config['latency_window'])
+        self._queue = queue.Queue()
+        self._closed = False
+        self._batcher = threading.Thread(target=self._batch_loop, name='prediction-batcher', daemon=True)
+        self._batcher.start()
+
+    def predict(self, model_id: int, ram_gb: int, storage_gb: int, condition: str,
+                timeout: Optional[float] = None) -> Dict:
+        """Tek tahmin (diğer thread'lerin çağrılarıyla birlikte batch'lenir)"""
+        return self.predict_async(model_id, ram_gb, storage_gb, condition).result(
+            timeout or self.config['timeout_sec'])
+
+    def predict_async(self, model_id: int, ram_gb: int, storage_gb: int, condition: str) -> Future:
+        """Bloklamadan Future döndür"""
+        if self._closed:
+            raise RuntimeError('Client kapatıldı')
+        future = Future()
+        self._queue.put((_spec(model_id, ram_gb, storage_gb, condition), future, time.perf_counter()))
+        return future
+
+    def predict_many(self, specs: List[Dict]) -> List[Dict]:
+        """Hazır bir listeyi doğrudan batch'ler halinde gönder"""
+        futures = [self.predict_async(s['model_id'], s['ram_gb'], s['storage_gb'], s['condition'])
+                   for s in specs]
+        return [f.result(self.config['timeout_sec']) for f in futures]
+
+    def predict_columns(self, model_id, ram_gb, storage_gb, condition) -> Dict[str, np.ndarray]:
+        """
+        Kolon bazlı toplu tahmin - batcher'ı atlar, tek RPC
+
+        Argümanlar aynı uzunlukta diziler; sonuç COLUMN_NAMES anahtarlı float64 diziler
+        + 'degraded' (sunucu aşırı yükte yedek modeli kullandıysa True).
+        """
+        started = time.perf_counter()
+        response = next(self._stubs).PredictPriceColumnar(
+            _columnar_request(model_id, ram_gb, storage_gb, condition), timeout=self.config['timeout_sec'])
+        result = _columnar_result(response)
+        self.stats.record_batch()
+        self.stats.record(time.perf_counter() - started, len(result['predicted_price']))
+        return result
+
+    def explain(self, specs: List[Dict]) -> List[Dict]:
+        """
+        Spec'lerin fiyatını feature katkılarına ayır - batcher'ı atlar, tek RPC
+
+        Her sonuç: predicted_price, base_value, contributions ({feature: TL}), degraded
+        """
+        return _explain_result(next(self._stubs).ExplainPrice(
+            _explain_request(specs), timeout=self.config['timeout_sec']))
+
+    def health(self) -> prediction_pb2.HealthCheckResponse:
+        return next(self._stubs).HealthCheck(prediction_pb2.HealthCheckRequest(service='python-client'),
+                                             timeout=self.config['timeout_sec'])
+
+    def metrics(self) -> Dict:
+        return self.stats.snapshot()
+
+    def _batch_loop(self):
+        max_batch = self.config['max_batch']
+        max_wait = self.config['max_wait_ms'] / 1000
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + max_wait
+            while len(batch) < max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._send(batch)
+
+    def _send(self, batch: List):
+        """Batch'i bloklamadan gönder; yanıt gelince future'ları çöz"""
+        request = prediction_pb2.PriceBatchRequest(specs=[spec for spec, _, _ in batch])
+        call = next(self._stubs).PredictPriceBatch.future(request, timeout=self.config['timeout_sec'])
+
+        def on_done(call_future):
+            now = time.perf_counter()
+            try:
+                response = call_future.result()
+                if response.status != 'success':
+                    raise PredictionError(response.message)
+            except Exception as e:
+                self.stats.record_batch(error=True)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                return
+            self.stats.record_batch()
+            for (_, future, enqueued), item in zip(batch, response.responses):
+                self.stats.record(now - enqueued)
+                try:
+                    future.set_result(_to_result(item))
+                except PredictionError as e:
+                    future.set_exception(e)
+
+        call.add_done_callback(on_done)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._batcher.join()
+            for channel in self.channels:
+                channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncPredictionClient:
+    """asyncio client: aynı event loop'taki predict() çağrıları batch'lenir"""
+
+    def __init__(self, target: Optional[str] = None, **overrides):
+        self.config = {**CLIENT_CONFIG, **overrides}
+        options = _channel_options(self.config)
+        self.channels = [grpc.aio.insecure_channel(target or self.config['target'], options=options)
+                         for _ in range(self.config['pool_size'])]
+        self._stubs = itertools.cycle([prediction_pb2_grpc.PricePredictionStub(c) for c in self.channels])
+        self.stats = LatencyStats(self.config['latency_window'])
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+
+    async def predict(self, model_id: int, ram_gb: int, storage_gb: int, condition: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((_spec(model_id, ram_gb, storage_gb, condition), future, time.perf_counter()))
+        if len(self._pending) >= self.config['max_batch']:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config['max_wait_ms'] / 1000, self._flush)
+        return await future
+
+    async def predict_many(self, specs: List[Dict]) -> List[Dict]:
+        return await asyncio.gather(*(
+            self.predict(s['model_id'], s['ram_gb'], s['storage_gb'], s['condition']) for s in specs))
+
+    async def predict_columns(self, model_id, ram_gb, storage_gb, condition) -> Dict[str, np.ndarray]:
+        """Kolon bazlı toplu tahmin (bkz. PredictionClient.predict_columns)"""
+        started = time.perf_counter()
+        response = await next(self._stubs).PredictPriceColumnar(
+            _columnar_request(model_id, ram_gb, storage_gb, condition), timeout=self.config['timeout_sec'])
+        result = _columnar_result(response)
+        self.stats.record_batch()
+        self.stats.record(time.perf_counter() - started, len(result['predicted_price']))
+        return result
+
+    async def explain(self, specs: List[Dict]) -> List[Dict]:
+        """Feature katkıları (bkz. PredictionClient.explain)"""
+        return _explain_result(await next(self._stubs).ExplainPrice(
+            _explain_request(specs), timeout=self.config['timeout_sec']))
+
+    def metrics(self) -> Dict:
+        return self.stats.snapshot()
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List):
+        request = prediction_pb2.PriceBatchRequest(specs=[spec for spec, _, _ in batch])
+        try:
+            response = await next(self._stubs).PredictPriceBatch(request, timeout=self.config['timeout_sec'])
+            if response.status != 'success':
+                raise PredictionError(response.message)
+        except Exception as e:
+            self.stats.record_batch(error=True)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.perf_counter()
+        self.stats.record_batch()
+        for (_, future, enqueued), item in zip(batch, response.responses):
+            self.stats.record(now - enqueued)
+            if future.done():
+                continue
+            try:
+                future.set_result(_to_result(item))
+            except PredictionError as e:
+                future.set_exception(e)
+
+    async def close(self):
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for channel in self.channels:
+            await channel.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,144 @@
+"""
+Kolon bazlı (columnar) batch mesajları için NumPy <-> protobuf dönüşümü
+
+ColumnarPriceRequest/Response'taki packed repeated alanlar satır başına Python nesnesi
+oluşturmadan çevrilir:
+    istek:  mesaj C tarafında tekrar serialize edilir, packed varint kolonları
+            NumPy ile vektörize çözülür
+    yanıt:  packed double kolonları ndarray.tobytes() ile yazılır, mesaj C tarafında
+            FromString ile parse edilir
+Aynı fonksiyonlar client tarafında (client.py) ters yönde kullanılır.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH = 2
+WIRE_FIXED32 = 5
+
+_MAX_VARINT_BYTES = 10
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """int dizisini art arda varint byte'larına çevir (negatifler 10 byte, protobuf gibi)"""
+    values = np.asarray(values, dtype=np.int64).view(np.uint64)
+    if len(values) == 0:
+        return b''
+    # Her değerin varint uzunluğu: 7 bitlik grup sayısı
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, _MAX_VARINT_BYTES):
+        lengths += values >= np.uint64(1 << (7 * k))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(int(lengths.max())):
+        present = lengths > k
+        group = ((values[present] >> np.uint64(7 * k)) & np.uint64(0x7F)).astype(np.uint8)
+        more = (lengths[present] > k + 1).astype(np.uint8) << 7
+        out[starts[present] + k] = group | more
+    return out.tobytes()
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """Art arda varint byte'larını int64 dizisine çevir"""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if len(raw) == 0:
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero(raw < 0x80)
+    if len(ends) == 0 or ends[-1] != len(raw) - 1:
+        raise ValueError("Yarım kalmış varint")
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    lengths = ends - starts + 1
+    values = np.zeros(len(starts), dtype=np.uint64)
+    for k in range(int(lengths.max())):
+        present = lengths > k
+        values[present] |= (raw[starts[present] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return values.view(np.int64)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def packed_field(field_number: int, payload: bytes) -> bytes:
+    """Length-delimited alan: tag + uzunluk + payload (boşsa hiç yazılmaz)"""
+    if not payload:
+        return b''
+    return _varint(field_number << 3 | WIRE_LENGTH) + _varint(len(payload)) + payload
+
+
+def split_fields(data: bytes) -> Dict[int, List[Tuple[int, object]]]:
+    """
+    Üst düzey alanları ayır: {alan no: [(wire type, değer/payload), ...]}
+
+    Döngü alan sayısı kadar döner (kolonlar tek packed blok), satır sayısı kadar değil.
+    """
+    fields: Dict[int, List[Tuple[int, object]]] = {}
+    pos = 0
+    view = memoryview(data)
+    while pos < len(data):
+        tag, pos = _read_varint(data, pos)
+        field_number, wire_type = tag >> 3, tag & 7
+        if wire_type == WIRE_VARINT:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == WIRE_LENGTH:
+            length, pos = _read_varint(data, pos)
+            value, pos = view[pos:pos + length], pos + length
+        elif wire_type == WIRE_FIXED64:
+            value, pos = view[pos:pos + 8], pos + 8
+        elif wire_type == WIRE_FIXED32:
+            value, pos = view[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"Desteklenmeyen wire type: {wire_type}")
+        fields.setdefault(field_number, []).append((wire_type, value))
+    return fields
+
+
+def int_column(fields: Dict, field_number: int) -> np.ndarray:
+    """Repeated int32 alanı: packed blok(lar) veya (nadiren) packed olmayan tekil değerler"""
+    parts = []
+    for wire_type, value in fields.get(field_number, ()):
+        if wire_type == WIRE_LENGTH:
+            parts.append(decode_varints(bytes(value)))
+        else:
+            parts.append(np.array([value], dtype=np.uint64).view(np.int64))
+    if not parts:
+        return np.empty(0, dtype=np.int32)
+    return np.concatenate(parts).astype(np.int32)
+
+
+def double_column(fields: Dict, field_number: int) -> np.ndarray:
+    """Repeated double alanı (packed: little-endian float64 blok)"""
+    parts = [np.frombuffer(bytes(value), dtype='<f8') for _, value in fields.get(field_number, ())]
+    if not parts:
+        return np.empty(0, dtype=np.float64)
+    return np.concatenate(parts)
+
+
+def int_field(field_number: int, values: np.ndarray) -> bytes:
+    return packed_field(field_number, encode_varints(values))
+
+
+def double_field(field_number: int, values: np.ndarray) -> bytes:
+    return packed_field(field_number, np.ascontiguousarray(values, dtype='<f8').tobytes())
@@ -0,0 +1,226 @@
+"""
+Model sıkıştırma - Eğitim sonrası küçük bellekli (compact) bundle üretir
+Kullanım: python compact_model.py [--prune-tolerance 25] [--stage-tolerance 1]
+
+Adımlar:
+  1. Yaprak budama: iki yaprak çocuğu arasındaki farkın ensemble tahminine katkısı
+     tolerans altındaysa node yaprağa çevrilir (alt düzeylerden yukarı tekrarlanır)
+  2. Stage budama (Gradient Boosting): en büyük katkısı tolerans altındaki stage'ler atılır
+  3. Kuantizasyon: threshold float32, feature uint8, node değerleri int16 (scale/offset)
+Sonunda test split'inde orijinal modelle doğruluk farkını ve bellek kazancını raporlar.
+"""
+
+import argparse
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+
+from artifact import load_bundle, read_manifest, write_bundle
+from config import BUNDLE_DIR, COMPACT_BUNDLE_DIR, COMPACT_CONFIG
+from intervals import RESIDUAL_ARRAYS
+
+
+def _contribution_factor(manifest: Dict) -> float:
+    """Tek bir ağaçtaki değer farkının ensemble tahminine etkisi"""
+    if manifest['kind'] == 'boosting':
+        return manifest['learning_rate']
+    if manifest['kind'] == 'forest':
+        return 1.0 / manifest['n_trees']
+    return 1.0
+
+
+def prune_leaves(left: np.ndarray, right: np.ndarray, value: np.ndarray,
+                 factor: float, tolerance: float) -> int:
+    """Katkısı ihmal edilebilir alt ağaçları yaprağa çevir (diziler yerinde değişir)"""
+    node_ids = np.arange(len(left), dtype=left.dtype)
+    collapsed = 0
+    while True:
+        is_leaf = left == node_ids
+        candidates = (~is_leaf & is_leaf[left] & is_leaf[right]
+                      & (np.abs(value[left] - value[right]) * factor <= tolerance))
+        count = int(candidates.sum())
+        if count == 0:
+            return collapsed
+        # Node değeri zaten iki çocuğun ağırlıklı ortalaması
+        left[candidates] = node_ids[candidates]
+        right[candidates] = node_ids[candidates]
+        collapsed += count
+
+
+def drop_stages(tree_offsets: np.ndarray, left: np.ndarray, value: np.ndarray,
+                learning_rate: float, tolerance: float) -> np.ndarray:
+    """Gradient Boosting: tüm yaprak katkıları tolerans altındaki stage'leri at"""
+    node_ids = np.arange(len(left))
+    leaf_contrib = np.where(left == node_ids, np.abs(value) * learning_rate, 0.0)
+    stage_max = np.maximum.reduceat(leaf_contrib, tree_offsets[:-1])
+    return tree_offsets[:-1][stage_max > tolerance]
+
+
+def reindex(arrays: Dict[str, np.ndarray], roots: np.ndarray) -> Tuple[Dict[str, np.ndarray], int]:
+    """Köklerden erişilebilen node'ları tut, index'leri sıkıştır; (diziler, max_depth)"""
+    left, right = arrays['left'], arrays['right']
+    reachable = np.zeros(len(left), dtype=bool)
+    reachable[roots] = True
+    frontier = roots
+    depth = 0
+    while True:
+        internal = frontier[left[frontier] != frontier]
+        if len(internal) == 0:
+            break
+        depth += 1
+        frontier = np.concatenate([left[internal], right[internal]])
+        reachable[frontier] = True
+
+    keep = np.flatnonzero(reachable)
+    new_ids = np.full(len(left), -1, dtype=np.int64)
+    new_ids[keep] = np.arange(len(keep))
+
+    result = {name: arrays[name][keep] for name in ('feature', 'threshold', 'value', 'cover')}
+    result['left'] = new_ids[left[keep]]
+    result['right'] = new_ids[right[keep]]
+    # Ağaç node'ları art arda ve kök ağacın ilk node'u olduğundan offset'ler korunur
+    result['tree_offsets'] = np.append(new_ids[roots], len(keep))
+    return result, depth
+
+
+def float32_thresholds(threshold: np.ndarray) -> np.ndarray:
+    """
+    Eşikleri float32'ye indir, karar sınırını koruyarak
+
+    X zaten float32 karşılaştırıldığından, float64 eşikten büyük olmayan en yakın
+    float32 değeri seçilirse (x <= t) sonucu hiçbir x için değişmez.
+    """
+    t32 = threshold.astype(np.float32)
+    too_big = t32.astype(np.float64) > threshold
+    t32[too_big] = np.nextafter(t32[too_big], np.float32(-np.inf))
+    return t32
+
+
+def quantize_values(value: np.ndarray) -> Tuple[np.ndarray, float, float]:
+    """Değerleri int16'ya ölçekle: value ≈ offset + q * scale"""
+    lo, hi = float(value.min()), float(value.max())
+    offset = (lo + hi) / 2
+    scale = max((hi - lo) / 65534, 1e-9)
+    q = np.clip(np.round((value - offset) / scale), -32767, 32767).astype(np.int16)
+    return q, scale, offset
+
+
+def compact_bundle(source_dir: str, target_dir: str, prune_tolerance: float,
+                   stage_tolerance: float) -> Dict:
+    """Tam bundle'dan compact bundle üret, özet istatistikleri döndür"""
+    manifest = read_manifest(source_dir)
+    if manifest['kind'] == 'linear':
+        raise ValueError("Doğrusal model zaten küçük, sıkıştırılacak ağaç yok")
+
+    model, _ = load_bundle(source_dir, mmap=False)
+    arrays = {name: np.array(getattr(model, name)) for name in
+              ('left', 'right', 'feature', 'threshold', 'value', 'cover', 'tree_offsets')}
+    n_nodes = len(arrays['left'])
+
+    collapsed = prune_leaves(arrays['left'], arrays['right'], arrays['value'],
+                             _contribution_factor(manifest), prune_tolerance)
+
+    roots = arrays['tree_offsets'][:-1]
+    if manifest['kind'] == 'boosting' and stage_tolerance > 0:
+        roots = drop_stages(arrays['tree_offsets'], arrays['left'], arrays['value'],
+                            manifest['learning_rate'], stage_tolerance)
+
+    arrays, max_depth = reindex(arrays, roots)
+    value_q, value_scale, value_offset = quantize_values(arrays['value'])
+
+    compact = {
+        'left': arrays['left'].astype(np.int32),
+        'right': arrays['right'].astype(np.int32),
+        'feature': arrays['feature'].astype(np.uint8),
+        'threshold': float32_thresholds(arrays['threshold']),
+        'value': value_q,
+        'cover': arrays['cover'].astype(np.float32),
+        'tree_offsets': arrays['tree_offsets'].astype(np.int32)
+    }
+
+    compact_manifest = {k: v for k, v in manifest.items() if k not in ('arrays', 'model_version')}
+    compact_manifest.update({
+        'variant': 'compact',
+        'source_version': manifest['model_version'],
+        'n_trees': len(roots),
+        'max_depth': max_depth,
+        'quantization': {'value_scale': value_scale, 'value_offset': value_offset},
+        'pruning': {
+            'prune_tolerance': prune_tolerance,
+            'stage_tolerance': stage_tolerance,
+            'collapsed_nodes': collapsed,
+            'nodes_before': n_nodes,
+            'nodes_after': len(compact['left'])
+        }
+    })
+    # Conformal residual index'i aynen taşınır (budama farkı aralık genişliğinin çok altında)
+    residual_arrays = {name: np.load(os.path.join(source_dir, f"{name}.npy")) for name in RESIDUAL_ARRAYS
+                       if name in manifest.get('arrays', {})}
+    write_bundle(compact_manifest, {**compact, **residual_arrays}, target_dir)
+
+    return {
+        'trees_before': manifest['n_trees'],
+        'trees_after': len(roots),
+        'nodes_before': n_nodes,
+        'nodes_after': len(compact['left']),
+        'bytes_before': model.nbytes,
+        'bytes_after': sum(a.nbytes for a in compact.values())
+    }
+
+
+def evaluate(source_dir: str, target_dir: str) -> Dict:
+    """Test split'inde orijinal ve compact modeli karşılaştır"""
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from train_model import load_and_prepare_data
+
+    X, y, _ = load_and_prepare_data()
+    # train_model.py ile aynı split
+    _, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    full, _ = load_bundle(source_dir)
+    small, _ = load_bundle(target_dir)
+    full_pred = full.predict(X_test.values)
+    small_pred = small.predict(X_test.values)
+
+    return {
+        'mae_full': mean_absolute_error(y_test, full_pred),
+        'mae_compact': mean_absolute_error(y_test, small_pred),
+        'r2_full': r2_score(y_test, full_pred),
+        'r2_compact': r2_score(y_test, small_pred),
+        'max_abs_diff': float(np.max(np.abs(full_pred - small_pred)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact model bundle üret')
+    parser.add_argument('--source', default=BUNDLE_DIR, help='Tam bundle dizini')
+    parser.add_argument('--target', default=COMPACT_BUNDLE_DIR, help='Compact bundle dizini')
+    parser.add_argument('--prune-tolerance', type=float, default=COMPACT_CONFIG['prune_tolerance'],
+                        help='Yaprak budama toleransı (TL, ensemble tahminine katkı)')
+    parser.add_argument('--stage-tolerance', type=float, default=COMPACT_CONFIG['stage_tolerance'],
+                        help='Gradient Boosting stage budama toleransı (TL)')
+    args = parser.parse_args()
+
+    stats = compact_bundle(args.source, args.target, args.prune_tolerance, args.stage_tolerance)
+    report = evaluate(args.source, args.target)
+
+    print("\n" + "="*60)
+    print("COMPACT MODEL")
+    print("="*60)
+    print(f"  Ağaç sayısı:   {stats['trees_before']} -> {stats['trees_after']}")
+    print(f"  Node sayısı:   {stats['nodes_before']:,} -> {stats['nodes_after']:,}")
+    print(f"  Bellek:        {stats['bytes_before'] / 1024:,.0f} KB -> {stats['bytes_after'] / 1024:,.0f} KB "
+          f"(%{100 * (1 - stats['bytes_after'] / stats['bytes_before']):.1f} tasarruf)")
+    print(f"  MAE:           {report['mae_full']:,.1f} -> {report['mae_compact']:,.1f} TL "
+          f"(Δ {report['mae_compact'] - report['mae_full']:+,.1f})")
+    print(f"  R² Score:      {report['r2_full']:.5f} -> {report['r2_compact']:.5f} "
+          f"(Δ {report['r2_compact'] - report['r2_full']:+.5f})")
+    print(f"  Maks. fark:    {report['max_abs_diff']:,.1f} TL")
+    print(f"\n[OK] Compact bundle kaydedildi: {os.path.abspath(args.target)}")
+    print("     Servis için config.py'de MODEL_VARIANT = 'compact' yapın")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,57 @@ import os
 GRPC_CONFIG = {
     'host': '0.0.0.0',
     'port': 50051,
-    'max_workers': 10
+    'max_workers': 10,
+    'startup_budget_ms': 300,  # --measure-startup raporundaki hedef
+    'max_batch_size': 5000,    # PredictPriceBatch başına en fazla spec
+    'max_concurrent_rpcs': 64  # worker + kuyruk; aşılırsa gRPC RESOURCE_EXHAUSTED döner
+}
+
+# Admission control / load shedding (admission.py)
+ADMISSION_CONFIG = {
+    'enabled': True,
+    'initial_limit': 8,       # başlangıç eşzamanlı tahmin limiti
+    'min_limit': 1,
+    'reserved_workers': 2,    # HealthCheck için tahmin trafiğine verilmeyen worker sayısı
+    'tolerance': 2.0,         # gecikme taban değerin bu katını aşınca limit düşer
+    'smoothing': 0.2,
+    'baseline_alpha': 0.01,   # taban gecikme EWMA katsayısı
+    'backoff': 0.9            # deadline aşımında limit çarpanı
+}
+
+# Host seviyesinde paylaşılan tahmin cache'i (shared_cache.py)
+# Aynı portu SO_REUSEPORT ile dinleyen birden çok grpc_server process'i tek tabloyu paylaşır
+SHARED_CACHE_CONFIG = {
+    'enabled': False,
+    'name': 'iphone_price_cache',   # /dev/shm altındaki segment adı
+    'slots': 65536,                 # ~5 MB
+    'stripes': 64,                  # yazma kilidi şerit sayısı
+    'lock_dir': '/tmp'
+}
+
+# Python client (client.py) ayarları
+CLIENT_CONFIG = {
+    'target': 'localhost:50051',
+    'pool_size': 4,           # kanal (TCP bağlantısı) sayısı
+    'max_batch': 64,          # birleştirilen predict() çağrısı sayısı
+    'max_wait_ms': 2,         # batch dolmasını beklemek için en fazla süre
+    'timeout_sec': 5.0,
+    'keepalive_time_ms': 30000,
+    'keepalive_timeout_ms': 10000,
+    'retry_max_attempts': 3,
+    'latency_window': 10000   # percentil hesabı için tutulan son ölçüm sayısı
+}
+
+# Loglama ayarları
+# mode: 'async' -> istek thread'i sadece kuyruğa yazar, arka plan thread'i I/O yapar
+# request_sample_rate: istek/yanıt loglarının örneklenme oranı (1.0 = hepsi)
+LOGGING_CONFIG = {
+    'mode': 'async',
+    'format': 'json',
+    'level': 'INFO',
+    'queue_size': 10000,
+    'request_sample_rate': 0.01,
+    'file': None
 }
 
 # Model dosya yolları
@@ -15,6 +65,139 @@ MODEL_PATH = os.path.join(MODEL_DIR, 'price_model.pkl')
 SCALER_PATH = os.path.join(MODEL_DIR, 'scaler.pkl')
 CONFIG_PATH = os.path.join(MODEL_DIR, 'model_config.pkl')
 
+# mmap'li artifact bundle (manifest.json + .npy dizileri)
+# MODEL_FORMAT: 'auto' (bundle varsa bundle, yoksa joblib), 'bundle' veya 'joblib'
+BUNDLE_DIR = os.path.join(MODEL_DIR, 'bundle')
+MODEL_FORMAT = 'auto'
+
+# Küçük bellekli varyant (python compact_model.py ile üretilir)
+# MODEL_VARIANT: 'full' veya 'compact'
+COMPACT_BUNDLE_DIR = os.path.join(MODEL_DIR, 'bundle_compact')
+MODEL_VARIANT = 'full'
+COMPACT_CONFIG = {
+    'prune_tolerance': 5.0,  # TL - budanan alt ağacın tahmine en fazla katkısı
+    'stage_tolerance': 1.0   # TL - Gradient Boosting'de atılan stage'in en fazla katkısı
+}
+
+# Canlı girdi drift izleme (drift.py)
+DRIFT_CONFIG = {
+    'enabled': True,
+    'interval_sec': 30,        # kuyruğu boşaltma + referansla karşılaştırma periyodu
+    'window_sec': 3600,        # skor son iki pencere üzerinden hesaplanır
+    'min_samples': 200,
+    'max_pending': 100_000,    # boşaltılmamış olay sınırı (aşılırsa olay düşürülür)
+    'cms_width_bits': 10,      # count-min genişliği 2^bits
+    'cms_depth': 4,
+    'quantile_alpha': 0.01,    # quantile sketch bağıl hatası
+    'warning_psi': 0.1,
+    'drift_psi': 0.25
+}
+
+# Drift referans profili (train_model.py yazar, drift.py okur)
+DRIFT_REFERENCE_PATH = os.path.join(MODEL_DIR, 'drift_reference.json')
+
+# Shadow (canary) model: örneklenen canlı istekler arka planda bu bundle ile de skorlanır
+SHADOW_CONFIG = {
+    'enabled': True,                 # bundle_dir yoksa etkisiz
+    'bundle_dir': os.path.join(MODEL_DIR, 'bundle_shadow'),
+    'sample_rate': 0.1,
+    'queue_size': 1000,              # dolarsa örnek düşürülür (birincil yol beklemez)
+    'window': 10000,                 # rapordaki son örnek sayısı
+    'min_samples': 500,
+    'max_mean_abs_pct_delta': 10.0,  # terfi için ortalama mutlak fark üst sınırı (%)
+    'max_latency_ratio': 1.5         # terfi için shadow/birincil p95 gecikme oranı üst sınırı
+}
+
+# Tahmin aralıkları (intervals.py) - bundle'daki out-of-fold residual'lardan split-conformal
+# Residual index'i olmayan bundle'larda/joblib modelinde aralık tahmin ± 2*MAE'dir
+INTERVAL_CONFIG = {
+    'coverage': 0.9,        # aralığın gerçek fiyatı kapsaması hedeflenen oran
+    'min_bucket_size': 30   # daha az örnekli (seri_no, storage_gb) kovası seri_no kovasına düşer
+}
+
+# Aşırı yükte ucuz doğrusal modele geçiş (degraded.py)
+# Yedek bundle'ı train_model.py yazar (Linear/Ridge'in iyisi); yoksa bu özellik etkisiz
+FALLBACK_BUNDLE_DIR = os.path.join(MODEL_DIR, 'bundle_fallback')
+DEGRADED_CONFIG = {
+    'enabled': True,
+    'queue_wait_threshold_ms': 20.0,  # RPC'nin worker bekleme süresi (EWMA) üst sınırı
+    'cpu_threshold': 0.9,             # doğrulayıcı: kuyrukla birlikte process CPU / çekirdek (None: bakılmaz)
+    'min_hold_sec': 5.0,              # degraded modda en az kalma süresi
+    'exit_ratio': 0.5,                # kuyruk gecikmesi eşiğin bu katına inince birincile dön
+    'smoothing': 0.1,                 # kuyruk gecikmesi EWMA katsayısı
+    'cpu_interval_sec': 0.5           # CPU ölçüm aralığı
+}
+
+# Büyük ensemble'lar için sharded inference (sharding.py)
+# Ağaçlar worker process'lere bölünür; sadece n_trees >= min_trees olan forest/boosting modellerde
+SHARDING_CONFIG = {
+    'enabled': False,
+    'workers': os.cpu_count() or 1,
+    'min_trees': 1000
+}
+
+# Eğitim verisi kalite kontrolü (data_quality.py, train_model.py içinden çağrılır)
+DATA_QUALITY_CONFIG = {
+    'chunk_size': 100_000,
+    'dedup_columns': None,     # None: tüm kolonlar (aynı spec + aynı fiyat = tekrar ilan)
+    # Aralık kontrolünden önce düzeltilen birim farkları: 1 TB ilanlar CSV'de storage_gb=1
+    # olarak da girilmiş (aynı seride 1024 ile girilenlerle aynı fiyatta)
+    'value_fixes': {
+        'storage_gb': {1: 1024}
+    },
+    'ranges': {                # [min, max] dışındaki satırlar atılır
+        'segment': (0, 4),
+        'seri_no': (8, 16),
+        'ram_gb': (1, 16),
+        'kamera_mp': (8, 64),
+        'ekran_boyutu': (4, 7),
+        'batarya_mah': (1500, 6000),
+        'storage_gb': (16, 2048),
+        'cihaz_durum': (0, 3),
+        'cikis_yili': (2016, 2030),
+        'cihaz_fiyat': (1000, 200_000)
+    },
+    'reservoir_size': 2048,    # (seri_no, storage_gb) grubu başına örneklem
+    'min_group_size': 8,       # daha küçük gruplarda outlier filtresi uygulanmaz
+    'outlier_z': 3.5           # robust z-skoru eşiği
+}
+
+# Toplu skorlama (python batch_score.py girdi.csv cikti.csv)
+BATCH_SCORE_CONFIG = {
+    'workers': os.cpu_count() or 4,
+    'chunk_size': 50000
+}
+
+# Sampling profiler ayarları (SetProfiling RPC veya SIGUSR1 ile açılır)
+PROFILER_CONFIG = {
+    'sample_hz': 100,
+    'default_duration': 30,
+    'max_duration': 600,
+    'thread_prefix': 'grpc-worker',
+    'output_dir': os.path.join(BASE_DIR, 'profiles')
+}
+
+# Fiyat açıklaması (explain.py) - ExplainPrice RPC'si, vektörize TreeSHAP
+# Yol tabloları model yüklenirken kurulur (200 ağaçlık forest için ~10 MB, ~60 ms)
+EXPLAIN_CONFIG = {
+    'enabled': True,
+    'cache_size': 10000,    # LRU cache'teki en fazla açıklama (normalize feature satırı başına)
+    'max_batch_size': 200   # ExplainPrice başına en fazla spec (cache'siz ~2 ms/satır)
+}
+
+# Canlı trafik kaydı (capture.py) - grpc_server.py --capture ile de açılır
+# Kayıtlar replay.py ile aynı zamanlamayla (veya N kat hızla) yeniden oynatılır
+CAPTURE_CONFIG = {
+    'enabled': False,
+    'dir': os.path.join(BASE_DIR, 'captures'),
+    'sample_rate': 1.0,             # kaydedilen istek oranı
+    'flush_bytes': 256 * 1024,      # tampon bu boyuta ulaşınca hemen diske yazılır
+    'flush_interval_sec': 1.0,
+    'max_buffer_bytes': 16 * 1024 * 1024,  # disk yetişemezse fazlası düşürülür
+    'max_file_bytes': 64 * 1024 * 1024,    # dosya döndürme boyutu
+    'max_files': 20                 # dizinde tutulan en fazla dosya sayısı
+}
+
 # Cihaz durumu skorları (0-3 arası)
 # Yeni veri setine göre: Outlet=0, İyi=1, Çok İyi=2, Mükemmel=3
 CONDITION_SCORES = {
@@ -68,3 +251,50 @@ IPHONE_MODELS = {
     'iPhone 16 Pro': {'kamera_mp': 48, 'ekran': 6, 'batarya': 3582, 'yil': 2024, 'segment': 0, 'seri_no': 16, 'ram': 8},
     'iPhone 16 Pro Max': {'kamera_mp': 48, 'ekran': 6, 'batarya': 4676, 'yil': 2024, 'segment': 0, 'seri_no': 16, 'ram': 8},
 }
+
+# Modellerin satışa sunulduğu depolama seçenekleri (GB)
+MODEL_STORAGE_OPTIONS = {
+    'iPhone 8': [64, 128, 256],
+    'iPhone 8 Plus': [64, 128, 256],
+    'iPhone SE 2020': [64, 128, 256],
+    'iPhone X': [64, 256],
+    'iPhone XR': [64, 128, 256],
+    'iPhone XS': [64, 256, 512],
+    'iPhone 11': [64, 128, 256],
+    'iPhone 11 Pro': [64, 256, 512],
+    'iPhone 11 Pro Max': [64, 256, 512],
+    'iPhone 12': [64, 128, 256],
+    'iPhone 12 Mini': [64, 128, 256],
+    'iPhone 12 Pro': [128, 256, 512],
+    'iPhone 12 Pro Max': [128, 256, 512],
+    'iPhone 13': [128, 256, 512],
+    'iPhone 13 Mini': [128, 256, 512],
+    'iPhone 13 Pro': [128, 256, 512, 1024],
+    'iPhone 13 Pro Max': [128, 256, 512, 1024],
+    'iPhone 14': [128, 256, 512],
+    'iPhone 14 Plus': [128, 256, 512],
+    'iPhone 14 Pro': [128, 256, 512, 1024],
+    'iPhone 14 Pro Max': [128, 256, 512, 1024],
+    'iPhone 15': [128, 256, 512],
+    'iPhone 15 Plus': [128, 256, 512],
+    'iPhone 15 Pro': [128, 256, 512, 1024],
+    'iPhone 15 Pro Max': [256, 512, 1024],
+    'iPhone 16': [128, 256, 512],
+    'iPhone 16 Plus': [128, 256, 512],
+    'iPhone 16 Pro': [128, 256, 512, 1024],
+    'iPhone 16 Pro Max': [256, 512, 1024],
+}
+
+# Model ID -> Model Name mapping (Veritabanındaki ID'lerle eşleşik)
+MODEL_ID_MAP = {
+    1: 'iPhone 8', 2: 'iPhone SE 2020', 3: 'iPhone 8 Plus',
+    4: 'iPhone X', 5: 'iPhone XR', 6: 'iPhone XS',
+    7: 'iPhone 11', 8: 'iPhone 12 Mini', 9: 'iPhone 12',
+    10: 'iPhone 11 Pro Max', 11: 'iPhone 11 Pro',
+    12: 'iPhone 13', 13: 'iPhone 12 Pro', 14: 'iPhone 13 Mini',
+    15: 'iPhone 12 Pro Max', 16: 'iPhone 14 Plus', 17: 'iPhone 14',
+    18: 'iPhone 13 Pro', 19: 'iPhone 15', 20: 'iPhone 13 Pro Max',
+    21: 'iPhone 14 Pro', 22: 'iPhone 15 Plus', 23: 'iPhone 14 Pro Max',
+    24: 'iPhone 15 Pro', 25: 'iPhone 15 Pro Max',
+    26: 'iPhone 16 Pro Max', 27: 'iPhone 16 Pro', 28: 'iPhone 16'
+}
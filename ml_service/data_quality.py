@@ -0,0 +1,201 @@
+"""
+Eğitim verisi kalite kontrolü - tek geçişte, parça parça (bounded memory)
+
+Adımlar (her CSV parçası için vektörize):
+  1. Eksik hedef / sayıya çevrilemeyen satırlar atılır; bilinen birim farkları
+     (DATA_QUALITY_CONFIG['value_fixes'], örn. TB cinsinden storage) düzeltilir
+  2. Hash tabanlı tekrar silme: satırın 64-bit hash'i daha önce görüldüyse atılır
+  3. Aralık kontrolü: her feature DATA_QUALITY_CONFIG['ranges'] içinde olmalı
+  4. (seri_no, storage_gb) grubu başına fiyat reservoir'ı güncellenir (sabit boyutlu örneklem)
+Geçiş bitince grup medyanı/MAD'i reservoir'lardan hesaplanır ve robust z-skoru
+eşiği aşan fiyatlar atılır. Bellek: benzersiz satır hash'leri + grup başına reservoir
++ temizlenmiş (eğitimde zaten tutulacak) veri.
+
+Kullanım: python data_quality.py [veri.csv]
+"""
+
+import argparse
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_QUALITY_CONFIG
+
+TARGET_COL = 'cihaz_fiyat'
+GROUP_COLS = ('seri_no', 'storage_gb')
+# MAD'i normal dağılımın standart sapmasıyla aynı ölçeğe getirir (Iglewicz-Hoaglin)
+MAD_SCALE = 0.6745
+
+
+class GroupReservoirs:
+    """Grup başına sabit boyutlu rastgele örneklem (Algorithm R, parça bazında vektörize)"""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.samples: Dict[int, np.ndarray] = {}
+        self.counts: Dict[int, int] = {}
+
+    def update(self, keys: np.ndarray, values: np.ndarray):
+        order = np.argsort(keys, kind='stable')
+        keys, values = keys[order], values[order]
+        unique, starts = np.unique(keys, return_index=True)
+        for key, group in zip(unique.tolist(), np.split(values, starts[1:])):
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = np.empty(self.size, dtype=np.float64)
+            seen = self.counts.get(key, 0)
+            positions = seen + np.arange(len(group))
+
+            fill = positions < self.size
+            sample[positions[fill]] = group[fill]
+            # Dolu reservoir: i. eleman size/(i+1) olasılıkla rastgele bir slotun yerine geçer
+            slots = self.rng.integers(0, positions[~fill] + 1)
+            accept = slots < self.size
+            sample[slots[accept]] = group[~fill][accept]
+            self.counts[key] = seen + len(group)
+
+    def robust_stats(self) -> Tuple[Dict[int, float], Dict[int, float]]:
+        """Grup başına (medyan, MAD)"""
+        medians, mads = {}, {}
+        for key, sample in self.samples.items():
+            values = sample[:min(self.counts[key], self.size)]
+            median = float(np.median(values))
+            medians[key] = median
+            mads[key] = float(np.median(np.abs(values - median)))
+        return medians, mads
+
+
+def _group_keys(frame: pd.DataFrame) -> np.ndarray:
+    return frame[GROUP_COLS[0]].to_numpy(np.int64) * 100_000 + frame[GROUP_COLS[1]].to_numpy(np.int64)
+
+
+def validate_dataset(path: str, feature_cols: List[str], config: Optional[Dict] = None
+                     ) -> Tuple[pd.DataFrame, pd.Series, Dict]:
+    """
+    CSV'yi tek geçişte temizle
+
+    Returns:
+        (X, y, report) - X feature_cols kolonlu DataFrame, report sayımlar
+    """
+    config = config or DATA_QUALITY_CONFIG
+    columns = list(feature_cols) + [TARGET_COL]
+    ranges = {col: bounds for col, bounds in config['ranges'].items() if col in columns}
+    dedup_cols = config.get('dedup_columns') or columns
+    fixes = {col: mapping for col, mapping in config.get('value_fixes', {}).items() if col in columns}
+
+    seen_hashes = np.empty(0, dtype=np.uint64)
+    reservoirs = GroupReservoirs(config['reservoir_size'])
+    kept: List[np.ndarray] = []
+    report = {
+        'rows_in': 0,
+        'invalid': 0,
+        'normalized': {col: 0 for col in fixes},
+        'duplicates': 0,
+        'out_of_range': {col: 0 for col in ranges},
+        'outliers': 0,
+        'rows_out': 0
+    }
+
+    for chunk in pd.read_csv(path, chunksize=config['chunk_size'], usecols=lambda c: c in columns):
+        report['rows_in'] += len(chunk)
+        chunk = chunk.apply(pd.to_numeric, errors='coerce')
+
+        # 1. Hedefi olmayan satır eğitimde kullanılamaz (feature NaN'ları sonra medyanla dolar)
+        valid = chunk[TARGET_COL].notna().to_numpy()
+        report['invalid'] += int((~valid).sum())
+        chunk = chunk[valid]
+        for col, mapping in fixes.items():
+            values = chunk[col]
+            fixed = values.isin(list(mapping))
+            report['normalized'][col] += int(fixed.sum())
+            chunk[col] = values.mask(fixed, values.map(mapping))
+
+        # 2. Tekrarlar: hem önceki parçalarla hem parça içinde
+        hashes = pd.util.hash_pandas_object(chunk[dedup_cols], index=False).to_numpy()
+        _, first = np.unique(hashes, return_index=True)
+        unique_in_chunk = np.zeros(len(hashes), dtype=bool)
+        unique_in_chunk[first] = True
+        fresh = unique_in_chunk & ~np.isin(hashes, seen_hashes, assume_unique=False)
+        report['duplicates'] += int((~fresh).sum())
+        seen_hashes = np.union1d(seen_hashes, hashes[fresh])
+        chunk = chunk[fresh]
+
+        # 3. Aralık kontrolleri (NaN feature'lar aralık dışı sayılmaz)
+        in_range = np.ones(len(chunk), dtype=bool)
+        for col, (low, high) in ranges.items():
+            values = chunk[col].to_numpy(np.float64)
+            bad = (values < low) | (values > high)
+            report['out_of_range'][col] += int((bad & in_range).sum())
+            in_range &= ~bad
+        chunk = chunk[in_range]
+
+        # 4. Grup reservoir'ları (grup kolonu eksikse outlier filtresi uygulanmaz)
+        grouped = chunk[list(GROUP_COLS)].notna().all(axis=1).to_numpy()
+        reservoirs.update(_group_keys(chunk[grouped]), chunk[TARGET_COL].to_numpy(np.float64)[grouped])
+        kept.append(chunk[columns].to_numpy(np.float64))
+
+    data = np.concatenate(kept) if kept else np.empty((0, len(columns)))
+    frame = pd.DataFrame(data, columns=columns)
+
+    # Robust outlier filtresi: |0.6745 * (fiyat - medyan) / MAD| > eşik
+    medians, mads = reservoirs.robust_stats()
+    keys = _group_keys(frame.fillna({col: -1 for col in GROUP_COLS}))
+    sizes = np.array([reservoirs.counts.get(k, 0) for k in keys.tolist()])
+    median = np.array([medians.get(k, np.nan) for k in keys.tolist()])
+    mad = np.array([mads.get(k, 0.0) for k in keys.tolist()])
+    usable = (sizes >= config['min_group_size']) & (mad > 0)
+    z = np.zeros(len(frame))
+    z[usable] = MAD_SCALE * (frame[TARGET_COL].to_numpy()[usable] - median[usable]) / mad[usable]
+    outlier = np.abs(z) > config['outlier_z']
+    report['outliers'] = int(outlier.sum())
+    frame = frame[~outlier].reset_index(drop=True)
+
+    report['rows_out'] = len(frame)
+    report['groups'] = len(medians)
+    # Tamsayı kolonlar (NaN içermeyen) CSV'deki tipine döner
+    frame = frame.astype({col: 'int64' for col in frame.columns
+                          if frame[col].notna().all() and (frame[col] % 1 == 0).all()})
+    return frame[list(feature_cols)], frame[TARGET_COL], report
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Girdi satırı:      {report['rows_in']:,}",
+        f"Geçersiz hedef:    {report['invalid']:,}",
+        f"Birim düzeltilen:  {sum(report['normalized'].values()):,}"
+    ]
+    for col, count in report['normalized'].items():
+        if count:
+            lines.append(f"    {col}: {count:,}")
+    lines += [
+        f"Tekrar eden:       {report['duplicates']:,}",
+        f"Aralık dışı:       {sum(report['out_of_range'].values()):,}"
+    ]
+    for col, count in report['out_of_range'].items():
+        if count:
+            lines.append(f"    {col}: {count:,}")
+    lines += [
+        f"Aykırı fiyat:      {report['outliers']:,} ({report['groups']} (seri_no, storage_gb) grubu)",
+        f"Eğitime giren:     {report['rows_out']:,} "
+        f"(%{100 * report['rows_out'] / max(report['rows_in'], 1):.1f})"
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    from train_model import DATA_PATH, FEATURE_COLS
+    parser = argparse.ArgumentParser(description='Eğitim verisi kalite raporu')
+    parser.add_argument('path', nargs='?', default=DATA_PATH, help='CSV dosyası')
+    args = parser.parse_args()
+
+    header = pd.read_csv(args.path, nrows=0).columns
+    _, _, report = validate_dataset(args.path, [col for col in FEATURE_COLS if col in header])
+    print(f"Veri kalitesi: {os.path.abspath(args.path)}")
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
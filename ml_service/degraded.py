@@ -0,0 +1,136 @@
+"""
+Degraded mode - aşırı yükte ağaç ensemble'ı yerine ucuz doğrusal modele geçiş
+
+Kuyruk gecikmesi (RPC'nin worker thread beklediği süre, EWMA) eşiği aşınca
+tahminler train_model.py'nin kaydettiği Linear/Ridge bundle'ıyla yapılır ve
+yanıtlar 'degraded' olarak işaretlenir. Tetikleyici kuyruktur: process CPU'su
+(çekirdek başına) sadece doğrulayıcıdır (kuyruk VE CPU eşiği); yoğun ama kuyruksuz
+çalışan sunucu birincil modelde kalır. cpu_threshold None ise CPU'ya bakılmaz.
+
+Kuyruk gecikmesini gRPC sunucusunun thread havuzu (QueueTimingExecutor) ölçer;
+her RPC için iş kuyruğa girdiği andan bir worker'ın onu almasına kadar geçen süre.
+İşin kuyruğa girdiği an, çalışırken submitted_ns() ile okunabilir (capture varış zamanı).
+
+Geri dönüş (histerezis): degraded moda girince en az min_hold_sec orada kalınır,
+kuyruk gecikmesi eşiğin exit_ratio katının altına inince birincil modele dönülür
+(sabit yükte yüksek kalan CPU geri dönüşü engellemez).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+_current = threading.local()
+
+
+def submitted_ns() -> Optional[int]:
+    """Çalışan işin thread havuzuna verildiği an (unix ns); havuz dışında None"""
+    return getattr(_current, 'submitted_ns', None)
+
+
+def _available_cores() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class QueueTimingExecutor(ThreadPoolExecutor):
+    """Her işin kuyrukta bekleme süresini on_wait(saniye) ile bildiren thread havuzu"""
+
+    def __init__(self, *args, on_wait: Optional[Callable[[float], None]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_wait = on_wait
+
+    def submit(self, fn, /, *args, **kwargs):
+        queued = time.perf_counter()
+        queued_ns = time.time_ns()
+
+        def timed():
+            on_wait = self.on_wait
+            if on_wait is not None:
+                on_wait(time.perf_counter() - queued)
+            _current.submitted_ns = queued_ns
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _current.submitted_ns = None
+
+        return super().submit(timed)
+
+
+class DegradedModeSwitch:
+    """Birincil/yedek model seçimi - kuyruk gecikmesiyle tetiklenir, CPU doğrular"""
+
+    def __init__(self, queue_wait_threshold_ms: float, cpu_threshold: Optional[float], min_hold_sec: float = 5.0,
+                 exit_ratio: float = 0.5, smoothing: float = 0.1, cpu_interval_sec: float = 0.5):
+        self.queue_wait_threshold = queue_wait_threshold_ms / 1000
+        self.cpu_threshold = cpu_threshold
+        self.min_hold_sec = min_hold_sec
+        self.exit_ratio = exit_ratio
+        self.smoothing = smoothing
+        self.cpu_interval_sec = cpu_interval_sec
+        self.cores = _available_cores()
+
+        self.queue_wait = 0.0          # kuyruk gecikmesi EWMA (saniye)
+        self.cpu = 0.0                 # son aralıktaki process CPU / çekirdek sayısı
+        self.degraded_since = None
+        self.degraded_requests = 0
+        self.switches = 0
+        self._cpu_mark = (time.monotonic(), time.process_time())
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'DegradedModeSwitch':
+        return cls(
+            queue_wait_threshold_ms=config['queue_wait_threshold_ms'],
+            cpu_threshold=config.get('cpu_threshold'),
+            min_hold_sec=config['min_hold_sec'],
+            exit_ratio=config['exit_ratio'],
+            smoothing=config['smoothing'],
+            cpu_interval_sec=config['cpu_interval_sec']
+        )
+
+    def observe_queue_wait(self, seconds: float):
+        """Bir RPC'nin worker beklediği süre (QueueTimingExecutor.on_wait)"""
+        self.queue_wait += self.smoothing * (seconds - self.queue_wait)
+
+    def _sample_cpu(self, now: float):
+        wall, cpu = self._cpu_mark
+        if now - wall < self.cpu_interval_sec:
+            return
+        cpu_now = time.process_time()
+        self.cpu = (cpu_now - cpu) / (now - wall) / self.cores
+        self._cpu_mark = (now, cpu_now)
+
+    def active(self) -> bool:
+        """Bu istek yedek modelle mi skorlanmalı"""
+        now = time.monotonic()
+        with self._lock:
+            self._sample_cpu(now)
+            if self.degraded_since is None:
+                if self.queue_wait <= self.queue_wait_threshold:
+                    return False
+                if self.cpu_threshold is not None and self.cpu < self.cpu_threshold:
+                    # Kuyruk var ama CPU boşta: yavaşlık modelden değil (örn. I/O), yedeğe geçmek çözmez
+                    return False
+                self.degraded_since = now
+                self.switches += 1
+            elif now - self.degraded_since >= self.min_hold_sec \
+                    and self.queue_wait < self.queue_wait_threshold * self.exit_ratio:
+                self.degraded_since = None
+                return False
+            self.degraded_requests += 1
+            return True
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'degraded': self.degraded_since is not None,
+                'queue_wait_ms': round(self.queue_wait * 1000, 3),
+                'cpu': round(self.cpu, 3),
+                'degraded_requests': self.degraded_requests,
+                'switches': self.switches
+            }
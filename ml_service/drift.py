@@ -0,0 +1,324 @@
+"""
+Drift izleme - canlı tahmin girdilerinin eğitim verisine benzerliği (sabit bellek)
+
+İstek yolunda sadece olay kuyruğa eklenir (birkaç µs); arka plan thread'i periyodik olarak
+kuyruğu boşaltır ve sketch'leri vektörize günceller:
+    CountMinSketch   model serisi (seri_no) ve cihaz durumu frekansları
+    QuantileSketch   storage_gb ve tahmin edilen fiyat (logaritmik kovalar, bağıl hata alpha)
+Referans profil train_model.py tarafından aynı sketch'lerle kaydedilir. Karşılaştırma
+Population Stability Index (PSI) ile yapılır; drift skoru feature'ların en büyük PSI'ıdır:
+    < 0.1 stable, < 0.25 warning, üstü drift
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Modeli tanımlayan feature'lar: veri setiyle IPHONE_MODELS arasında sadece seri_no
+# birebir tutarlı (segment/batarya gibi kolonlar IPHONE_MODELS'te eksik veya farklı)
+MODEL_KEY_FEATURES = ['seri_no']
+# Sabit 64-bit tek sayı çarpanlar: tüm process'lerde aynı anahtar
+_KEY_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9,
+                             0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53,
+                             0x94D049BB133111EB], dtype=np.uint64)
+PSI_EPSILON = 1e-4
+QUANTILE_BINS = 10
+
+
+def model_keys(X: np.ndarray, feature_cols: List[str]) -> np.ndarray:
+    """Feature satırlarından model anahtarı (uint64)"""
+    columns = [feature_cols.index(f) for f in MODEL_KEY_FEATURES if f in feature_cols]
+    values = np.asarray(X, dtype=np.float64)[:, columns].round().astype(np.int64).view(np.uint64)
+    with np.errstate(over='ignore'):
+        return (values * _KEY_MULTIPLIERS[:len(columns)]).sum(axis=1, dtype=np.uint64)
+
+
+def psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population Stability Index - iki frekans vektörü arasında"""
+    expected = np.maximum(expected / max(expected.sum(), 1), PSI_EPSILON)
+    actual = np.maximum(actual / max(actual.sum(), 1), PSI_EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class CountMinSketch:
+    """Sabit boyutlu frekans tahmini (multiply-shift hash, depth satır)"""
+
+    SEEDS = np.array([0x9E3779B97F4A7C15, 0xBF58476D1CE4E5B9, 0x94D049BB133111EB,
+                      0xD6E8FEB86659FD93, 0xA0761D6478BD642F, 0xE7037ED1A0B428DB], dtype=np.uint64)
+
+    def __init__(self, width_bits: int = 10, depth: int = 4):
+        self.width_bits = width_bits
+        self.depth = depth
+        self.table = np.zeros((depth, 1 << width_bits), dtype=np.int64)
+        self.total = 0
+
+    def _buckets(self, keys: np.ndarray) -> np.ndarray:
+        keys = np.asarray(keys, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            hashed = keys[None, :] * self.SEEDS[:self.depth, None]
+        return (hashed >> np.uint64(64 - self.width_bits)).astype(np.intp)
+
+    def add(self, keys: np.ndarray):
+        buckets = self._buckets(keys)
+        for row in range(self.depth):
+            np.add.at(self.table[row], buckets[row], 1)
+        self.total += len(keys)
+
+    def estimate(self, keys: np.ndarray) -> np.ndarray:
+        buckets = self._buckets(keys)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+    def merge(self, other: 'CountMinSketch'):
+        self.table += other.table
+        self.total += other.total
+
+
+class QuantileSketch:
+    """DDSketch benzeri: log_gamma(x) kovaları, sabit dizi, bağıl hata alpha"""
+
+    def __init__(self, alpha: float = 0.01, n_buckets: int = 2048):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+        self.total = 0
+
+    def add(self, values: np.ndarray):
+        values = np.maximum(np.asarray(values, dtype=np.float64), 1.0)
+        index = np.ceil(np.log(values) / self.log_gamma).astype(np.intp)
+        np.add.at(self.counts, np.clip(index, 0, len(self.counts) - 1), 1)
+        self.total += len(values)
+
+    def quantile(self, q: float) -> float:
+        if self.total == 0:
+            return float('nan')
+        index = int(np.searchsorted(np.cumsum(self.counts), q * (self.total - 1), side='right'))
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def bucket_index(self, value: float) -> int:
+        return int(math.ceil(math.log(max(value, 1.0)) / self.log_gamma))
+
+    def merge(self, other: 'QuantileSketch'):
+        self.counts += other.counts
+        self.total += other.total
+
+    def to_dict(self) -> Dict:
+        nonzero = np.flatnonzero(self.counts)
+        return {'alpha': self.alpha, 'n_buckets': len(self.counts),
+                'buckets': {int(i): int(self.counts[i]) for i in nonzero}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        sketch = cls(data['alpha'], data['n_buckets'])
+        for index, count in data['buckets'].items():
+            sketch.counts[int(index)] = count
+        sketch.total = int(sketch.counts.sum())
+        return sketch
+
+
+class FeatureSketches:
+    """Bir penceredeki tüm sketch'ler"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.models = CountMinSketch(config['cms_width_bits'], config['cms_depth'])
+        self.conditions = CountMinSketch(config['cms_width_bits'], config['cms_depth'])
+        self.storage = QuantileSketch(config['quantile_alpha'])
+        self.price = QuantileSketch(config['quantile_alpha'])
+
+    def add(self, keys: np.ndarray, condition_scores: np.ndarray, storage: np.ndarray, prices: np.ndarray):
+        self.models.add(keys)
+        self.conditions.add(np.asarray(condition_scores, dtype=np.int64).view(np.uint64))
+        self.storage.add(storage)
+        self.price.add(prices)
+
+    def merge(self, other: 'FeatureSketches'):
+        for name in ('models', 'conditions', 'storage', 'price'):
+            getattr(self, name).merge(getattr(other, name))
+
+
+def build_reference(X: np.ndarray, feature_cols: List[str], prices: np.ndarray, config: Dict,
+                    model_version: Optional[str] = None) -> Dict:
+    """Eğitim verisinden referans profil (train_model.py kaydeder)"""
+    X = np.asarray(X, dtype=np.float64)
+    keys = model_keys(X, feature_cols)
+    conditions = X[:, feature_cols.index('cihaz_durum')].round().astype(np.int64)
+    storage = QuantileSketch(config['quantile_alpha'])
+    storage.add(X[:, feature_cols.index('storage_gb')])
+    price = QuantileSketch(config['quantile_alpha'])
+    price.add(prices)
+
+    # Referans kümesi sonlu: kategorik frekanslar kesin sayımlarla tutulur
+    unique_keys, key_counts = np.unique(keys, return_counts=True)
+    unique_conditions, condition_counts = np.unique(conditions, return_counts=True)
+    return {
+        'model_version': model_version,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'rows': len(X),
+        'models': {str(int(k)): int(c) for k, c in zip(unique_keys, key_counts)},
+        'conditions': {str(int(k)): int(c) for k, c in zip(unique_conditions, condition_counts)},
+        'storage': storage.to_dict(),
+        'price': price.to_dict()
+    }
+
+
+def save_reference(reference: Dict, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(reference, f, ensure_ascii=False)
+
+
+def load_reference(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class DriftMonitor:
+    """Canlı girdileri toplar, periyodik olarak referansla karşılaştırır"""
+
+    def __init__(self, encoder, reference: Optional[Dict], config: Dict):
+        self.config = config
+        self.reference = reference
+        self.encoder = encoder
+        # Model index -> model anahtarı; istek yolunda tek dizi okuması
+        self.index_keys = model_keys(encoder.matrix, encoder.feature_cols)
+        # Anahtar bir seriyi (örn. iPhone 13 ... 13 Pro Max) temsil eder; rapor etiketi de seri
+        key_cols = [encoder.feature_cols.index(feature) for feature in MODEL_KEY_FEATURES]
+        self.key_names = {
+            int(key): 'seri ' + '/'.join(f"{value:g}" for value in row)
+            for key, row in zip(self.index_keys, encoder.matrix[:, key_cols].tolist())
+        }
+
+        self._events = []
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.window = FeatureSketches(config)
+        self.previous = None
+        self.window_started = time.time()
+        self.last_report = self._empty_report('Henüz karşılaştırma yapılmadı')
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='drift-monitor', daemon=True)
+        self._thread.start()
+
+    def record(self, model_index: int, condition_score: float, storage_gb: float, price: float):
+        """İstek yolu: sadece olayı ekle"""
+        with self._lock:
+            if len(self._events) < self.config['max_pending']:
+                self._events.append((model_index, condition_score, storage_gb, price))
+            else:
+                self.dropped += 1
+
+    def record_batch(self, model_index: np.ndarray, condition_scores: np.ndarray,
+                     storage_gb: np.ndarray, prices: np.ndarray):
+        """Toplu istekler doğrudan vektörize eklenir"""
+        with self._lock:
+            self.window.add(self.index_keys[model_index], condition_scores, storage_gb, prices)
+
+    def _drain(self):
+        with self._lock:
+            events, self._events = self._events, []
+            if events:
+                columns = np.array(events, dtype=np.float64)
+                self.window.add(self.index_keys[columns[:, 0].astype(np.intp)],
+                                columns[:, 1], columns[:, 2], columns[:, 3])
+            if time.time() - self.window_started >= self.config['window_sec']:
+                self.previous, self.window = self.window, FeatureSketches(self.config)
+                self.window_started = time.time()
+
+    def refresh(self) -> Dict:
+        """Bekleyen olayları işle ve raporu yeniden hesapla"""
+        self._drain()
+        self.last_report = self.compute()
+        return self.last_report
+
+    def _run(self):
+        while not self._stop.wait(self.config['interval_sec']):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Drift hesaplama hatası: %s", e, exc_info=True)
+
+    def stop(self):
+        self._stop.set()
+
+    def _empty_report(self, message: str) -> Dict:
+        return {'drift_score': 0.0, 'status': 'unknown', 'sample_count': 0, 'features': [],
+                'reference_version': (self.reference or {}).get('model_version') or '',
+                'computed_at': datetime.now().isoformat(timespec='seconds'), 'message': message}
+
+    def compute(self) -> Dict:
+        """Son iki pencere (tamamlanmış + süren) ile referansı karşılaştır"""
+        if self.reference is None:
+            return self._empty_report('Referans profil yok (python train_model.py)')
+        with self._lock:
+            live = FeatureSketches(self.config)
+            live.merge(self.window)
+            if self.previous is not None:
+                live.merge(self.previous)
+        if live.price.total < self.config['min_samples']:
+            report = self._empty_report(f"Yetersiz örnek: {live.price.total}")
+            report['sample_count'] = live.price.total
+            return report
+
+        features = [
+            self._categorical('model', self.reference['models'], live.models),
+            self._categorical('cihaz_durum', self.reference['conditions'], live.conditions),
+            self._continuous('storage_gb', QuantileSketch.from_dict(self.reference['storage']), live.storage),
+            self._continuous('predicted_price', QuantileSketch.from_dict(self.reference['price']), live.price)
+        ]
+        score = max(f['psi'] for f in features)
+        if score < self.config['warning_psi']:
+            status = 'stable'
+        elif score < self.config['drift_psi']:
+            status = 'warning'
+        else:
+            status = 'drift'
+        worst = max(features, key=lambda f: f['psi'])
+        return {
+            'drift_score': round(score, 4),
+            'status': status,
+            'sample_count': live.price.total,
+            'features': features,
+            'reference_version': self.reference.get('model_version') or '',
+            'computed_at': datetime.now().isoformat(timespec='seconds'),
+            'message': f"En çok kayan: {worst['feature']} (PSI {worst['psi']:.3f})"
+        }
+
+    def _categorical(self, name: str, reference: Dict[str, int], live: CountMinSketch) -> Dict:
+        # Aday anahtarlar: referanstakiler + bilinen tüm modeller/durumlar
+        if name == 'model':
+            candidates = set(int(k) for k in reference) | set(int(k) for k in self.index_keys)
+        else:
+            candidates = set(int(k) for k in reference) | set(int(v) for v in self.encoder.condition_values)
+        keys = np.array(sorted(candidates), dtype=np.uint64)
+        expected = np.array([reference.get(str(int(k)), 0) for k in keys], dtype=np.float64)
+        actual = live.estimate(keys).astype(np.float64)
+        # Referansta olmayan anahtarlara (count-min taşması dahil) düşen pay
+        actual = np.append(actual, max(live.total - actual.sum(), 0))
+        expected = np.append(expected, 0)
+        top = int(keys[np.argmax(actual[:-1])]) if len(keys) else None
+        return {'feature': name, 'psi': round(psi(expected, actual), 4),
+                'live_top': self.key_names.get(top, str(top)) if name == 'model' else str(top),
+                'reference_p50': 0.0, 'live_p50': 0.0}
+
+    def _continuous(self, name: str, reference: QuantileSketch, live: QuantileSketch) -> Dict:
+        # Referansın desil sınırlarına göre kovala, iki tarafın kova paylarını karşılaştır
+        edges = sorted({reference.bucket_index(reference.quantile(q))
+                        for q in np.linspace(0.1, 0.9, QUANTILE_BINS - 1)})
+        bounds = np.array(edges + [len(reference.counts) - 1])
+        expected = np.diff(np.concatenate([[0], np.cumsum(reference.counts)[bounds]]))
+        actual = np.diff(np.concatenate([[0], np.cumsum(live.counts)[bounds]]))
+        return {'feature': name, 'psi': round(psi(expected.astype(np.float64), actual.astype(np.float64)), 4),
+                'live_top': '', 'reference_p50': round(reference.quantile(0.5), 2),
+                'live_p50': round(live.quantile(0.5), 2)}
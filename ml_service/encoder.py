@@ -0,0 +1,119 @@
+"""
+Önceden derlenmiş feature encoder - IPHONE_MODELS ve CONDITION_SCORES'u model yüklenirken
+yoğun bir float32 matrise çevirir
+
+Tek satır: matris satırının kopyası + ram/storage/durum kolonlarına skaler yazma
+Batch: matrix[model_idx] fancy indexing + kolon atamaları (satır başına Python nesnesi yok)
+"""
+
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import IPHONE_MODELS, CONDITION_SCORES, MODEL_ID_MAP
+
+DEFAULT_MODEL = 'iPhone 13'
+DEFAULT_CONDITION = 'İyi'
+DEFAULT_STORAGE = 128
+
+# feature kolonu -> IPHONE_MODELS anahtarı ve bilgi eksikse kullanılacak değer
+_STATIC_FEATURES = {
+    'segment': ('segment', 0),
+    'seri_no': ('seri_no', 13),
+    'ram_gb': ('ram', 4),
+    'kamera_mp': ('kamera_mp', 12),
+    'ekran_boyutu': ('ekran', 6),
+    'batarya_mah': ('batarya', 3000),
+    'cikis_yili': ('yil', 2021)
+}
+
+
+class FeatureEncoder:
+    """Model adı/ID'sinden feature satırı üreten, sözlüksüz sıcak yol"""
+
+    def __init__(self, feature_cols: List[str]):
+        self.feature_cols = list(feature_cols)
+        self.model_names = list(IPHONE_MODELS)
+        self.default_index = self.model_names.index(DEFAULT_MODEL)
+
+        # İsim -> satır index'i; "Apple " önekli halleri de önceden eklenir
+        self.name_to_index: Dict[str, int] = {}
+        for index, name in enumerate(self.model_names):
+            self.name_to_index[sys.intern(name)] = index
+            self.name_to_index[sys.intern(f"Apple {name}")] = index
+
+        # Durumlar kod (0..n-1) ile de adreslenebilir: condition_values[kod] = skor
+        self.condition_names = list(CONDITION_SCORES)
+        self.condition_values = np.array([CONDITION_SCORES[c] for c in self.condition_names], dtype=np.float32)
+        self.condition_to_code = {sys.intern(c): i for i, c in enumerate(self.condition_names)}
+        self.default_condition_code = self.condition_to_code[DEFAULT_CONDITION]
+
+        self.ram_col = self._col('ram_gb')
+        self.storage_col = self._col('storage_gb')
+        self.condition_col = self._col('cihaz_durum')
+
+        # Statik kolonlar dolu; ram varsayılanı modelin RAM'i, storage/durum varsayılanları sabit
+        self.matrix = np.zeros((len(self.model_names), len(self.feature_cols)), dtype=np.float32)
+        for index, name in enumerate(self.model_names):
+            info = IPHONE_MODELS[name]
+            for col, feature in enumerate(self.feature_cols):
+                if feature in _STATIC_FEATURES:
+                    key, fallback = _STATIC_FEATURES[feature]
+                    self.matrix[index, col] = info.get(key, fallback)
+        if self.storage_col >= 0:
+            self.matrix[:, self.storage_col] = DEFAULT_STORAGE
+        if self.condition_col >= 0:
+            self.matrix[:, self.condition_col] = CONDITION_SCORES[DEFAULT_CONDITION]
+        self.matrix.setflags(write=False)
+
+        # Veritabanı model_id -> satır index'i (bilinmeyen ID'ler varsayılan modele düşer)
+        self.db_index = np.full(max(MODEL_ID_MAP) + 1, self.default_index, dtype=np.intp)
+        for model_id, name in MODEL_ID_MAP.items():
+            self.db_index[model_id] = self.name_to_index.get(name, self.default_index)
+
+    def _col(self, feature: str) -> int:
+        return self.feature_cols.index(feature) if feature in self.feature_cols else -1
+
+    def model_index(self, model_name: str) -> int:
+        return self.name_to_index.get(model_name, self.default_index)
+
+    def condition_code(self, condition: str) -> int:
+        return self.condition_to_code.get(condition, self.default_condition_code)
+
+    def db_indices(self, model_ids: np.ndarray) -> np.ndarray:
+        """Veritabanı ID'lerini matris satırlarına çevir (aralık dışı -> varsayılan)"""
+        model_ids = np.asarray(model_ids, dtype=np.intp)
+        valid = (model_ids >= 0) & (model_ids < len(self.db_index))
+        return np.where(valid, self.db_index[np.where(valid, model_ids, 0)], self.default_index)
+
+    def encode(self, input_data: Dict) -> np.ndarray:
+        """predict() girdisinden (1, n_features) float32 satır"""
+        row = self.matrix[self.model_index(input_data.get('model_name', DEFAULT_MODEL))].copy()
+        if self.ram_col >= 0 and 'ram_gb' in input_data:
+            row[self.ram_col] = input_data['ram_gb']
+        if self.storage_col >= 0:
+            row[self.storage_col] = input_data.get('storage_gb', DEFAULT_STORAGE)
+        if self.condition_col >= 0:
+            row[self.condition_col] = CONDITION_SCORES.get(input_data.get('condition', DEFAULT_CONDITION), 1)
+        return row[None, :]
+
+    def encode_batch(self, model_index: np.ndarray, ram_gb: Optional[np.ndarray],
+                     storage_gb: np.ndarray, condition_code: np.ndarray) -> np.ndarray:
+        """
+        Vektörize encode: tüm argümanlar n uzunluğunda diziler
+
+        model_index: matris satırları (db_indices() veya model_index() ile)
+        ram_gb: None ise modelin varsayılan RAM'i kullanılır
+        condition_code: condition_names içindeki sıra (bilinmeyen -> varsayılan)
+        """
+        X = self.matrix[np.asarray(model_index, dtype=np.intp)]
+        if self.ram_col >= 0 and ram_gb is not None:
+            X[:, self.ram_col] = ram_gb
+        if self.storage_col >= 0:
+            X[:, self.storage_col] = storage_gb
+        if self.condition_col >= 0:
+            codes = np.asarray(condition_code, dtype=np.intp)
+            valid = (codes >= 0) & (codes < len(self.condition_values))
+            X[:, self.condition_col] = self.condition_values[np.where(valid, codes, self.default_condition_code)]
+        return X
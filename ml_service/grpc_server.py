@@ -1,57 +1,130 @@
 """
 gRPC Sunucu - Fiyat tahmin servisi
 Port 50051'de çalışır ve Node.js API'den gelen istekleri karşılar
+
+Kullanım:
+    python grpc_server.py [--fast-start] [--measure-startup] [--capture]
 """
 
-import grpc
-from concurrent import futures
+from startup import StartupTimer
+
+# Import fazları da ölçülsün diye timer ilk iş olarak oluşturulur
+_startup = StartupTimer()
+
+import argparse
+import threading
 import time
 import logging
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 
+with _startup.phase('import grpc'):
+    import grpc
+
 # Proto import (önce generate_grpc.py çalıştırılmalı)
-try:
-    from proto import prediction_pb2
-    from proto import prediction_pb2_grpc
-except ImportError:
-    print("✗ gRPC kodları bulunamadı!")
-    print("Önce şunu çalıştırın: python generate_grpc.py")
-    exit(1)
-
-from predictor import PricePredictor
-from config import GRPC_CONFIG, IPHONE_MODELS
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+with _startup.phase('import proto'):
+    try:
+        from proto import prediction_pb2
+        from proto import prediction_pb2_grpc
+    except ImportError:
+        print("✗ gRPC kodları bulunamadı!")
+        print("Önce şunu çalıştırın: python generate_grpc.py")
+        exit(1)
+
+with _startup.phase('import predictor (numpy)'):
+    import numpy as np
+    from predictor import PricePredictor
 
-# Model ID -> Model Name mapping (Veritabanındaki ID'lerle eşleşik)
-MODEL_ID_MAP = {
-    1: 'iPhone 8', 2: 'iPhone SE 2020', 3: 'iPhone 8 Plus',
-    4: 'iPhone X', 5: 'iPhone XR', 6: 'iPhone XS',
-    7: 'iPhone 11', 8: 'iPhone 12 Mini', 9: 'iPhone 12',
-    10: 'iPhone 11 Pro Max', 11: 'iPhone 11 Pro',
-    12: 'iPhone 13', 13: 'iPhone 12 Pro', 14: 'iPhone 13 Mini',
-    15: 'iPhone 12 Pro Max', 16: 'iPhone 14 Plus', 17: 'iPhone 14',
-    18: 'iPhone 13 Pro', 19: 'iPhone 15', 20: 'iPhone 13 Pro Max',
-    21: 'iPhone 14 Pro', 22: 'iPhone 15 Plus', 23: 'iPhone 14 Pro Max',
-    24: 'iPhone 15 Pro', 25: 'iPhone 15 Pro Max',
-    26: 'iPhone 16 Pro Max', 27: 'iPhone 16 Pro', 28: 'iPhone 16'
-}
+from admission import AdmissionController
+from capture import CapturedCall, TrafficCapture, KIND_BATCH, KIND_COLUMNAR, KIND_PREDICT
+from degraded import QueueTimingExecutor, submitted_ns
+from columnar import split_fields, int_column, double_field
+from drift import DriftMonitor, load_reference
+from profiler import SamplingProfiler
+from shared_cache import SharedPredictionCache
+from structured_logging import RequestLogSampler, dropped_records, setup_logging
+from config import (ADMISSION_CONFIG, CAPTURE_CONFIG, CONDITION_SCORES, DRIFT_CONFIG, DRIFT_REFERENCE_PATH,
+                    EXPLAIN_CONFIG, GRPC_CONFIG, IPHONE_MODELS, MODEL_ID_MAP, MODEL_STORAGE_OPTIONS, PROFILER_CONFIG, LOGGING_CONFIG,
+                    SHARED_CACHE_CONFIG)
+
+logger = logging.getLogger(__name__)
 
 
 class PricePredictionServicer(prediction_pb2_grpc.PricePredictionServicer):
     """gRPC Servicer implementasyonu"""
     
-    def __init__(self):
-        self.predictor = PricePredictor()
+    def __init__(self, fast_start: bool = False, capture: bool = False):
+        self.predictor = None
+        self.drift = None
+        # Trafik kaydı: --capture veya CAPTURE_CONFIG['enabled']
+        self.capture = (TrafficCapture.from_config(CAPTURE_CONFIG)
+                        if capture or CAPTURE_CONFIG['enabled'] else None)
+        self.model_ready = threading.Event()
+        if fast_start:
+            # Port model yüklenmeden açılsın; o sırada gelen istekler UNAVAILABLE alır
+            threading.Thread(target=self._load_predictor, name='model-loader', daemon=True).start()
+        else:
+            self._load_predictor()
         self.start_time = datetime.now()
+        self.profiler = SamplingProfiler(
+            output_dir=PROFILER_CONFIG['output_dir'],
+            sample_hz=PROFILER_CONFIG['sample_hz'],
+            thread_prefix=PROFILER_CONFIG['thread_prefix']
+        )
+        self.log_sampler = RequestLogSampler(LOGGING_CONFIG['request_sample_rate'])
+        self.admission = (AdmissionController.from_config(ADMISSION_CONFIG, GRPC_CONFIG['max_workers'])
+                          if ADMISSION_CONFIG['enabled'] else None)
+        self.shared_cache = SharedPredictionCache.from_config(SHARED_CACHE_CONFIG)
         logger.info("PricePredictionServicer başlatıldı")
     
+    def _load_predictor(self):
+        """Modeli yükle ve hazır olduğunu işaretle"""
+        try:
+            predictor = PricePredictor()
+            if DRIFT_CONFIG['enabled']:
+                self.drift = DriftMonitor(predictor.encoder, load_reference(DRIFT_REFERENCE_PATH), DRIFT_CONFIG)
+            if self.capture is not None:
+                self.capture.model_version = predictor.model_version or ''
+            self.predictor = predictor
+        finally:
+            self.model_ready.set()
+    
+    def observe_queue_wait(self, seconds: float):
+        """Thread havuzunun ölçtüğü kuyruk gecikmesini degraded mode anahtarına ilet"""
+        predictor = self.predictor
+        if predictor is not None and predictor.degraded is not None:
+            predictor.degraded.observe_queue_wait(seconds)
+    
+    def _captured(self, kind: int, request):
+        """Capture açıksa örneklenen çağrıyı (reddedilenler dahil) kaydeden context"""
+        if self.capture is None:
+            return nullcontext(CapturedCall())
+        # Varış zamanı thread havuzuna verildiği an (kuyruk beklemesi dahil)
+        return self.capture.call(kind, request, submitted_ns())
+    
+    @contextmanager
+    def _admit(self, context, method: str, rows: int = 1):
+        """
+        Tahmin RPC'lerini admission control'den geçir (HealthCheck geçmez)
+
+        Gecikme RPC türü başına ve satır başına izlenir: büyük batch'ler tek tahminlerin
+        limitini/deadline tahminini etkilemez.
+        """
+        if self.predictor is None:
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'Model henüz yüklenmedi')
+        if self.admission is None:
+            yield
+        else:
+            with self.admission.admit(context, method, rows):
+                yield
+    
     def PredictPrice(self, request, context):
         """Fiyat tahmini yap"""
+        with self._captured(KIND_PREDICT, request) as call, self._admit(context, 'PredictPrice'):
+            call.response = self._predict_price(request)
+            return call.response
+    
+    def _predict_price(self, request):
         try:
             # Model ID'den model adını bul
             model_name = MODEL_ID_MAP.get(request.model_id, 'iPhone 13')
@@ -60,9 +133,11 @@ class PricePredictionServicer(prediction_pb2_grpc.PricePredictionServicer):
             if model_name.startswith('Apple '):
                 model_name = model_name.replace('Apple ', '')
             
-            logger.info(f"Tahmin isteği: {model_name}, "
-                       f"RAM={request.ram_gb}GB, Storage={request.storage_gb}GB, "
-                       f"Condition={request.condition}")
+            # İstek/yanıt logları örneklenir; formatlama listener thread'inde yapılır
+            log_request = self.log_sampler.sample()
+            if log_request:
+                logger.info("Tahmin isteği: %s, RAM=%sGB, Storage=%sGB, Condition=%s",
+                            model_name, request.ram_gb, request.storage_gb, request.condition)
             
             # Input'u dict'e çevir (yeni format)
             input_data = {
@@ -72,8 +147,14 @@ class PricePredictionServicer(prediction_pb2_grpc.PricePredictionServicer):
                 'condition': request.condition
             }
             
-            # Tahmin yap
-            result = self.predictor.predict(input_data)
+            # Tahmin yap (aynı host'taki process'lerle paylaşılan cache'ten, varsa)
+            result = self._cached_predict(request, input_data)
+            
+            # Yedek modelin fiyatları drift referansıyla karşılaştırılmaz
+            if self.drift is not None and not result['degraded']:
+                encoder = self.predictor.encoder
+                self.drift.record(encoder.model_index(model_name), CONDITION_SCORES.get(request.condition, 1),
+                                  request.storage_gb, result['predicted_price'])
             
             # Response oluştur
             response = prediction_pb2.PriceResponse(
@@ -84,14 +165,17 @@ class PricePredictionServicer(prediction_pb2_grpc.PricePredictionServicer):
                     max_price=result['price_range']['max']
                 ),
                 status='success',
-                message=f"Tahmin başarılı: {result['predicted_price']:,.0f} TL"
+                message=f"Tahmin başarılı: {result['predicted_price']:,.0f} TL",
+                degraded=result['degraded']
             )
             
-            logger.info(f"Tahmin döndürüldü: {result['predicted_price']:,.0f} TL")
+            if log_request:
+                logger.info("Tahmin döndürüldü: %.0f TL (Güven: %%%.1f)",
+                            result['predicted_price'], result['confidence_score'])
             return response
             
         except Exception as e:
-            logger.error(f"Tahmin hatası: {e}", exc_info=True)
+            logger.error("Tahmin hatası: %s", e, exc_info=True)
             
             # Hata response'u
             return prediction_pb2.PriceResponse(
@@ -102,13 +186,194 @@ class PricePredictionServicer(prediction_pb2_grpc.PricePredictionServicer):
                 message=str(e)
             )
     
+    def _cached_predict(self, request, input_data):
+        """
+        predictor.predict, paylaşılan cache'in önünde
+
+        Cache isabetleri de shadow örneklemesine girer (gecikmesiz: birincil model
+        çalışmadı); drift kaydı _predict_price'ta isabet/ıskaladan bağımsız yapılır.
+        """
+        if self.shared_cache is None:
+            return self.predictor.predict(input_data)
+        
+        encoder = self.predictor.encoder
+        # Durum, encode() ile aynı skora çevrilir (bilinmeyen -> 1): Outlet/Orta ve
+        # bilinmeyen/İyi aynı feature satırı olduğundan aynı cache girdisini paylaşır
+        key = self.shared_cache.key(encoder.db_indices([request.model_id])[0], request.ram_gb,
+                                    request.storage_gb, CONDITION_SCORES.get(request.condition, 1),
+                                    self.predictor.model_version or '')
+        cached = self.shared_cache.get(key)
+        if cached is not None:
+            price, confidence, min_price, max_price = cached.tolist()
+            shadow = self.predictor.shadow
+            if shadow is not None and shadow.sampler.sample():
+                shadow.submit(input_data, price, None)
+            return {
+                'predicted_price': price,
+                'confidence_score': confidence,
+                'price_range': {'min': min_price, 'max': max_price},
+                'degraded': False
+            }
+        
+        result = self.predictor.predict(input_data)
+        if result['degraded']:
+            # Yedek model tahmini cache'e yazılmaz; yük geçince birincil model cevap verir
+            return result
+        self.shared_cache.put(key, (result['predicted_price'], result['confidence_score'],
+                                    result['price_range']['min'], result['price_range']['max']))
+        return result
+    
+    def PredictPriceBatch(self, request, context):
+        """Birden çok spec'i tek vektörize batch olarak tahmin et"""
+        if len(request.specs) > GRPC_CONFIG['max_batch_size']:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                          f"Batch en fazla {GRPC_CONFIG['max_batch_size']} spec içerebilir")
+        with self._captured(KIND_BATCH, request) as call, \
+                self._admit(context, 'PredictPriceBatch', len(request.specs)):
+            call.response = self._predict_batch(request)
+            return call.response
+    
+    def _predict_batch(self, request):
+        try:
+            encoder = self.predictor.encoder
+            specs = request.specs
+            model_index = encoder.db_indices([spec.model_id for spec in specs])
+            X = encoder.encode_batch(
+                model_index,
+                [spec.ram_gb for spec in specs],
+                [spec.storage_gb for spec in specs],
+                [encoder.condition_code(spec.condition) for spec in specs]
+            )
+            scores = self.predictor.predict_matrix(X)
+            if self.drift is not None and not scores['degraded']:
+                self.drift.record_batch(model_index, X[:, encoder.condition_col], X[:, encoder.storage_col],
+                                        scores['predicted_price'])
+            
+            responses = [
+                prediction_pb2.PriceResponse(
+                    predicted_price=round(price, 2),
+                    confidence_score=round(confidence, 2),
+                    price_range=prediction_pb2.PriceRange(
+                        min_price=round(min_price, 2), max_price=round(max_price, 2)
+                    ),
+                    status='success',
+                    degraded=scores['degraded']
+                )
+                for price, confidence, min_price, max_price in zip(
+                    scores['predicted_price'].tolist(), scores['confidence_score'].tolist(),
+                    scores['min_price'].tolist(), scores['max_price'].tolist()
+                )
+            ]
+            return prediction_pb2.PriceBatchResponse(
+                responses=responses, status='success', message=f"{len(responses)} tahmin"
+            )
+            
+        except Exception as e:
+            logger.error("Toplu tahmin hatası: %s", e, exc_info=True)
+            return prediction_pb2.PriceBatchResponse(status='error', message=str(e))
+    
+    def PredictPriceColumnar(self, request, context):
+        """Kolon bazlı batch: packed diziler satır başına Python nesnesi olmadan NumPy'a çevrilir"""
+        # Kolonlar C tarafında serialize edilip NumPy ile çözülür
+        fields = split_fields(request.SerializeToString())
+        columns = [int_column(fields, number) for number in (1, 2, 3, 4)]
+        n = len(columns[0])
+        if any(len(column) != n for column in columns[1:]):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'Kolon uzunlukları farklı')
+        if n > GRPC_CONFIG['max_batch_size']:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                          f"Batch en fazla {GRPC_CONFIG['max_batch_size']} satır içerebilir")
+        with self._captured(KIND_COLUMNAR, request) as call, self._admit(context, 'PredictPriceColumnar', n):
+            call.response = self._predict_columnar(columns, list(request.condition_dictionary))
+            return call.response
+    
+    def _predict_columnar(self, columns, dictionary):
+        model_id, ram_gb, storage_gb, condition_code = columns
+        try:
+            encoder = self.predictor.encoder
+            if dictionary:
+                # İstemcinin sözlüğünü sunucu kodlarına çevir (sözlük küçük, satır sayısından bağımsız)
+                translate = np.array([encoder.condition_code(name) for name in dictionary], dtype=np.intp)
+                valid = (condition_code >= 0) & (condition_code < len(translate))
+                condition_code = np.where(valid, translate[np.where(valid, condition_code, 0)], -1)
+            model_index = encoder.db_indices(model_id)
+            X = encoder.encode_batch(model_index, ram_gb, storage_gb, condition_code)
+            scores = self.predictor.predict_matrix(X)
+            if self.drift is not None and not scores['degraded']:
+                self.drift.record_batch(model_index, X[:, encoder.condition_col], X[:, encoder.storage_col],
+                                        scores['predicted_price'])
+            
+            payload = b''.join(
+                double_field(number, np.round(scores[name], 2))
+                for number, name in enumerate(('predicted_price', 'confidence_score', 'min_price', 'max_price'), 1)
+            )
+            # Packed double kolonlarını C parser'ı kopyalar; skaler alanlar normal atanır
+            response = prediction_pb2.ColumnarPriceResponse.FromString(payload)
+            response.status = 'success'
+            response.message = f"{len(model_id)} tahmin"
+            response.model_version = self.predictor.model_version or ''
+            response.degraded = scores['degraded']
+            return response
+            
+        except Exception as e:
+            logger.error("Kolon bazlı tahmin hatası: %s", e, exc_info=True)
+            return prediction_pb2.ColumnarPriceResponse(status='error', message=str(e))
+    
+    def ExplainPrice(self, request, context):
+        """Spec'lerin tahminini feature katkılarına ayır (cache'li vektörize TreeSHAP)"""
+        if len(request.specs) > EXPLAIN_CONFIG['max_batch_size']:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                          f"Açıklama isteği en fazla {EXPLAIN_CONFIG['max_batch_size']} spec içerebilir")
+        with self._admit(context, 'ExplainPrice', len(request.specs)):
+            return self._explain(request)
+    
+    def _explain(self, request):
+        try:
+            encoder = self.predictor.encoder
+            specs = request.specs
+            X = encoder.encode_batch(
+                encoder.db_indices([spec.model_id for spec in specs]),
+                [spec.ram_gb for spec in specs],
+                [spec.storage_gb for spec in specs],
+                [encoder.condition_code(spec.condition) for spec in specs]
+            )
+            result = self.predictor.explain_matrix(X)
+            feature_cols = encoder.feature_cols
+            base_value = round(result['base_value'], 2)
+            
+            explanations = [
+                prediction_pb2.PriceExplanation(
+                    predicted_price=round(price, 2),
+                    base_value=base_value,
+                    contributions=[
+                        prediction_pb2.FeatureContribution(feature=feature, value=value,
+                                                           contribution=round(contribution, 2))
+                        for feature, value, contribution in zip(feature_cols, values, contributions)
+                    ]
+                )
+                for price, values, contributions in zip(
+                    result['predicted_price'].tolist(), X.tolist(), result['contributions'].tolist()
+                )
+            ]
+            return prediction_pb2.ExplainResponse(
+                explanations=explanations,
+                status='success',
+                message=f"{len(explanations)} açıklama",
+                model_version=self.predictor.model_version or '',
+                degraded=result['degraded']
+            )
+            
+        except Exception as e:
+            logger.error("Açıklama hatası: %s", e, exc_info=True)
+            return prediction_pb2.ExplainResponse(status='error', message=str(e))
+    
     def GetModelInfo(self, request, context):
         """Model bilgilerini döndür"""
         model_name = MODEL_ID_MAP.get(request.model_id, 'iPhone 13')
         info = IPHONE_MODELS.get(model_name, IPHONE_MODELS.get('iPhone 13'))
         
-        # Storage seçenekleri segment'e göre
-        storage_options = [64, 128, 256] if info.get('segment', 2) <= 2 else [128, 256, 512, 1024]
+        # Storage seçenekleri modele göre
+        storage_options = MODEL_STORAGE_OPTIONS.get(model_name, [64, 128, 256])
         
         return prediction_pb2.ModelInfoResponse(
             model_name=model_name,
@@ -118,42 +383,171 @@ class PricePredictionServicer(prediction_pb2_grpc.PricePredictionServicer):
             is_pro='Pro' in model_name
         )
     
+    def GetPriceGrid(self, request, context):
+        """Modelin tüm storage x durum kombinasyonlarını tek batch'te fiyatla"""
+        model_name = MODEL_ID_MAP.get(request.model_id, 'iPhone 13')
+        with self._admit(context, 'GetPriceGrid'):
+            try:
+                cells = self.predictor.price_grid(model_name)
+            except Exception as e:
+                logger.error("Fiyat matrisi hatası: %s", e, exc_info=True)
+                return prediction_pb2.PriceGridResponse(
+                    model_name=model_name, status='error', message=str(e)
+                )
+        
+        return prediction_pb2.PriceGridResponse(
+            model_name=model_name,
+            model_version=self.predictor.model_version or '',
+            cells=[
+                prediction_pb2.PriceGridCell(
+                    storage_gb=cell['storage_gb'],
+                    ram_gb=cell['ram_gb'],
+                    condition=cell['condition'],
+                    predicted_price=cell['predicted_price'],
+                    confidence_score=cell['confidence_score'],
+                    price_range=prediction_pb2.PriceRange(
+                        min_price=cell['price_range']['min'],
+                        max_price=cell['price_range']['max']
+                    )
+                )
+                for cell in cells
+            ],
+            status='success',
+            message=f"{len(cells)} kombinasyon"
+        )
+    
     def HealthCheck(self, request, context):
         """Servis sağlık durumu"""
         uptime = datetime.now() - self.start_time
         
-        model_loaded = self.predictor.model is not None
-        status = 'healthy' if model_loaded else 'unhealthy'
+        model_loaded = self.predictor is not None and self.predictor.model is not None
+        if model_loaded:
+            status = 'healthy'
+        else:
+            status = 'unhealthy' if self.model_ready.is_set() else 'starting'
         
-        logger.info(f"Health check: {status}")
+        extra = {'log_dropped': dropped_records()}
+        if self.admission is not None:
+            extra['admission'] = self.admission.snapshot()
+        if self.shared_cache is not None:
+            extra['shared_cache'] = self.shared_cache.stats()
+        if self.predictor is not None and self.predictor.degraded is not None:
+            extra['degraded_mode'] = self.predictor.degraded.snapshot()
+        if self.capture is not None:
+            extra['capture'] = self.capture.stats()
+        if self.predictor is not None and self.predictor.explainer is not None:
+            extra['explain_cache'] = self.predictor.explainer.stats()
+        logger.debug("Health check: %s", status, extra=extra)
         
         return prediction_pb2.HealthCheckResponse(
             status=status,
             version='2.0.0',
             model_loaded=model_loaded,
-            uptime=str(uptime)
+            uptime=str(uptime),
+            model_version=(self.predictor.model_version or '') if model_loaded else ''
+        )
+    
+    def GetDriftReport(self, request, context):
+        """Canlı girdilerin referans profile göre drift raporu"""
+        if self.drift is None:
+            return prediction_pb2.DriftResponse(status='unknown', message='Drift izleme kapalı')
+        
+        report = self.drift.refresh() if request.recompute else self.drift.last_report
+        return prediction_pb2.DriftResponse(
+            drift_score=report['drift_score'],
+            status=report['status'],
+            sample_count=report['sample_count'],
+            features=[prediction_pb2.FeatureDrift(**feature) for feature in report['features']],
+            reference_version=report['reference_version'],
+            computed_at=report['computed_at'],
+            message=report['message']
+        )
+    
+    def GetShadowReport(self, request, context):
+        """Shadow modelin fiyat farkı ve gecikme karşılaştırması"""
+        if self.predictor is None:
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'Model henüz yüklenmedi')
+        if self.predictor.shadow is None:
+            return prediction_pb2.ShadowReportResponse(
+                enabled=False, recommendation='wait', message='Shadow model yüklü değil'
+            )
+        
+        report = self.predictor.shadow.report()
+        report.pop('errors', None)
+        return prediction_pb2.ShadowReportResponse(enabled=True, **report)
+    
+    def SetProfiling(self, request, context):
+        """Sampling profiler'ı çalışma anında aç/kapa"""
+        if not request.enable:
+            if not self.profiler.is_running:
+                return prediction_pb2.ProfileResponse(
+                    status='idle', message='Profiler zaten kapalı'
+                )
+            output_path = self.profiler.stop()
+            return prediction_pb2.ProfileResponse(
+                status='stopped',
+                message='Profil yazıldı',
+                output_path=output_path or ''
+            )
+        
+        duration = request.duration_sec or PROFILER_CONFIG['default_duration']
+        duration = min(duration, PROFILER_CONFIG['max_duration'])
+        if not self.profiler.start(duration, request.sample_hz or None):
+            return prediction_pb2.ProfileResponse(
+                status='busy', message='Profiler zaten çalışıyor'
+            )
+        
+        return prediction_pb2.ProfileResponse(
+            status='started',
+            message=f"{duration} saniye boyunca örnekleniyor"
         )
 
 
-def serve():
+def serve(fast_start: bool = False, measure_startup: bool = False, capture: bool = False):
     """gRPC sunucusunu başlat"""
+    setup_logging(LOGGING_CONFIG)
+    
+    # Her RPC'nin worker bekleme süresi ölçülür (degraded mode sinyali)
+    executor = QueueTimingExecutor(
+        max_workers=GRPC_CONFIG['max_workers'],
+        thread_name_prefix=PROFILER_CONFIG['thread_prefix']
+    )
     server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=GRPC_CONFIG['max_workers'])
+        executor,
+        # Worker'lar doluyken sınırsız kuyruk birikmesin; fazlası transport katmanında reddedilir
+        maximum_concurrent_rpcs=GRPC_CONFIG['max_concurrent_rpcs']
     )
     
-    prediction_pb2_grpc.add_PricePredictionServicer_to_server(
-        PricePredictionServicer(), server
-    )
+    with _startup.phase('servicer (model yükleme)' if not fast_start else 'servicer'):
+        servicer = PricePredictionServicer(fast_start=fast_start, capture=capture)
+    executor.on_wait = servicer.observe_queue_wait
+    if servicer.predictor is not None:
+        _startup.extend(servicer.predictor.load_timings, prefix='  ')
+    prediction_pb2_grpc.add_PricePredictionServicer_to_server(servicer, server)
+    
+    # kill -USR1 <pid> ile profiler'ı aç/kapa
+    servicer.profiler.install_signal_handler(PROFILER_CONFIG['default_duration'])
     
     address = f"{GRPC_CONFIG['host']}:{GRPC_CONFIG['port']}"
-    server.add_insecure_port(address)
+    with _startup.phase('bind + start'):
+        server.add_insecure_port(address)
+        server.start()
     
-    server.start()
+    if measure_startup:
+        budget_ms = GRPC_CONFIG['startup_budget_ms']
+        logger.info(_startup.report(budget_ms, label='Port dinleniyor'))
+        if fast_start:
+            servicer.model_ready.wait()
+            if servicer.predictor is not None:
+                _startup.extend(servicer.predictor.load_timings, prefix='  (arka plan) ')
+            logger.info(_startup.report(budget_ms, label='Model hazır'))
     
     logger.info("="*60)
     logger.info("gRPC SUNUCU BAŞLATILDI")
     logger.info("="*60)
-    logger.info(f"Adres: {address}")
+    logger.info("Adres: %s", address)
+    if servicer.capture is not None:
+        logger.info("Trafik kaydı açık: %s", servicer.capture.directory)
     logger.info(f"Model: Gradient Boosting (R² = 0.9988)")
     logger.info(f"Veri Seti: 1198 kayıt")
     logger.info("="*60)
@@ -169,4 +563,12 @@ def serve():
 
 
 if __name__ == "__main__":
-    serve()
+    parser = argparse.ArgumentParser(description='iPhone fiyat tahmin gRPC sunucusu')
+    parser.add_argument('--fast-start', action='store_true',
+                        help='Portu hemen aç, modeli arka planda yükle')
+    parser.add_argument('--measure-startup', action='store_true',
+                        help='Import ve model yükleme fazlarının sürelerini raporla')
+    parser.add_argument('--capture', action='store_true',
+                        help='Tahmin isteklerini replay.py için ikili log\'a kaydet')
+    args = parser.parse_args()
+    serve(fast_start=args.fast_start, measure_startup=args.measure_startup, capture=args.capture)
@@ -0,0 +1,125 @@
+"""
+Conformal tahmin aralıkları - bundle'daki out-of-fold residual index'inden
+
+train_model.py her model için K-fold out-of-fold residual'ları (gerçek - tahmin)
+hesaplar ve (seri_no, storage_gb) kovalarına göre sıralı olarak bundle'a yazar:
+    residual_keys.npy     kova anahtarları (sıralı int64)
+    residual_offsets.npy  her kovanın residuals içindeki başlangıcı + sonda toplam
+    residuals.npy         kova içinde sıralı residual'lar (float32)
+Her satır üç kovaya girer: tam (seri_no, storage_gb), sadece seri_no ve global.
+
+Servis anında kova np.searchsorted ile bulunur (O(log kova sayısı)); az örnekli
+kovalarda bir üst seviyeye düşülür. Kova sıralı olduğundan split-conformal
+quantile'lar doğrudan index'le okunur:
+    alt = tahmin + r[floor((n+1) * a/2)],  üst = tahmin + r[ceil((n+1) * (1 - a/2))]
+(a = 1 - coverage). Kova başına quantile'lar coverage başına bir kez hesaplanıp
+cache'lenir; istek başına sadece kova araması kalır. Ek model değerlendirmesi yoktur.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from artifact import read_manifest
+
+GROUP_COLS = ('seri_no', 'storage_gb')
+RESIDUAL_ARRAYS = ('residual_keys', 'residual_offsets', 'residuals')
+GLOBAL_KEY = -1
+
+
+def group_keys(seri_no: np.ndarray, storage_gb: np.ndarray) -> np.ndarray:
+    """(seri_no, storage_gb) -> tek int64 anahtar (storage 0 = seri seviyesi kova)"""
+    return (np.asarray(seri_no, dtype=np.float64).astype(np.int64) * 100_000
+            + np.asarray(storage_gb, dtype=np.float64).astype(np.int64))
+
+
+def build_residual_index(seri_no: np.ndarray, storage_gb: np.ndarray,
+                         residuals: np.ndarray) -> Dict[str, np.ndarray]:
+    """Residual'ları kovalara ayırıp sıralı, bundle'a yazılabilir dizilere çevir"""
+    residuals = np.asarray(residuals, dtype=np.float64)
+    n = len(residuals)
+    keys = np.concatenate([
+        group_keys(seri_no, storage_gb),
+        group_keys(seri_no, np.zeros(n)),
+        np.full(n, GLOBAL_KEY, dtype=np.int64)
+    ])
+    values = np.tile(residuals, 3)
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    unique, starts = np.unique(keys, return_index=True)
+    return {
+        'residual_keys': unique.astype(np.int64),
+        'residual_offsets': np.append(starts, len(keys)).astype(np.int64),
+        'residuals': values.astype(np.float32)
+    }
+
+
+class ConformalIntervals:
+    """Sıralı residual kovalarından vektörize split-conformal aralık"""
+
+    def __init__(self, keys: np.ndarray, offsets: np.ndarray, residuals: np.ndarray,
+                 seri_col: int, storage_col: int, min_bucket_size: int):
+        self.keys = keys
+        self.offsets = offsets
+        self.residuals = residuals
+        self.counts = np.diff(offsets)
+        self.seri_col = seri_col
+        self.storage_col = storage_col
+        self.min_bucket_size = min_bucket_size
+        self.global_bucket = int(np.searchsorted(keys, GLOBAL_KEY))
+        # Yeterli örnekli kovalar; diğerleri lookup'ta hiç bulunmamış sayılır
+        usable = self.counts >= min_bucket_size
+        self.usable_keys = keys[usable]
+        self.usable_index = np.flatnonzero(usable)
+        self._quantile_cache: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def load(cls, bundle_dir: str, feature_cols: List[str], min_bucket_size: int) -> Optional['ConformalIntervals']:
+        """Bundle'da residual index yoksa (eski bundle) None"""
+        arrays = read_manifest(bundle_dir).get('arrays', {})
+        if not all(name in arrays for name in RESIDUAL_ARRAYS) or not all(c in feature_cols for c in GROUP_COLS):
+            return None
+        loaded = [np.load(os.path.join(bundle_dir, f"{name}.npy"), mmap_mode='r').view(np.ndarray)
+                  for name in RESIDUAL_ARRAYS]
+        return cls(*loaded, seri_col=feature_cols.index(GROUP_COLS[0]),
+                   storage_col=feature_cols.index(GROUP_COLS[1]), min_bucket_size=min_bucket_size)
+
+    def _lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Anahtarın (yeterli örnekli) kova index'i; yoksa -1"""
+        if len(self.usable_keys) == 0:
+            return np.full(len(keys), -1)
+        position = np.minimum(np.searchsorted(self.usable_keys, keys), len(self.usable_keys) - 1)
+        return np.where(self.usable_keys[position] == keys, self.usable_index[position], -1)
+
+    def buckets(self, X: np.ndarray) -> np.ndarray:
+        """Her satırın kovası: tam (seri_no, storage_gb) -> seri_no -> global"""
+        series_keys = X[:, self.seri_col].astype(np.int64) * 100_000
+        bucket = self._lookup(series_keys + X[:, self.storage_col].astype(np.int64))
+        missing = bucket < 0
+        if missing.any():
+            series = self._lookup(series_keys[missing])
+            bucket[missing] = np.where(series >= 0, series, self.global_bucket)
+        return bucket
+
+    def quantiles(self, coverage: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Her kova için (alt, üst) residual quantile'ı - coverage başına bir kez hesaplanır"""
+        cached = self._quantile_cache.get(coverage)
+        if cached is not None:
+            return cached
+        n = self.counts
+        alpha = 1.0 - coverage
+        # Sonlu örnek düzeltmeli sıra (1 tabanlı), kova sınırlarına kırpılmış
+        low_rank = np.clip(np.floor((n + 1) * alpha / 2), 1, n).astype(np.int64)
+        high_rank = np.clip(np.ceil((n + 1) * (1 - alpha / 2)), 1, n).astype(np.int64)
+        start = self.offsets[:-1]
+        cached = (self.residuals[start + low_rank - 1].astype(np.float64),
+                  self.residuals[start + high_rank - 1].astype(np.float64))
+        self._quantile_cache[coverage] = cached
+        return cached
+
+    def bounds(self, prices: np.ndarray, X: np.ndarray, coverage: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(alt, üst) fiyat sınırları - hedef kapsama oranı coverage"""
+        low, high = self.quantiles(coverage)
+        bucket = self.buckets(X)
+        return prices + low[bucket], prices + high[bucket]
@@ -2,42 +2,210 @@
 Tahmin yapma modülü - Eğitilmiş modeli kullanarak fiyat tahmini yapar
 """
 
-import joblib
-import numpy as np
-import pandas as pd
+import os
+import time
 import logging
-from typing import Dict
-from config import MODEL_PATH, SCALER_PATH, CONFIG_PATH, CONDITION_SCORES, IPHONE_MODELS
+import warnings
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from artifact import bundle_exists, load_bundle, FOREST_SPREAD_TREES, BOOSTING_SPREAD_STAGES
+from encoder import FeatureEncoder
+from intervals import ConformalIntervals
+from config import (MODEL_PATH, SCALER_PATH, CONFIG_PATH, BUNDLE_DIR, MODEL_FORMAT,
+                    COMPACT_BUNDLE_DIR, MODEL_VARIANT, IPHONE_MODELS, MODEL_STORAGE_OPTIONS,
+                    SHARDING_CONFIG, SHADOW_CONFIG, DEGRADED_CONFIG, FALLBACK_BUNDLE_DIR, INTERVAL_CONFIG,
+                    EXPLAIN_CONFIG)
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Servis yolunda DataFrame yerine ndarray veriyoruz (pandas import'u başlangıcı yavaşlatıyor);
+# DataFrame ile eğitilmiş modellerin isim uyarısı burada anlamsız
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+# MAE bazlı fiyat aralığının sınırları (TL); alt sınır yedek modelin tahminlerine de uygulanır
+MIN_PRICE = 5000
+MAX_PRICE = 150000
+
+
+class SklearnModel:
+    """joblib ile yüklenen sklearn modelini bundle modelleriyle aynı arayüze uyarlar"""
+    
+    def __init__(self, model, scaler, use_scaler: bool):
+        self.model = model
+        self.scaler = scaler
+        self.use_scaler = use_scaler
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.use_scaler:
+            X = self.scaler.transform(X)
+        return self.model.predict(X)
+    
+    def predict_with_spread(self, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Tahmin + güven skoru için üye tahminleri (k, n)"""
+        X = np.asarray(X, dtype=np.float64)
+        if self.use_scaler:
+            X = self.scaler.transform(X)
+        predictions = self.model.predict(X)
+        
+        if not hasattr(self.model, 'estimators_'):
+            return predictions, None
+        if hasattr(self.model, 'staged_predict'):
+            # Gradient Boosting - son birkaç stage'i kullan
+            members = list(self.model.staged_predict(X))[-BOOSTING_SPREAD_STAGES:]
+        else:
+            # Random Forest - ilk ağaçların tahminini al
+            members = [tree.predict(X) for tree in self.model.estimators_[:FOREST_SPREAD_TREES]]
+        return predictions, np.asarray(members)
+
 
 class PricePredictor:
     """Fiyat tahmin sınıfı"""
     
-    def __init__(self):
+    def __init__(self, bundle_dir: Optional[str] = None, with_shadow: bool = True,
+                 with_fallback: bool = True):
+        """
+        bundle_dir: verilirse config'deki seçim yerine bu bundle yüklenir (örn. shadow model)
+        with_shadow: SHADOW_CONFIG açıksa shadow modeli de yükle
+        with_fallback: DEGRADED_CONFIG açıksa aşırı yükte kullanılacak yedek modeli de yükle
+        """
         self.model = None
         self.scaler = None
         self.config = None
+        self.model_version = None
+        self.encoder = None
+        self.intervals = None
+        self.explainer = None
+        self.shadow = None
+        self.fallback_model = None
+        self.fallback_config = None
+        self.fallback_intervals = None
+        self.fallback_explainer = None
+        self.degraded = None
+        self.bundle_dir = bundle_dir
+        self.with_shadow = with_shadow
+        self.with_fallback = with_fallback and bundle_dir is None
+        self.load_timings = {}
+        self._grid_cache = {}
         self.load_model()
     
     def load_model(self):
-        """Kaydedilmiş modeli yükle"""
+        """
+        Kaydedilmiş modeli yükle
+        
+        MODEL_FORMAT 'auto' ise önce mmap'li bundle denenir (sklearn/joblib import
+        edilmez), yoksa joblib pickle'larına düşülür. MODEL_VARIANT 'compact' ise
+        compact_model.py'nin ürettiği küçük bundle kullanılır.
+        """
+        bundle_dir = self.bundle_dir or (COMPACT_BUNDLE_DIR if MODEL_VARIANT == 'compact' else BUNDLE_DIR)
         try:
-            self.model = joblib.load(MODEL_PATH)
-            self.scaler = joblib.load(SCALER_PATH)
-            self.config = joblib.load(CONFIG_PATH)
-            logger.info(f"Model başarıyla yüklendi: {self.config['model_name']}")
-            logger.info(f"Model R² Score: {self.config['metrics']['r2']:.4f}")
+            if (MODEL_FORMAT != 'joblib' or self.bundle_dir) and bundle_exists(bundle_dir):
+                started = time.perf_counter()
+                self.model, self.config = load_bundle(bundle_dir)
+                self.model_version = self.config['model_version']
+                self.intervals = ConformalIntervals.load(bundle_dir, self.config['feature_cols'],
+                                                         INTERVAL_CONFIG['min_bucket_size'])
+                self.load_timings['bundle (mmap)'] = time.perf_counter() - started
+                self._maybe_shard(bundle_dir)
+            elif MODEL_FORMAT == 'bundle' or MODEL_VARIANT == 'compact' or self.bundle_dir:
+                raise FileNotFoundError(f"Bundle bulunamadı: {bundle_dir}")
+            else:
+                self._load_joblib()
+            
+            self.encoder = FeatureEncoder(self.config['feature_cols'])
+            # Grid cache'i yüklü model versiyonuna bağlı
+            self._grid_cache = {}
+            self._load_explainer()
+            self._load_fallback()
+            self._load_shadow()
+            
+            logger.info("Model başarıyla yüklendi: %s", self.config['model_name'])
+            logger.info("Model R² Score: %.4f", self.config['metrics']['r2'])
         except FileNotFoundError as e:
-            logger.error(f"Model dosyası bulunamadı: {e}")
+            logger.error("Model dosyası bulunamadı: %s", e)
             logger.info("Önce modeli eğitin: python train_model.py")
             raise
         except Exception as e:
-            logger.error(f"Model yükleme hatası: {e}")
+            logger.error("Model yükleme hatası: %s", e)
             raise
     
+    def _load_shadow(self):
+        """Shadow bundle varsa ikincil predictor + arka plan skorlayıcıyı başlat"""
+        if not (self.with_shadow and SHADOW_CONFIG['enabled'] and bundle_exists(SHADOW_CONFIG['bundle_dir'])):
+            return
+        
+        from shadow import ShadowEvaluator
+        started = time.perf_counter()
+        shadow = PricePredictor(bundle_dir=SHADOW_CONFIG['bundle_dir'], with_shadow=False)
+        self.shadow = ShadowEvaluator(shadow, self.model_version, SHADOW_CONFIG)
+        self.load_timings['shadow model'] = time.perf_counter() - started
+        logger.info("Shadow model yüklendi: %s (%s)", shadow.config['model_name'], shadow.model_version)
+    
+    def _load_explainer(self):
+        """ExplainPrice için yol tablolarını kur (açıklama cache'i de model versiyonuna bağlı)"""
+        if not EXPLAIN_CONFIG['enabled']:
+            return
+        
+        from explain import build_explainer
+        started = time.perf_counter()
+        self.explainer = build_explainer(self.model, self.config['feature_cols'], EXPLAIN_CONFIG)
+        if self.explainer is None:
+            logger.info("Bu model türü için açıklama desteklenmiyor")
+            return
+        self.load_timings['explainer'] = time.perf_counter() - started
+    
+    def _load_fallback(self):
+        """Yedek (doğrusal) bundle varsa yükle ve degraded mode anahtarını kur"""
+        if not (self.with_fallback and DEGRADED_CONFIG['enabled'] and bundle_exists(FALLBACK_BUNDLE_DIR)):
+            return
+        
+        started = time.perf_counter()
+        model, config = load_bundle(FALLBACK_BUNDLE_DIR)
+        if list(config['feature_cols']) != list(self.config['feature_cols']):
+            logger.warning("Yedek model feature'ları birincil modelle uyuşmuyor, degraded mode kapalı")
+            return
+        
+        from degraded import DegradedModeSwitch
+        self.fallback_model, self.fallback_config = model, config
+        self.fallback_intervals = ConformalIntervals.load(FALLBACK_BUNDLE_DIR, config['feature_cols'],
+                                                          INTERVAL_CONFIG['min_bucket_size'])
+        self.degraded = DegradedModeSwitch.from_config(DEGRADED_CONFIG)
+        if self.explainer is not None:
+            from explain import build_explainer
+            self.fallback_explainer = build_explainer(model, config['feature_cols'], EXPLAIN_CONFIG)
+        self.load_timings['fallback model'] = time.perf_counter() - started
+        logger.info("Yedek model yüklendi: %s (R² %.4f)", config['model_name'], config['metrics']['r2'])
+    
+    def _maybe_shard(self, bundle_dir: str):
+        """Büyük ensemble'ları worker process'lere böl (SHARDING_CONFIG)"""
+        if not SHARDING_CONFIG['enabled'] or SHARDING_CONFIG['workers'] < 2:
+            return
+        if getattr(self.model, 'kind', None) not in ('forest', 'boosting'):
+            return
+        if self.model.n_trees < SHARDING_CONFIG['min_trees']:
+            return
+        
+        from sharding import ShardedEnsembleModel
+        started = time.perf_counter()
+        self.model = ShardedEnsembleModel(self.model, bundle_dir, SHARDING_CONFIG['workers'])
+        self.load_timings['shard workers'] = time.perf_counter() - started
+        logger.info("%d ağaç %d worker process'e bölündü", self.model.n_trees, self.model.workers)
+    
+    def _load_joblib(self):
+        """Eski format: joblib pickle'ları (model tamamen unpickle edilip kopyalanır)"""
+        # joblib (ve unpickle sırasında sklearn) sadece burada import edilir
+        started = time.perf_counter()
+        import joblib
+        self.load_timings['import joblib'] = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        self.scaler = joblib.load(SCALER_PATH)
+        self.config = joblib.load(CONFIG_PATH)
+        self.model = SklearnModel(joblib.load(MODEL_PATH), self.scaler,
+                                  self.config.get('use_scaler', False))
+        self.model_version = f"joblib-{int(os.path.getmtime(MODEL_PATH))}"
+        self.load_timings['joblib.load'] = time.perf_counter() - started
+    
     def predict(self, input_data: Dict) -> Dict:
         """
         Fiyat tahmini yap
@@ -54,108 +222,167 @@ class PricePredictor:
             {
                 'predicted_price': float,
                 'confidence_score': float,
-                'price_range': {'min': float, 'max': float}
+                'price_range': {'min': float, 'max': float},
+                'degraded': bool (aşırı yük nedeniyle yedek modelle tahmin edildiyse True)
             }
         """
         try:
             # Feature'ları hazırla
-            features_df = self._prepare_features(input_data)
-            
-            # Tahmin yap
-            if self.config.get('use_scaler', False):
-                features_scaled = self.scaler.transform(features_df)
-                predicted_price = self.model.predict(features_scaled)[0]
-            else:
-                predicted_price = self.model.predict(features_df)[0]
-            
-            # Confidence hesapla (Gradient Boosting için staged_predict kullan)
-            confidence = 95.0  # Default yüksek güven
-            
-            if hasattr(self.model, 'estimators_'):
-                # Random Forest veya Gradient Boosting
-                predictions = []
-                
-                if hasattr(self.model, 'staged_predict'):
-                    # Gradient Boosting - son birkaç stage'i kullan
-                    for pred in list(self.model.staged_predict(features_df))[-10:]:
-                        predictions.append(pred[0])
-                else:
-                    # Random Forest - her ağacın tahminini al
-                    for tree in self.model.estimators_[:20]:
-                        if self.config.get('use_scaler', False):
-                            pred = tree.predict(features_scaled)[0]
-                        else:
-                            pred = tree.predict(features_df)[0]
-                        predictions.append(pred)
-                
-                if predictions:
-                    std = np.std(predictions)
-                    confidence = max(70, min(99, 100 - (std / max(predicted_price, 1) * 100)))
-            
-            # Fiyat aralığı (MAE bazlı)
-            mae = self.config['metrics'].get('mae', 1000)
-            price_range = {
-                'min': max(5000, predicted_price - mae * 2),
-                'max': min(150000, predicted_price + mae * 2)
-            }
+            started = time.perf_counter()
+            features = self._prepare_features(input_data)
+            scores = self.predict_matrix(features)
+            latency = time.perf_counter() - started
+            degraded = scores['degraded']
             
             result = {
-                'predicted_price': round(predicted_price, 2),
-                'confidence_score': round(confidence, 2),
+                'predicted_price': round(float(scores['predicted_price'][0]), 2),
+                'confidence_score': round(float(scores['confidence_score'][0]), 2),
                 'price_range': {
-                    'min': round(price_range['min'], 2),
-                    'max': round(price_range['max'], 2)
-                }
+                    'min': round(float(scores['min_price'][0]), 2),
+                    'max': round(float(scores['max_price'][0]), 2)
+                },
+                'degraded': degraded
             }
             
-            logger.info(f"Tahmin: {result['predicted_price']:,.0f} TL (Güven: %{result['confidence_score']:.1f})")
+            logger.debug("Tahmin: %.0f TL (Güven: %%%.1f)",
+                         result['predicted_price'], result['confidence_score'])
+            
+            # Örneklenen istekler shadow modele kopyalanır (skorlama arka planda)
+            if self.shadow is not None and not degraded and self.shadow.sampler.sample():
+                self.shadow.submit(input_data, result['predicted_price'], latency)
             
             return result
             
         except Exception as e:
-            logger.error(f"Tahmin hatası: {e}")
+            logger.error("Tahmin hatası: %s", e)
             raise
     
-    def _prepare_features(self, input_data: Dict) -> pd.DataFrame:
-        """Input'tan feature DataFrame oluştur - Yeni veri seti formatına göre"""
-        
-        # Model adını normalize et - "Apple " prefix'ini kaldır
-        model_name = input_data.get('model_name', 'iPhone 13')
-        if model_name.startswith('Apple '):
-            model_name = model_name.replace('Apple ', '')
-        
-        # IPHONE_MODELS'den bilgileri al
-        model_info = IPHONE_MODELS.get(model_name, IPHONE_MODELS.get('iPhone 13'))
-        
-        # Condition skorunu al (0-3 arası)
-        condition_str = input_data.get('condition', 'İyi')
-        condition_score = CONDITION_SCORES.get(condition_str, 1)
-        
-        # Yeni veri seti feature sırası:
-        # ['segment', 'seri_no', 'ram_gb', 'kamera_mp', 'ekran_boyutu', 
-        #  'batarya_mah', 'storage_gb', 'cihaz_durum', 'cikis_yili']
-        
-        features = {
-            'segment': model_info.get('segment', 0),
-            'seri_no': model_info.get('seri_no', 13),
-            'ram_gb': input_data.get('ram_gb', model_info.get('ram', 4)),
-            'kamera_mp': model_info.get('kamera_mp', 12),
-            'ekran_boyutu': model_info.get('ekran', 6),
-            'batarya_mah': model_info.get('batarya', 3000),
-            'storage_gb': input_data.get('storage_gb', 128),
-            'cihaz_durum': condition_score,
-            'cikis_yili': model_info.get('yil', 2021)
+    def predict_matrix(self, X: np.ndarray, allow_degraded: bool = True,
+                       coverage: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        (n, n_features) feature matrisi için vektörize tahmin
+        
+        allow_degraded: False ise yük ne olursa olsun birincil model kullanılır
+        coverage: fiyat aralığının hedef kapsama oranı (varsayılan INTERVAL_CONFIG)
+        
+        Returns:
+            predicted_price, confidence_score, min_price, max_price anahtarlı,
+            her biri n uzunluğunda float64 diziler (yuvarlanmamış) + 'degraded' (bool)
+        """
+        degraded = allow_degraded and self.degraded is not None and self.degraded.active()
+        if degraded:
+            # Yedek doğrusal model: üye tahmini yok, güven yedeğin MAE'sinden
+            # Doğrusal model ucuz/eski cihazlarda negatife kadar inebilir; birincilin tabanına kırp
+            prices = np.maximum(MIN_PRICE, np.asarray(self.fallback_model.predict(X), dtype=np.float64))
+            mae = self.fallback_config['metrics'].get('mae', 1000)
+            confidence = np.clip(100 - (mae / np.maximum(prices, 1) * 100), 70, 99)
+        else:
+            # Tahmin yap (ağaç modellerinde üye tahminleri de aynı geçişte gelir)
+            prices, members = self.model.predict_with_spread(X)
+            prices = np.asarray(prices, dtype=np.float64)
+            
+            # Confidence hesapla (RF: ilk ağaçlar, Gradient Boosting: son stage'ler)
+            confidence = np.full(len(prices), 95.0)  # Default yüksek güven
+            if members is not None and len(members):
+                std = np.std(members, axis=0)
+                confidence = np.clip(100 - (std / np.maximum(prices, 1) * 100), 70, 99)
+            mae = self.config['metrics'].get('mae', 1000)
+        
+        intervals = self.fallback_intervals if degraded else self.intervals
+        if intervals is not None:
+            # Kova bazlı conformal aralık (ek model değerlendirmesi yok)
+            low, high = intervals.bounds(prices, X, coverage or INTERVAL_CONFIG['coverage'])
+            min_price, max_price = np.maximum(0, low), high
+        else:
+            # Fiyat aralığı (MAE bazlı)
+            min_price = np.maximum(MIN_PRICE, prices - mae * 2)
+            max_price = np.minimum(MAX_PRICE, prices + mae * 2)
+        if degraded:
+            # Kırpılmış tahmin aralığın içinde kalsın
+            min_price = np.clip(min_price, MIN_PRICE, prices)
+            max_price = np.maximum(max_price, prices)
+        return {
+            'predicted_price': prices,
+            'confidence_score': confidence,
+            'min_price': min_price,
+            'max_price': max_price,
+            'degraded': degraded
         }
+    
+    def explain_matrix(self, X: np.ndarray, allow_degraded: bool = True) -> Dict:
+        """
+        (n, n_features) feature matrisi için fiyatın feature katkıları (SHAP)
         
-        # DataFrame oluştur (config'deki sırayla veya default)
-        feature_cols = self.config.get('feature_cols', list(features.keys()))
-        df = pd.DataFrame([[features.get(col, 0) for col in feature_cols]], columns=feature_cols)
+        Aşırı yükte (degraded) yedek doğrusal modelin kapalı formül açıklaması kullanılır.
         
-        return df
-
+        Returns:
+            base_value (float, girdi bilinmiyorken beklenen fiyat),
+            contributions ((n, n_features) float64), predicted_price (base_value + katkılar),
+            degraded (bool)
+        """
+        if self.explainer is None:
+            raise RuntimeError("Açıklama bu model için kullanılamıyor")
+        degraded = (allow_degraded and self.fallback_explainer is not None
+                    and self.degraded.active())
+        explainer = self.fallback_explainer if degraded else self.explainer
+        contributions = explainer.explain(X)
+        return {
+            'base_value': explainer.base_value,
+            'contributions': contributions,
+            'predicted_price': explainer.base_value + contributions.sum(axis=1),
+            'degraded': degraded
+        }
+    
+    def price_grid(self, model_name: str) -> List[Dict]:
+        """
+        Bir modelin tüm geçerli (storage, durum, ram) kombinasyonları için tahmin
+        
+        Tek bir vektörize batch olarak skorlanır; sonuç model versiyonu boyunca cache'lenir
+        (cache'lendiği için her zaman birincil modelle).
+        """
+        index = self.encoder.model_index(model_name)
+        cells = self._grid_cache.get(index)
+        if cells is not None:
+            return cells
+        
+        name = self.encoder.model_names[index]
+        storage = np.asarray(MODEL_STORAGE_OPTIONS.get(name, [64, 128, 256]), dtype=np.float32)
+        ram = IPHONE_MODELS[name].get('ram', 4)
+        # Aynı skora sahip durumlar (Outlet/Orta) aynı satırı üretir: skor başına ilk isim
+        _, first = np.unique(self.encoder.condition_values, return_index=True)
+        codes = np.sort(first)
+        
+        # storage x durum çapraz çarpımı
+        storage_col = np.repeat(storage, len(codes))
+        code_col = np.tile(codes, len(storage))
+        X = self.encoder.encode_batch(np.full(len(storage_col), index), np.full(len(storage_col), ram),
+                                      storage_col, code_col)
+        scores = self.predict_matrix(X, allow_degraded=False)
+        
+        cells = [
+            {
+                'storage_gb': int(storage_col[i]),
+                'ram_gb': int(ram),
+                'condition': self.encoder.condition_names[code_col[i]],
+                'predicted_price': round(float(scores['predicted_price'][i]), 2),
+                'confidence_score': round(float(scores['confidence_score'][i]), 2),
+                'price_range': {
+                    'min': round(float(scores['min_price'][i]), 2),
+                    'max': round(float(scores['max_price'][i]), 2)
+                }
+            }
+            for i in range(len(storage_col))
+        ]
+        self._grid_cache[index] = cells
+        return cells
+    
+    def _prepare_features(self, input_data: Dict) -> np.ndarray:
+        """Input'tan (1, n_features) feature satırı - encoder'daki önceden derlenmiş matristen"""
+        return self.encoder.encode(input_data)
 
 def main():
     """Test fonksiyonu"""
+    logging.basicConfig(level=logging.INFO)
     predictor = PricePredictor()
     
     # Test tahminleri
@@ -0,0 +1,132 @@
+"""
+Sampling profiler - gRPC worker thread'lerinin stack'lerini canlı trafikte örnekler
+Kapalıyken hiçbir hook kurmaz; açıkken sys._current_frames ile periyodik örnek alır
+ve collapsed-stack formatında (flamegraph.pl / speedscope uyumlu) çıktı yazar
+"""
+
+import os
+import sys
+import signal
+import threading
+import time
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    """Belirli bir thread grubunu sabit frekansta örnekleyen profiler"""
+
+    def __init__(self, output_dir: str, sample_hz: int = 100,
+                 thread_prefix: Optional[str] = None):
+        self.output_dir = output_dir
+        self.sample_hz = sample_hz
+        self.thread_prefix = thread_prefix
+        self.last_output = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration_sec: float, sample_hz: Optional[int] = None) -> bool:
+        """Örneklemeyi başlat; zaten çalışıyorsa False döner"""
+        with self._lock:
+            if self.is_running:
+                return False
+            hz = sample_hz or self.sample_hz
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(duration_sec, 1.0 / max(hz, 1)),
+                name='sampling-profiler',
+                daemon=True
+            )
+            self._thread.start()
+        logger.info("Profiler başlatıldı: %ss, %s Hz", duration_sec, hz)
+        return True
+
+    def stop(self, wait: bool = True) -> Optional[str]:
+        """Örneklemeyi erken bitir, yazılan dosyanın yolunu döndür"""
+        self._stop_event.set()
+        thread = self._thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join()
+        return self.last_output
+
+    def toggle(self, duration_sec: float):
+        """Çalışıyorsa durdur, değilse başlat (sinyal handler'ı için)"""
+        if self.is_running:
+            self.stop(wait=False)
+        else:
+            self.start(duration_sec)
+
+    def install_signal_handler(self, duration_sec: float) -> bool:
+        """SIGUSR1 ile aç/kapa - sadece POSIX ve ana thread'de kurulabilir"""
+        if not hasattr(signal, 'SIGUSR1'):
+            logger.warning("SIGUSR1 bu platformda yok, profiler sadece RPC ile açılabilir")
+            return False
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.toggle(duration_sec))
+        return True
+
+    def _run(self, duration_sec: float, interval: float):
+        """Örnekleme döngüsü - ayrı thread'de çalışır"""
+        stacks = Counter()
+        samples = 0
+        own_id = threading.get_ident()
+        started = time.perf_counter()
+        deadline = started + duration_sec
+        next_tick = started
+
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, str(thread_id))
+                if self.thread_prefix and not name.startswith(self.thread_prefix):
+                    continue
+                stacks[self._collapse(name, frame)] += 1
+            samples += 1
+
+            # Sabit frekans: bir sonraki tick'e göre uyu (kaymayı biriktirme)
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_tick = time.perf_counter()
+
+        self.last_output = self._write(stacks)
+        logger.info("Profiler durdu: %d örnek, %.1fs -> %s",
+                    samples, time.perf_counter() - started, self.last_output)
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        """Frame zincirini 'thread;dış;...;iç' formatına çevir"""
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        parts.append(thread_name.split('_')[0])
+        return ';'.join(reversed(parts))
+
+    def _write(self, stacks: Counter) -> str:
+        """Collapsed-stack dosyasını yaz"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(self.output_dir, f"profile_{stamp}_{os.getpid()}.collapsed")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16proto/prediction.proto\x12\x17iphone_price_prediction\"j\n\tPhoneSpec\x12\x10\n\x08model_id\x18\x01 \x01(\x05\x12\x0e\n\x06ram_gb\x18\x02 \x01(\x05\x12\x12\n\nstorage_gb\x18\x03 \x01(\x05\x12\x11\n\tcondition\x18\x04 \x01(\t\x12\x14\n\x0crelease_year\x18\x05 \x01(\x05\"\x9d\x01\n\rPriceResponse\x12\x17\n\x0fpredicted_price\x18\x01 \x01(\x01\x12\x18\n\x10\x63onfidence_score\x18\x02 \x01(\x01\x12\x38\n\x0bprice_range\x18\x03 \x01(\x0b\x32#.iphone_price_prediction.PriceRange\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\"2\n\nPriceRange\x12\x11\n\tmin_price\x18\x01 \x01(\x01\x12\x11\n\tmax_price\x18\x02 \x01(\x01\"$\n\x10ModelInfoRequest\x12\x10\n\x08model_id\x18\x01 \x01(\x05\"x\n\x11ModelInfoResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x14\n\x0crelease_year\x18\x02 \x01(\x05\x12\x19\n\x11\x61vailable_storage\x18\x03 \x03(\x05\x12\x0e\n\x06ram_gb\x18\x04 \x01(\x05\x12\x0e\n\x06is_pro\x18\x05 \x01(\x08\"%\n\x12HealthCheckRequest\x12\x0f\n\x07service\x18\x01 \x01(\t\"\\\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x14\n\x0cmodel_loaded\x18\x03 \x01(\x08\x12\x0e\n\x06uptime\x18\x04 \x01(\t2\xbe\x02\n\x0fPricePrediction\x12Z\n\x0cPredictPrice\x12\".iphone_price_prediction.PhoneSpec\x1a&.iphone_price_prediction.PriceResponse\x12\x65\n\x0cGetModelInfo\x12).iphone_price_prediction.ModelInfoRequest\x1a*.iphone_price_prediction.ModelInfoResponse\x12h\n\x0bHealthCheck\x12+.iphone_price_prediction.HealthCheckRequest\x1a,.iphone_price_prediction.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16proto/prediction.proto\x12\x17iphone_price_prediction\"j\n\tPhoneSpec\x12\x10\n\x08model_id\x18\x01 \x01(\x05\x12\x0e\n\x06ram_gb\x18\x02 \x01(\x05\x12\x12\n\nstorage_gb\x18\x03 \x01(\x05\x12\x11\n\tcondition\x18\x04 \x01(\t\x12\x14\n\x0crelease_year\x18\x05 \x01(\x05\"\xaf\x01\n\rPriceResponse\x12\x17\n\x0fpredicted_price\x18\x01 \x01(\x01\x12\x18\n\x10\x63onfidence_score\x18\x02 \x01(\x01\x12\x38\n\x0bprice_range\x18\x03 \x01(\x0b\x32#.iphone_price_prediction.PriceRange\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\x12\x10\n\x08\x64\x65graded\x18\x06 \x01(\x08\"F\n\x11PriceBatchRequest\x12\x31\n\x05specs\x18\x01 \x03(\x0b\x32\".iphone_price_prediction.PhoneSpec\"p\n\x12PriceBatchResponse\x12\x39\n\tresponses\x18\x01 \x03(\x0b\x32&.iphone_price_prediction.PriceResponse\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"\x82\x01\n\x14\x43olumnarPriceRequest\x12\x10\n\x08model_id\x18\x01 \x03(\x05\x12\x0e\n\x06ram_gb\x18\x02 \x03(\x05\x12\x12\n\nstorage_gb\x18\x03 \x03(\x05\x12\x16\n\x0e\x63ondition_code\x18\x04 \x03(\x05\x12\x1c\n\x14\x63ondition_dictionary\x18\x05 \x03(\t\"\xba\x01\n\x15\x43olumnarPriceResponse\x12\x17\n\x0fpredicted_price\x18\x01 \x03(\x01\x12\x18\n\x10\x63onfidence_score\x18\x02 \x03(\x01\x12\x11\n\tmin_price\x18\x03 \x03(\x01\x12\x11\n\tmax_price\x18\x04 \x03(\x01\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x0f\n\x07message\x18\x06 \x01(\t\x12\x15\n\rmodel_version\x18\x07 \x01(\t\x12\x10\n\x08\x64\x65graded\x18\x08 \x01(\x08\"C\n\x0e\x45xplainRequest\x12\x31\n\x05specs\x18\x01 \x03(\x0b\x32\".iphone_price_prediction.PhoneSpec\"K\n\x13\x46\x65\x61tureContribution\x12\x0f\n\x07\x66\x65\x61ture\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01\x12\x14\n\x0c\x63ontribution\x18\x03 \x01(\x01\"\x84\x01\n\x10PriceExplanation\x12\x17\n\x0fpredicted_price\x18\x01 \x01(\x01\x12\x12\n\nbase_value\x18\x02 \x01(\x01\x12\x43\n\rcontributions\x18\x03 \x03(\x0b\x32,.iphone_price_prediction.FeatureContribution\"\x9c\x01\n\x0f\x45xplainResponse\x12?\n\x0c\x65xplanations\x18\x01 \x03(\x0b\x32).iphone_price_prediction.PriceExplanation\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x15\n\rmodel_version\x18\x04 \x01(\t\x12\x10\n\x08\x64\x65graded\x18\x05 \x01(\x08\"2\n\nPriceRange\x12\x11\n\tmin_price\x18\x01 \x01(\x01\x12\x11\n\tmax_price\x18\x02 \x01(\x01\"$\n\x10ModelInfoRequest\x12\x10\n\x08model_id\x18\x01 \x01(\x05\"x\n\x11ModelInfoResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x14\n\x0crelease_year\x18\x02 \x01(\x05\x12\x19\n\x11\x61vailable_storage\x18\x03 \x03(\x05\x12\x0e\n\x06ram_gb\x18\x04 \x01(\x05\x12\x0e\n\x06is_pro\x18\x05 \x01(\x08\"$\n\x10PriceGridRequest\x12\x10\n\x08model_id\x18\x01 \x01(\x05\"\xb3\x01\n\rPriceGridCell\x12\x12\n\nstorage_gb\x18\x01 \x01(\x05\x12\x0e\n\x06ram_gb\x18\x02 \x01(\x05\x12\x11\n\tcondition\x18\x03 \x01(\t\x12\x17\n\x0fpredicted_price\x18\x04 \x01(\x01\x12\x18\n\x10\x63onfidence_score\x18\x05 \x01(\x01\x12\x38\n\x0bprice_range\x18\x06 \x01(\x0b\x32#.iphone_price_prediction.PriceRange\"\x96\x01\n\x11PriceGridResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x15\n\rmodel_version\x18\x02 \x01(\t\x12\x35\n\x05\x63\x65lls\x18\x03 \x03(\x0b\x32&.iphone_price_prediction.PriceGridCell\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\"%\n\x12HealthCheckRequest\x12\x0f\n\x07service\x18\x01 \x01(\t\"s\n\x13HealthCheckResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07version\x18\x02 \x01(\t\x12\x14\n\x0cmodel_loaded\x18\x03 \x01(\x08\x12\x0e\n\x06uptime\x18\x04 \x01(\t\x12\x15\n\rmodel_version\x18\x05 \x01(\t\"!\n\x0c\x44riftRequest\x12\x11\n\trecompute\x18\x01 \x01(\x08\"g\n\x0c\x46\x65\x61tureDrift\x12\x0f\n\x07\x66\x65\x61ture\x18\x01 \x01(\t\x12\x0b\n\x03psi\x18\x02 \x01(\x01\x12\x15\n\rreference_p50\x18\x03 \x01(\x01\x12\x10\n\x08live_p50\x18\x04 \x01(\x01\x12\x10\n\x08live_top\x18\x05 \x01(\t\"\xc4\x01\n\rDriftResponse\x12\x13\n\x0b\x64rift_score\x18\x01 \x01(\x01\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x14\n\x0csample_count\x18\x03 \x01(\x03\x12\x37\n\x08\x66\x65\x61tures\x18\x04 \x03(\x0b\x32%.iphone_price_prediction.FeatureDrift\x12\x19\n\x11reference_version\x18\x05 \x01(\t\x12\x13\n\x0b\x63omputed_at\x18\x06 \x01(\t\x12\x0f\n\x07message\x18\x07 \x01(\t\"\x15\n\x13ShadowReportRequest\"\x8f\x03\n\x14ShadowReportResponse\x12\x0f\n\x07\x65nabled\x18\x01 \x01(\x08\x12\x16\n\x0eshadow_version\x18\x02 \x01(\t\x12\x17\n\x0fprimary_version\x18\x03 \x01(\t\x12\x0f\n\x07samples\x18\x04 \x01(\x03\x12\x0f\n\x07\x64ropped\x18\x05 \x01(\x03\x12\x12\n\nmean_delta\x18\x06 \x01(\x01\x12\x16\n\x0emean_abs_delta\x18\x07 \x01(\x01\x12\x15\n\rp95_abs_delta\x18\x08 \x01(\x01\x12\x1a\n\x12mean_abs_pct_delta\x18\t \x01(\x01\x12\x16\n\x0eprimary_p50_ms\x18\n \x01(\x01\x12\x16\n\x0eprimary_p95_ms\x18\x0b \x01(\x01\x12\x16\n\x0eprimary_p99_ms\x18\x0c \x01(\x01\x12\x15\n\rshadow_p50_ms\x18\r \x01(\x01\x12\x15\n\rshadow_p95_ms\x18\x0e \x01(\x01\x12\x15\n\rshadow_p99_ms\x18\x0f \x01(\x01\x12\x16\n\x0erecommendation\x18\x10 \x01(\t\x12\x0f\n\x07message\x18\x11 \x01(\t\"I\n\x0eProfileRequest\x12\x0e\n\x06\x65nable\x18\x01 \x01(\x08\x12\x14\n\x0c\x64uration_sec\x18\x02 \x01(\x05\x12\x11\n\tsample_hz\x18\x03 \x01(\x05\"G\n\x0fProfileResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0boutput_path\x18\x03 \x01(\t2\xa1\x08\n\x0fPricePrediction\x12Z\n\x0cPredictPrice\x12\".iphone_price_prediction.PhoneSpec\x1a&.iphone_price_prediction.PriceResponse\x12l\n\x11PredictPriceBatch\x12*.iphone_price_prediction.PriceBatchRequest\x1a+.iphone_price_prediction.PriceBatchResponse\x12u\n\x14PredictPriceColumnar\x12-.iphone_price_prediction.ColumnarPriceRequest\x1a..iphone_price_prediction.ColumnarPriceResponse\x12\x61\n\x0c\x45xplainPrice\x12\'.iphone_price_prediction.ExplainRequest\x1a(.iphone_price_prediction.ExplainResponse\x12\x65\n\x0cGetModelInfo\x12).iphone_price_prediction.ModelInfoRequest\x1a*.iphone_price_prediction.ModelInfoResponse\x12\x65\n\x0cGetPriceGrid\x12).iphone_price_prediction.PriceGridRequest\x1a*.iphone_price_prediction.PriceGridResponse\x12h\n\x0bHealthCheck\x12+.iphone_price_prediction.HealthCheckRequest\x1a,.iphone_price_prediction.HealthCheckResponse\x12_\n\x0eGetDriftReport\x12%.iphone_price_prediction.DriftRequest\x1a&.iphone_price_prediction.DriftResponse\x12n\n\x0fGetShadowReport\x12,.iphone_price_prediction.ShadowReportRequest\x1a-.iphone_price_prediction.ShadowReportResponse\x12\x61\n\x0cSetProfiling\x12\'.iphone_price_prediction.ProfileRequest\x1a(.iphone_price_prediction.ProfileResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,17 +34,53 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_PHONESPEC']._serialized_start=51
   _globals['_PHONESPEC']._serialized_end=157
   _globals['_PRICERESPONSE']._serialized_start=160
-  _globals['_PRICERESPONSE']._serialized_end=317
-  _globals['_PRICERANGE']._serialized_start=319
-  _globals['_PRICERANGE']._serialized_end=369
-  _globals['_MODELINFOREQUEST']._serialized_start=371
-  _globals['_MODELINFOREQUEST']._serialized_end=407
-  _globals['_MODELINFORESPONSE']._serialized_start=409
-  _globals['_MODELINFORESPONSE']._serialized_end=529
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=531
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=568
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=570
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=662
-  _globals['_PRICEPREDICTION']._serialized_start=665
-  _globals['_PRICEPREDICTION']._serialized_end=983
+  _globals['_PRICERESPONSE']._serialized_end=335
+  _globals['_PRICEBATCHREQUEST']._serialized_start=337
+  _globals['_PRICEBATCHREQUEST']._serialized_end=407
+  _globals['_PRICEBATCHRESPONSE']._serialized_start=409
+  _globals['_PRICEBATCHRESPONSE']._serialized_end=521
+  _globals['_COLUMNARPRICEREQUEST']._serialized_start=524
+  _globals['_COLUMNARPRICEREQUEST']._serialized_end=654
+  _globals['_COLUMNARPRICERESPONSE']._serialized_start=657
+  _globals['_COLUMNARPRICERESPONSE']._serialized_end=843
+  _globals['_EXPLAINREQUEST']._serialized_start=845
+  _globals['_EXPLAINREQUEST']._serialized_end=912
+  _globals['_FEATURECONTRIBUTION']._serialized_start=914
+  _globals['_FEATURECONTRIBUTION']._serialized_end=989
+  _globals['_PRICEEXPLANATION']._serialized_start=992
+  _globals['_PRICEEXPLANATION']._serialized_end=1124
+  _globals['_EXPLAINRESPONSE']._serialized_start=1127
+  _globals['_EXPLAINRESPONSE']._serialized_end=1283
+  _globals['_PRICERANGE']._serialized_start=1285
+  _globals['_PRICERANGE']._serialized_end=1335
+  _globals['_MODELINFOREQUEST']._serialized_start=1337
+  _globals['_MODELINFOREQUEST']._serialized_end=1373
+  _globals['_MODELINFORESPONSE']._serialized_start=1375
+  _globals['_MODELINFORESPONSE']._serialized_end=1495
+  _globals['_PRICEGRIDREQUEST']._serialized_start=1497
+  _globals['_PRICEGRIDREQUEST']._serialized_end=1533
+  _globals['_PRICEGRIDCELL']._serialized_start=1536
+  _globals['_PRICEGRIDCELL']._serialized_end=1715
+  _globals['_PRICEGRIDRESPONSE']._serialized_start=1718
+  _globals['_PRICEGRIDRESPONSE']._serialized_end=1868
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=1870
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=1907
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=1909
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=2024
+  _globals['_DRIFTREQUEST']._serialized_start=2026
+  _globals['_DRIFTREQUEST']._serialized_end=2059
+  _globals['_FEATUREDRIFT']._serialized_start=2061
+  _globals['_FEATUREDRIFT']._serialized_end=2164
+  _globals['_DRIFTRESPONSE']._serialized_start=2167
+  _globals['_DRIFTRESPONSE']._serialized_end=2363
+  _globals['_SHADOWREPORTREQUEST']._serialized_start=2365
+  _globals['_SHADOWREPORTREQUEST']._serialized_end=2386
+  _globals['_SHADOWREPORTRESPONSE']._serialized_start=2389
+  _globals['_SHADOWREPORTRESPONSE']._serialized_end=2788
+  _globals['_PROFILEREQUEST']._serialized_start=2790
+  _globals['_PROFILEREQUEST']._serialized_end=2863
+  _globals['_PROFILERESPONSE']._serialized_start=2865
+  _globals['_PROFILERESPONSE']._serialized_end=2936
+  _globals['_PRICEPREDICTION']._serialized_start=2939
+  _globals['_PRICEPREDICTION']._serialized_end=3996
 # @@protoc_insertion_point(module_scope)
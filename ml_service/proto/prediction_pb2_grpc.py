@@ -40,16 +40,51 @@ class PricePredictionStub(object):
                 request_serializer=proto_dot_prediction__pb2.PhoneSpec.SerializeToString,
                 response_deserializer=proto_dot_prediction__pb2.PriceResponse.FromString,
                 _registered_method=True)
+        self.PredictPriceBatch = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/PredictPriceBatch',
+                request_serializer=proto_dot_prediction__pb2.PriceBatchRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.PriceBatchResponse.FromString,
+                _registered_method=True)
+        self.PredictPriceColumnar = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/PredictPriceColumnar',
+                request_serializer=proto_dot_prediction__pb2.ColumnarPriceRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.ColumnarPriceResponse.FromString,
+                _registered_method=True)
+        self.ExplainPrice = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/ExplainPrice',
+                request_serializer=proto_dot_prediction__pb2.ExplainRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.ExplainResponse.FromString,
+                _registered_method=True)
         self.GetModelInfo = channel.unary_unary(
                 '/iphone_price_prediction.PricePrediction/GetModelInfo',
                 request_serializer=proto_dot_prediction__pb2.ModelInfoRequest.SerializeToString,
                 response_deserializer=proto_dot_prediction__pb2.ModelInfoResponse.FromString,
                 _registered_method=True)
+        self.GetPriceGrid = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/GetPriceGrid',
+                request_serializer=proto_dot_prediction__pb2.PriceGridRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.PriceGridResponse.FromString,
+                _registered_method=True)
         self.HealthCheck = channel.unary_unary(
                 '/iphone_price_prediction.PricePrediction/HealthCheck',
                 request_serializer=proto_dot_prediction__pb2.HealthCheckRequest.SerializeToString,
                 response_deserializer=proto_dot_prediction__pb2.HealthCheckResponse.FromString,
                 _registered_method=True)
+        self.GetDriftReport = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/GetDriftReport',
+                request_serializer=proto_dot_prediction__pb2.DriftRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.DriftResponse.FromString,
+                _registered_method=True)
+        self.GetShadowReport = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/GetShadowReport',
+                request_serializer=proto_dot_prediction__pb2.ShadowReportRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.ShadowReportResponse.FromString,
+                _registered_method=True)
+        self.SetProfiling = channel.unary_unary(
+                '/iphone_price_prediction.PricePrediction/SetProfiling',
+                request_serializer=proto_dot_prediction__pb2.ProfileRequest.SerializeToString,
+                response_deserializer=proto_dot_prediction__pb2.ProfileResponse.FromString,
+                _registered_method=True)
 
 
 class PricePredictionServicer(object):
@@ -63,6 +98,27 @@ class PricePredictionServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def PredictPriceBatch(self, request, context):
+        """Birden çok telefonu tek çağrıda tahmin et (client tarafı batching için)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictPriceColumnar(self, request, context):
+        """Büyük batch'ler için kolon bazlı (packed dizi) tahmin
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExplainPrice(self, request, context):
+        """Tahmini feature katkılarına ayır (TreeSHAP); specs ile aynı sırada
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetModelInfo(self, request, context):
         """Model bilgilerini getir
         """
@@ -70,6 +126,13 @@ class PricePredictionServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetPriceGrid(self, request, context):
+        """Bir modelin tüm storage x durum kombinasyonlarının fiyatlarını tek çağrıda getir
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def HealthCheck(self, request, context):
         """Health check
         """
@@ -77,6 +140,27 @@ class PricePredictionServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetDriftReport(self, request, context):
+        """Canlı girdilerin eğitim verisine göre drift raporu
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetShadowReport(self, request, context):
+        """Shadow modelin birincil modele göre karşılaştırma raporu
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetProfiling(self, request, context):
+        """Sampling profiler'ı aç/kapa (admin)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_PricePredictionServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -85,16 +169,51 @@ def add_PricePredictionServicer_to_server(servicer, server):
                     request_deserializer=proto_dot_prediction__pb2.PhoneSpec.FromString,
                     response_serializer=proto_dot_prediction__pb2.PriceResponse.SerializeToString,
             ),
+            'PredictPriceBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.PredictPriceBatch,
+                    request_deserializer=proto_dot_prediction__pb2.PriceBatchRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.PriceBatchResponse.SerializeToString,
+            ),
+            'PredictPriceColumnar': grpc.unary_unary_rpc_method_handler(
+                    servicer.PredictPriceColumnar,
+                    request_deserializer=proto_dot_prediction__pb2.ColumnarPriceRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.ColumnarPriceResponse.SerializeToString,
+            ),
+            'ExplainPrice': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExplainPrice,
+                    request_deserializer=proto_dot_prediction__pb2.ExplainRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.ExplainResponse.SerializeToString,
+            ),
             'GetModelInfo': grpc.unary_unary_rpc_method_handler(
                     servicer.GetModelInfo,
                     request_deserializer=proto_dot_prediction__pb2.ModelInfoRequest.FromString,
                     response_serializer=proto_dot_prediction__pb2.ModelInfoResponse.SerializeToString,
             ),
+            'GetPriceGrid': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPriceGrid,
+                    request_deserializer=proto_dot_prediction__pb2.PriceGridRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.PriceGridResponse.SerializeToString,
+            ),
             'HealthCheck': grpc.unary_unary_rpc_method_handler(
                     servicer.HealthCheck,
                     request_deserializer=proto_dot_prediction__pb2.HealthCheckRequest.FromString,
                     response_serializer=proto_dot_prediction__pb2.HealthCheckResponse.SerializeToString,
             ),
+            'GetDriftReport': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetDriftReport,
+                    request_deserializer=proto_dot_prediction__pb2.DriftRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.DriftResponse.SerializeToString,
+            ),
+            'GetShadowReport': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetShadowReport,
+                    request_deserializer=proto_dot_prediction__pb2.ShadowReportRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.ShadowReportResponse.SerializeToString,
+            ),
+            'SetProfiling': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetProfiling,
+                    request_deserializer=proto_dot_prediction__pb2.ProfileRequest.FromString,
+                    response_serializer=proto_dot_prediction__pb2.ProfileResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'iphone_price_prediction.PricePrediction', rpc_method_handlers)
@@ -134,6 +253,87 @@ class PricePrediction(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def PredictPriceBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/PredictPriceBatch',
+            proto_dot_prediction__pb2.PriceBatchRequest.SerializeToString,
+            proto_dot_prediction__pb2.PriceBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PredictPriceColumnar(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/PredictPriceColumnar',
+            proto_dot_prediction__pb2.ColumnarPriceRequest.SerializeToString,
+            proto_dot_prediction__pb2.ColumnarPriceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExplainPrice(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/ExplainPrice',
+            proto_dot_prediction__pb2.ExplainRequest.SerializeToString,
+            proto_dot_prediction__pb2.ExplainResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetModelInfo(request,
             target,
@@ -161,6 +361,33 @@ class PricePrediction(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetPriceGrid(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/GetPriceGrid',
+            proto_dot_prediction__pb2.PriceGridRequest.SerializeToString,
+            proto_dot_prediction__pb2.PriceGridResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def HealthCheck(request,
             target,
@@ -187,3 +414,84 @@ class PricePrediction(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetDriftReport(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/GetDriftReport',
+            proto_dot_prediction__pb2.DriftRequest.SerializeToString,
+            proto_dot_prediction__pb2.DriftResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetShadowReport(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/GetShadowReport',
+            proto_dot_prediction__pb2.ShadowReportRequest.SerializeToString,
+            proto_dot_prediction__pb2.ShadowReportResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SetProfiling(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/iphone_price_prediction.PricePrediction/SetProfiling',
+            proto_dot_prediction__pb2.ProfileRequest.SerializeToString,
+            proto_dot_prediction__pb2.ProfileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,194 @@
+"""
+Trafik replay - capture.py'nin kaydettiği istekleri yerel bir sunucuya tekrar gönderir
+
+İstekler kayıttaki sırayla ve aralıklarla (--speed ile N kat hızlı) açık döngüde
+gönderilir: sunucu yavaşlasa da gönderim takvimi kaymaz, gecikme kuyruğa yansır.
+Kayıtlı istek bytes'ları yeniden serialize edilmeden aynen iletilir.
+
+Rapor: RPC türüne göre gecikme yüzdelikleri, durum kodları, gönderim gecikmesi
+(takvimin ne kadar gerisinde kalındığı) ve kayıttaki yanıtlarla yeni yanıtların
+fiyat farkları (iki model versiyonu arasında).
+
+Kullanım:
+    python grpc_server.py --capture              # kayıt
+    python replay.py [captures/] [--speed 4] [--target localhost:50051]
+"""
+
+import argparse
+import collections
+import threading
+import time
+from typing import Dict, List, Optional
+
+import grpc
+import numpy as np
+
+from capture import (capture_paths, read_captures, CaptureRecord, KIND_BATCH, KIND_COLUMNAR,
+                     KIND_NAMES, KIND_PREDICT)
+from columnar import double_column, split_fields
+from config import CAPTURE_CONFIG, CLIENT_CONFIG
+from proto import prediction_pb2
+from proto import prediction_pb2_grpc
+
+_SERVICE = '/iphone_price_prediction.PricePrediction/'
+_RESPONSE_TYPES = {
+    KIND_PREDICT: prediction_pb2.PriceResponse,
+    KIND_BATCH: prediction_pb2.PriceBatchResponse,
+    KIND_COLUMNAR: prediction_pb2.ColumnarPriceResponse
+}
+
+
+def response_prices(kind: int, response) -> Optional[np.ndarray]:
+    """Başarılı ve degraded olmayan yanıtın fiyatları (karşılaştırılamazsa None)"""
+    if response is None or response.status != 'success':
+        return None
+    if kind == KIND_PREDICT:
+        return None if response.degraded else np.array([response.predicted_price])
+    if kind == KIND_BATCH:
+        if any(item.degraded for item in response.responses):
+            return None
+        return np.array([item.predicted_price for item in response.responses])
+    if response.degraded:
+        return None
+    return double_column(split_fields(response.SerializeToString()), 1)
+
+
+class ReplayStats:
+    """Callback thread'lerinden gelen sonuçları toplar"""
+
+    def __init__(self):
+        self.latency: Dict[int, List[float]] = collections.defaultdict(list)
+        self.codes: Dict[str, int] = collections.Counter()
+        self.captured_codes: Dict[str, int] = collections.Counter()
+        self.lag: List[float] = []
+        self.abs_diff: List[np.ndarray] = []
+        self.pct_diff: List[np.ndarray] = []
+        self.skipped_compare = 0
+        self._lock = threading.Lock()
+
+    def done(self, record: CaptureRecord, latency: float, code: grpc.StatusCode, response):
+        replayed = response_prices(record.kind, response)
+        captured = None
+        if record.response:
+            captured = response_prices(record.kind, _RESPONSE_TYPES[record.kind].FromString(record.response))
+        with self._lock:
+            self.latency[record.kind].append(latency)
+            self.codes[code.name] += 1
+            self.captured_codes['OK' if record.response else 'REJECTED'] += 1
+            if replayed is None or captured is None or len(replayed) != len(captured):
+                self.skipped_compare += 1
+                return
+            diff = np.abs(replayed - captured)
+            self.abs_diff.append(diff)
+            self.pct_diff.append(diff / np.maximum(np.abs(captured), 1) * 100)
+
+
+def replay(records: List[CaptureRecord], channel: grpc.Channel, speed: float, timeout: float,
+           max_outstanding: int) -> Dict:
+    """Kayıtları takvime göre gönder, tüm yanıtları bekle ve istatistikleri döndür"""
+    calls = {
+        kind: channel.unary_unary(_SERVICE + name, request_serializer=None,
+                                  response_deserializer=_RESPONSE_TYPES[kind].FromString)
+        for kind, name in KIND_NAMES.items()
+    }
+    stats = ReplayStats()
+    outstanding = threading.BoundedSemaphore(max_outstanding)
+    base_ns = records[0].arrival_ns
+    started = time.perf_counter()
+
+    for record in records:
+        if speed > 0:
+            due = started + (record.arrival_ns - base_ns) / 1e9 / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            stats.lag.append(max(0.0, -delay))
+        outstanding.acquire()
+        sent = time.perf_counter()
+        future = calls[record.kind].future(record.request, timeout=timeout)
+
+        def on_done(future, record=record, sent=sent):
+            latency = time.perf_counter() - sent
+            try:
+                stats.done(record, latency, grpc.StatusCode.OK, future.result())
+            except grpc.RpcError as e:
+                stats.done(record, latency, e.code(), None)
+            finally:
+                outstanding.release()
+
+        future.add_done_callback(on_done)
+
+    # Son yanıtları bekle
+    for _ in range(max_outstanding):
+        outstanding.acquire()
+    elapsed = time.perf_counter() - started
+    return {'stats': stats, 'elapsed': elapsed,
+            'captured_elapsed': (records[-1].arrival_ns - base_ns) / 1e9}
+
+
+def format_report(result: Dict, captured_versions: List[str], replay_version: str) -> str:
+    stats = result['stats']
+    total = sum(len(v) for v in stats.latency.values())
+    lines = [
+        f"İstek:             {total:,}",
+        f"Süre:              {result['elapsed']:.2f} sn (kayıtta {result['captured_elapsed']:.2f} sn)",
+        f"Model versiyonu:   kayıt {', '.join(captured_versions) or '?'} -> replay {replay_version or '?'}",
+        f"Durum (kayıt):     {dict(stats.captured_codes)}",
+        f"Durum (replay):    {dict(stats.codes)}"
+    ]
+    if stats.lag:
+        lag = np.percentile(np.array(stats.lag) * 1000, [50, 99])
+        lines.append(f"Gönderim gecikmesi: p50 {lag[0]:.2f} ms, p99 {lag[1]:.2f} ms")
+
+    lines.append("Gecikme (ms):")
+    for kind, values in sorted(stats.latency.items()):
+        p = np.percentile(np.array(values) * 1000, [50, 95, 99, 100])
+        lines.append(f"    {KIND_NAMES[kind]:<22} n={len(values):<7,} p50 {p[0]:.2f}  p95 {p[1]:.2f}  "
+                     f"p99 {p[2]:.2f}  max {p[3]:.2f}")
+
+    if stats.abs_diff:
+        diff = np.concatenate(stats.abs_diff)
+        pct = np.concatenate(stats.pct_diff)
+        lines += [
+            f"Fiyat farkı:       {len(diff):,} tahmin karşılaştırıldı "
+            f"({stats.skipped_compare:,} istek atlandı: hata/degraded)",
+            f"    aynı (<0.01 TL): %{(diff < 0.01).mean() * 100:.1f}",
+            f"    ortalama {diff.mean():,.2f} TL, p95 {np.percentile(diff, 95):,.2f} TL, "
+            f"max {diff.max():,.2f} TL, ortalama %{pct.mean():.2f}"
+        ]
+    else:
+        lines.append("Fiyat farkı:       karşılaştırılabilir yanıt yok")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaydedilmiş trafiği yerel sunucuya tekrar gönder')
+    parser.add_argument('path', nargs='?', default=CAPTURE_CONFIG['dir'], help='Capture dosyası veya dizini')
+    parser.add_argument('--target', default=CLIENT_CONFIG['target'], help='Sunucu adresi')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Zamanlama çarpanı (2 = iki kat hızlı, 0 = beklemeden)')
+    parser.add_argument('--limit', type=int, default=None, help='En fazla bu kadar istek')
+    parser.add_argument('--timeout', type=float, default=CLIENT_CONFIG['timeout_sec'])
+    parser.add_argument('--max-outstanding', type=int, default=1000,
+                        help='Aynı anda yanıt beklenen en fazla istek')
+    args = parser.parse_args()
+
+    paths = capture_paths(args.path)
+    records = list(read_captures(paths))[:args.limit]
+    if not records:
+        print(f"Kayıt bulunamadı: {args.path}")
+        return
+    captured_versions = sorted({record.model_version for record in records if record.model_version})
+
+    channel = grpc.insecure_channel(args.target)
+    health = prediction_pb2_grpc.PricePredictionStub(channel).HealthCheck(
+        prediction_pb2.HealthCheckRequest(service='replay'), timeout=args.timeout)
+
+    print(f"Replay: {len(records):,} istek, {len(paths)} dosya -> {args.target} (hız {args.speed}x)")
+    result = replay(records, channel, args.speed, args.timeout, args.max_outstanding)
+    print(format_report(result, captured_versions, health.model_version))
+    channel.close()
+
+
+if __name__ == "__main__":
+    main()
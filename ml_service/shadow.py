@@ -0,0 +1,196 @@
+"""
+Shadow (canary) model değerlendirmesi - yeni modeli canlı trafiğe çıkarmadan ölçer
+
+PricePredictor.predict() örneklenen isteklerin girdisini, birincil tahmini ve gecikmesini
+sınırlı bir kuyruğa atar; tek arka plan thread'i shadow modeli aynı girdiyle skorlar.
+Kuyruk doluysa örnek düşürülür, birincil yol hiç beklemez.
+
+Rapor: fiyat farkları (shadow - birincil) ve iki modelin gecikme yüzdelikleri.
+Shadow bundle'ı: models/bundle_shadow (örn. yeniden eğitilmiş models/bundle kopyası)
+
+Kullanım:
+    python shadow.py --promote   # shadow bundle'ı birincil bundle'ın yerine yaz
+"""
+
+import argparse
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from artifact import read_manifest, write_bundle
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """Son N değeri tutan sabit boyutlu tampon (tek yazıcı thread)"""
+
+    def __init__(self, size: int):
+        self.values = np.zeros(size, dtype=np.float64)
+        self.count = 0
+
+    def add(self, value: float):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def filled(self) -> np.ndarray:
+        return self.values[:min(self.count, len(self.values))]
+
+
+class ShadowSampler:
+    """
+    Shadow'a kopyalanacak istekleri seçer (SHADOW_CONFIG['sample_rate'])
+
+    Rastgele seçim: sayaç bazlı log örnekleyicisi 1/rate'i tam sayıya yuvarlar ve
+    periyodik trafikte hep aynı istek türüne denk gelebilir.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._random = random.Random()
+
+    def sample(self) -> bool:
+        return self.rate > 0 and self._random.random() < self.rate
+
+
+class ShadowEvaluator:
+    """Shadow modeli istek yolunun dışında skorlar ve karşılaştırma istatistiklerini tutar"""
+
+    def __init__(self, shadow, primary_version: Optional[str], config: Dict):
+        self.shadow = shadow
+        self.primary_version = primary_version
+        self.config = config
+        self.sampler = ShadowSampler(config['sample_rate'])
+        self._queue = queue.Queue(maxsize=config['queue_size'])
+        self.dropped = 0
+        self.errors = 0
+
+        window = config['window']
+        self.deltas = RingBuffer(window)
+        self.primary_latency = RingBuffer(window)
+        self.shadow_latency = RingBuffer(window)
+        self.primary_prices = RingBuffer(window)
+        self._lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name='shadow-scorer', daemon=True)
+        self._thread.start()
+
+    def submit(self, input_data: Dict, primary_price: float, primary_latency: Optional[float]):
+        """
+        İstek yolu: örneklenmişse kuyruğa at, dolu ise düşür
+
+        primary_latency None: birincil model çalışmadı (cache isabeti); sadece fiyat
+        farkı ve shadow gecikmesi kaydedilir.
+        """
+        try:
+            self._queue.put_nowait((input_data, primary_price, primary_latency))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            input_data, primary_price, primary_latency = self._queue.get()
+            try:
+                started = time.perf_counter()
+                X = self.shadow.encoder.encode(input_data)
+                scores = self.shadow.predict_matrix(X, allow_degraded=False)
+                shadow_latency = time.perf_counter() - started
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Shadow tahmin hatası: %s", e)
+                continue
+
+            with self._lock:
+                self.deltas.add(float(scores['predicted_price'][0]) - primary_price)
+                self.primary_prices.add(primary_price)
+                if primary_latency is not None:
+                    self.primary_latency.add(primary_latency)
+                self.shadow_latency.add(shadow_latency)
+
+    def report(self) -> Dict:
+        """Fiyat farkı ve gecikme karşılaştırması + terfi önerisi"""
+        with self._lock:
+            deltas = self.deltas.filled().copy()
+            prices = self.primary_prices.filled().copy()
+            primary_ms = self.primary_latency.filled() * 1000
+            shadow_ms = self.shadow_latency.filled() * 1000
+            samples = self.deltas.count
+
+        report = {
+            'shadow_version': self.shadow.model_version or '',
+            'primary_version': self.primary_version or '',
+            'samples': samples,
+            'dropped': self.dropped,
+            'errors': self.errors
+        }
+        if len(deltas) == 0:
+            report.update(recommendation='wait', message='Henüz örnek yok')
+            return report
+        if len(primary_ms) == 0:
+            # Tüm örnekler cache isabeti: gecikme karşılaştırması yapılamaz
+            report.update(recommendation='wait', message='Birincil model gecikme örneği yok')
+            return report
+
+        abs_pct = np.abs(deltas) / np.maximum(prices, 1) * 100
+        primary_p = np.percentile(primary_ms, [50, 95, 99])
+        shadow_p = np.percentile(shadow_ms, [50, 95, 99])
+        report.update({
+            'mean_delta': float(deltas.mean()),
+            'mean_abs_delta': float(np.abs(deltas).mean()),
+            'p95_abs_delta': float(np.percentile(np.abs(deltas), 95)),
+            'mean_abs_pct_delta': float(abs_pct.mean()),
+            'primary_p50_ms': float(primary_p[0]),
+            'primary_p95_ms': float(primary_p[1]),
+            'primary_p99_ms': float(primary_p[2]),
+            'shadow_p50_ms': float(shadow_p[0]),
+            'shadow_p95_ms': float(shadow_p[1]),
+            'shadow_p99_ms': float(shadow_p[2])
+        })
+
+        # Terfi kriterleri: yeterli örnek, fiyat farkı ve p95 gecikme sınırlar içinde
+        latency_ratio = shadow_p[1] / max(primary_p[1], 1e-6)
+        if samples < self.config['min_samples']:
+            report.update(recommendation='wait', message=f"Yetersiz örnek: {samples}")
+        elif report['mean_abs_pct_delta'] > self.config['max_mean_abs_pct_delta']:
+            report.update(recommendation='reject',
+                          message=f"Ortalama fark %{report['mean_abs_pct_delta']:.1f}")
+        elif latency_ratio > self.config['max_latency_ratio']:
+            report.update(recommendation='reject', message=f"p95 gecikme {latency_ratio:.1f}x")
+        else:
+            report.update(recommendation='promote',
+                          message=f"Ortalama fark %{report['mean_abs_pct_delta']:.1f}, "
+                                  f"p95 gecikme {latency_ratio:.2f}x")
+        return report
+
+
+def promote(shadow_dir: str, bundle_dir: str) -> str:
+    """Shadow bundle'ı birincil bundle dizinine atomik olarak yaz"""
+    manifest = read_manifest(shadow_dir)
+    arrays = {name: np.load(os.path.join(shadow_dir, f"{name}.npy")) for name in manifest.get('arrays', {})}
+    manifest = {k: v for k, v in manifest.items() if k not in ('arrays', 'model_version')}
+    write_bundle(manifest, arrays, bundle_dir)
+    return read_manifest(bundle_dir)['model_version']
+
+
+def main():
+    from config import BUNDLE_DIR, SHADOW_CONFIG
+    parser = argparse.ArgumentParser(description='Shadow model yönetimi')
+    parser.add_argument('--promote', action='store_true', help='Shadow bundle\'ı birincil yap')
+    args = parser.parse_args()
+
+    if args.promote:
+        version = promote(SHADOW_CONFIG['bundle_dir'], BUNDLE_DIR)
+        print(f"[OK] Shadow model terfi edildi: {BUNDLE_DIR} (versiyon {version})")
+        print("     Çalışan sunucular yeniden başlatıldığında yeni modeli kullanır")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Ensemble sharding - büyük ağaç ensemble'larını worker process'lere bölerek değerlendirir
+
+Her worker bundle'ı mmap ile açar (sayfalar process'ler arasında paylaşılır) ve
+kendisine verilen [start, stop) ağaç aralığını batch üzerinde değerlendirir.
+Koordinatör kısmi toplamları birleştirir:
+    forest:   toplam / n_trees; güven için ilk FOREST_SPREAD_TREES ağacın çıktıları
+    boosting: init + lr * toplam; son BOOSTING_SPREAD_STAGES stage, sondaki ağaçların
+              kümülatif toplamından geriye doğru hesaplanır
+Sonuçlar tek process'teki TreeEnsembleModel ile aynıdır; gecikme çekirdek sayısıyla düşer.
+"""
+
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from artifact import load_bundle, BOOSTING_SPREAD_STAGES, FOREST_SPREAD_TREES
+
+# Her worker'da bir kez yüklenir
+_shard_model = None
+
+
+def _init_worker(bundle_dir: str):
+    global _shard_model
+    _shard_model, _ = load_bundle(bundle_dir)
+
+
+def _evaluate_shard(X: np.ndarray, start: int, stop: int, head: int, tail: int) -> Dict[str, np.ndarray]:
+    """
+    Worker: [start, stop) ağaçlarının toplamı + istenen baş/son ağaç çıktıları
+
+    head: global olarak ilk `head` ağacın (bu shard'a düşen kısmı) çıktısı döner
+    tail: global olarak son `tail` ağacın (bu shard'a düşen kısmı) çıktısı döner
+    """
+    values = _shard_model.tree_values(X, start, stop)
+    n_trees = _shard_model.n_trees
+    return {
+        'sum': values.sum(axis=0),
+        'head': values[:max(0, min(stop, head) - start)],
+        'tail': values[max(0, n_trees - tail - start):]
+    }
+
+
+def _ping() -> bool:
+    return _shard_model is not None
+
+
+class ShardedEnsembleModel:
+    """TreeEnsembleModel arayüzünde, ağaçları process havuzuna dağıtan model"""
+
+    def __init__(self, model, bundle_dir: str, workers: int):
+        if model.kind not in ('forest', 'boosting'):
+            raise ValueError(f"'{model.kind}' modeli shard'lanamaz")
+        self.local = model
+        self.workers = max(1, min(workers, model.n_trees))
+        # grpc thread'leri varken fork güvenli değil; worker'lar spawn ile başlatılır
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(bundle_dir,)
+        )
+        bounds = np.linspace(0, model.n_trees, self.workers + 1).round().astype(int)
+        self.shards: List[Tuple[int, int]] = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        atexit.register(self.close)
+        # Worker'ları yükleme sırasında ayağa kaldır (ilk istekte spawn beklenmesin)
+        for future in [self.pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def __getattr__(self, name):
+        # kind, n_trees, nbytes, leaf_indices, ... yerel (mmap'li) modelden
+        if name == 'local':
+            raise AttributeError(name)
+        return getattr(self.local, name)
+
+    def _gather(self, X: np.ndarray, head: int, tail: int) -> Dict[str, np.ndarray]:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        futures = [self.pool.submit(_evaluate_shard, X, start, stop, head, tail)
+                   for start, stop in self.shards]
+        parts = [future.result() for future in futures]
+        return {
+            'sum': np.sum([part['sum'] for part in parts], axis=0),
+            'head': np.concatenate([part['head'] for part in parts]),
+            'tail': np.concatenate([part['tail'] for part in parts])
+        }
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_with_spread(X)[0]
+
+    def predict_with_spread(self, X: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Tahmin + güven skoru için üye tahminleri (k, n)"""
+        local = self.local
+        if local.kind == 'forest':
+            parts = self._gather(X, FOREST_SPREAD_TREES, 0)
+            return parts['sum'] / local.n_trees, parts['head']
+
+        parts = self._gather(X, 0, BOOSTING_SPREAD_STAGES - 1)
+        final = local.init_value + local.learning_rate * parts['sum']
+        # staged[-1-i] = final - lr * (son i ağacın toplamı)
+        suffix = np.cumsum(parts['tail'][::-1], axis=0)[::-1]
+        staged = np.concatenate([final - local.learning_rate * suffix, final[None, :]])
+        return final, staged
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,217 @@
+"""
+Host seviyesinde paylaşılan tahmin cache'i - aynı makinedeki tüm grpc_server process'leri
+tek bir shared memory hash tablosunu kullanır (ağ atlaması yok)
+
+Tablo sabit boyutlu, açık adreslemeli (en fazla PROBE_LENGTH slot):
+    seq    uint64[n]      seqlock sayacı (tek = yazma sürüyor, 0 = boş)
+    keys   int64[n, 5]    (model_index, ram, storage, durum_kodu, versiyon_hash)
+    values float64[n, 4]  (fiyat, güven, min, max)
+
+Okuma kilitsizdir: seq okunur, satır kopyalanır, seq tekrar okunur; değiştiyse tekrar denenir.
+Yazma, slot'un şeridine (stripe) ait kilitle yapılır: process içi threading.Lock +
+process'ler arası fcntl byte-range kilidi. Eviction yok, dolu slotun üzerine yazılır.
+
+Kullanım:
+    python shared_cache.py --stats   # doluluk
+    python shared_cache.py --clear   # shared memory segmentini sil
+"""
+
+import argparse
+import os
+import threading
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: process'ler arası kilit yok, cache devre dışı
+    fcntl = None
+
+from config import SHARED_CACHE_CONFIG
+
+MAGIC = 0x1F0E_CACE_0001
+HEADER_BYTES = 64
+KEY_FIELDS = 5
+VALUE_FIELDS = 4
+PROBE_LENGTH = 4
+READ_RETRIES = 3
+
+Key = Tuple[int, int, int, int, int]
+
+
+def _layout(n_slots: int) -> Tuple[int, int, int, int]:
+    """(seq offset, keys offset, values offset, toplam boyut)"""
+    seq_offset = HEADER_BYTES
+    keys_offset = seq_offset + n_slots * 8
+    values_offset = keys_offset + n_slots * KEY_FIELDS * 8
+    return seq_offset, keys_offset, values_offset, values_offset + n_slots * VALUE_FIELDS * 8
+
+
+class SharedPredictionCache:
+    """multiprocessing.shared_memory üzerinde sabit boyutlu tahmin cache'i"""
+
+    def __init__(self, name: str, n_slots: int, stripes: int, lock_dir: str):
+        self.name = name
+        self.n_slots = n_slots
+        self.stripes = stripes
+        seq_offset, keys_offset, values_offset, size = _layout(n_slots)
+
+        self.shm, created = self._open(name, size)
+        buf = self.shm.buf
+        self.header = np.ndarray((2,), dtype=np.uint64, buffer=buf)
+        if created:
+            self.header[1] = n_slots
+            self.header[0] = MAGIC
+        else:
+            self._wait_ready()
+        self.seq = np.ndarray((n_slots,), dtype=np.uint64, buffer=buf, offset=seq_offset)
+        self.keys = np.ndarray((n_slots, KEY_FIELDS), dtype=np.int64, buffer=buf, offset=keys_offset)
+        self.values = np.ndarray((n_slots, VALUE_FIELDS), dtype=np.float64, buffer=buf, offset=values_offset)
+
+        self._lock_fd = os.open(os.path.join(lock_dir, f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        # fcntl kilitleri process başına; aynı process'in thread'leri için ayrıca yerel kilit
+        self._thread_locks = [threading.Lock() for _ in range(stripes)]
+        self._version_hashes = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _open(name: str, size: int) -> Tuple[shared_memory.SharedMemory, bool]:
+        try:
+            shm, created = shared_memory.SharedMemory(name=name, create=True, size=size), True
+        except FileExistsError:
+            shm, created = shared_memory.SharedMemory(name=name), False
+            if shm.size < size:
+                shm.close()
+                raise ValueError(f"'{name}' segmenti farklı boyutla oluşturulmuş; "
+                                 "python shared_cache.py --clear ile silin")
+        # Segment process'ten bağımsız yaşamalı; resource_tracker çıkışta silmesin
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm, created
+
+    def _wait_ready(self, timeout: float = 1.0):
+        """Segmenti oluşturan process header'ı yazana kadar bekle"""
+        deadline = time.monotonic() + timeout
+        while self.header[0] != MAGIC:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"'{self.name}' segmenti başlatılmamış")
+            time.sleep(0.001)
+        if int(self.header[1]) != self.n_slots:
+            raise ValueError(f"'{self.name}' segmenti {int(self.header[1])} slot ile oluşturulmuş "
+                             f"(config: {self.n_slots})")
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['SharedPredictionCache']:
+        """Kapalıysa ya da platform desteklemiyorsa None"""
+        if not config['enabled'] or fcntl is None:
+            return None
+        return cls(config['name'], config['slots'], config['stripes'], config['lock_dir'])
+
+    def key(self, model_index: int, ram_gb: int, storage_gb: int, condition_code: int,
+            model_version: str) -> Key:
+        """Normalize edilmiş anahtar; versiyon değişince eski girdiler kendiliğinden ıskalanır"""
+        version_hash = self._version_hashes.get(model_version)
+        if version_hash is None:
+            version_hash = zlib.crc32(model_version.encode('utf-8'))
+            self._version_hashes[model_version] = version_hash
+        return (int(model_index), int(ram_gb), int(storage_gb), int(condition_code), version_hash)
+
+    def _home(self, key: Key) -> int:
+        # int tuple hash'i PYTHONHASHSEED'den bağımsız, tüm process'lerde aynı
+        return hash(key) % self.n_slots
+
+    def get(self, key: Key) -> Optional[np.ndarray]:
+        """(fiyat, güven, min, max) ya da None - kilitsiz seqlock okuma"""
+        home = self._home(key)
+        for probe in range(PROBE_LENGTH):
+            slot = (home + probe) % self.n_slots
+            for _ in range(READ_RETRIES):
+                before = int(self.seq[slot])
+                if before & 1:
+                    continue
+                stored_key = tuple(self.keys[slot].tolist())
+                values = self.values[slot].copy()
+                if int(self.seq[slot]) == before:
+                    break
+            else:
+                # Yazma sürekli çakıştı; ıska say
+                continue
+            if before == 0:
+                break
+            if stored_key == key:
+                self.hits += 1
+                return values
+        self.misses += 1
+        return None
+
+    def put(self, key: Key, values):
+        """Girdiyi yaz: aynı anahtar > boş slot > ana slot (üzerine yazılır)"""
+        home = self._home(key)
+        target = home
+        for probe in range(PROBE_LENGTH):
+            slot = (home + probe) % self.n_slots
+            if self.seq[slot] == 0 or tuple(self.keys[slot].tolist()) == key:
+                target = slot
+                break
+
+        stripe = target % self.stripes
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                self.seq[target] += 1
+                self.keys[target] = key
+                self.values[target] = values
+                self.seq[target] += 1
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    def stats(self) -> Dict:
+        used = int(np.count_nonzero(self.seq))
+        return {
+            'slots': self.n_slots,
+            'used': used,
+            'fill': round(used / self.n_slots, 4),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def close(self):
+        os.close(self._lock_fd)
+        del self.header, self.seq, self.keys, self.values
+        self.shm.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Paylaşılan tahmin cache yönetimi')
+    parser.add_argument('--stats', action='store_true', help='Doluluk bilgisini yazdır')
+    parser.add_argument('--clear', action='store_true', help='Shared memory segmentini sil')
+    args = parser.parse_args()
+
+    name = SHARED_CACHE_CONFIG['name']
+    if args.clear:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            print(f"'{name}' segmenti yok")
+            return
+        shm.close()
+        shm.unlink()
+        print(f"[OK] '{name}' segmenti silindi")
+        return
+
+    if fcntl is None:
+        print("Bu platformda paylaşılan cache desteklenmiyor")
+        return
+    cache = SharedPredictionCache(name, SHARED_CACHE_CONFIG['slots'], SHARED_CACHE_CONFIG['stripes'],
+                                  SHARED_CACHE_CONFIG['lock_dir'])
+    stats = cache.stats()
+    print(f"'{name}': {stats['used']:,} / {stats['slots']:,} slot dolu (%{stats['fill'] * 100:.1f})")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Başlangıç süresi ölçümü - grpc_server'ın import/yükleme fazlarını raporlar
+Kullanım: python grpc_server.py --measure-startup
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupTimer:
+    """Başlangıç fazlarının sürelerini sırasıyla kaydeder"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def add(self, name: str, seconds: float):
+        """Başka bir bileşenin ölçtüğü fazı ekle (örn. predictor.load_timings)"""
+        self.phases.append((name, seconds))
+
+    def extend(self, timings: Dict[str, float], prefix: str = ''):
+        for name, seconds in timings.items():
+            self.add(prefix + name, seconds)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.origin) * 1000
+
+    def report(self, budget_ms: float, label: str = 'Hazır') -> str:
+        """Faz tablosunu ve bütçe karşılaştırmasını metin olarak döndür"""
+        total_ms = self.elapsed_ms()
+        lines = ["Başlangıç süreleri:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<28} {seconds * 1000:8.1f} ms")
+        verdict = 'OK' if total_ms <= budget_ms else 'BÜTÇE AŞILDI'
+        lines.append(f"  {label:<28} {total_ms:8.1f} ms  (bütçe {budget_ms:.0f} ms: {verdict})")
+        return '\n'.join(lines)
@@ -0,0 +1,144 @@
+"""
+Asenkron, yapılandırılmış loglama - ML servisinin istek yolunu I/O'dan ayırır
+İstek thread'i sadece LogRecord'u kuyruğa atar; formatlama ve yazma
+arka plandaki QueueListener thread'inde yapılır
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# LogRecord'un standart alanları - JSON'a "extra" olarak yazılmaz
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satır JSON olarak yazar; extra={...} alanları da eklenir"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Kaydı formatlamadan kuyruğa atan handler
+
+    Standart QueueHandler.prepare() mesajı çağıran thread'de formatlar;
+    aynı process içinde kaldığımız için bunu listener thread'ine bırakıyoruz.
+    Kuyruk doluysa istek thread'ini bloklamak yerine kaydı düşürür; kuyrukta yer
+    açılınca düşürülenler tek bir WARNING kaydıyla bildirilir (sayaç HealthCheck'te de).
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self.dropped != self._reported:
+                self._report_drops()
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _report_drops(self):
+        dropped = self.dropped
+        self.queue.put_nowait(logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': "Log kuyruğu doldu: %d kayıt düşürüldü (toplam %d)",
+            'args': (dropped - self._reported, dropped)
+        }))
+        self._reported = dropped
+
+
+def dropped_records() -> int:
+    """Kuyruk dolduğu için düşürülen log kaydı sayısı (async modda)"""
+    return sum(handler.dropped for handler in logging.getLogger().handlers
+               if isinstance(handler, DeferredQueueHandler))
+
+
+class RequestLogSampler:
+    """Her N istekten birini loglamak için sayaç bazlı örnekleyici"""
+
+    def __init__(self, rate: float):
+        self.every = 0 if rate <= 0 else max(1, round(1 / rate))
+        self._counter = itertools.count()
+
+    def sample(self) -> bool:
+        if self.every == 0:
+            return False
+        # itertools.count'un next() çağrısı GIL altında atomik
+        return next(self._counter) % self.every == 0
+
+
+def setup_logging(config: Dict, stream=None) -> Optional[logging.handlers.QueueListener]:
+    """
+    Root logger'ı config'e göre kur
+
+    config['mode']: 'async' (QueueHandler + arka plan thread) veya 'sync'
+    config['format']: 'json' veya 'text'
+    """
+    global _listener
+
+    if config.get('format') == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+    if config.get('file'):
+        target = logging.FileHandler(config['file'], encoding='utf-8')
+    else:
+        target = logging.StreamHandler(stream or sys.stderr)
+    target.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(config.get('level', 'INFO'))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    _stop_listener()
+
+    if config.get('mode', 'async') != 'async':
+        root.addHandler(target)
+        return None
+
+    log_queue = queue.Queue(maxsize=config.get('queue_size', 10000))
+    root.addHandler(DeferredQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def _stop_listener():
+    """Kuyrukta kalan kayıtları yazıp listener thread'ini durdur"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
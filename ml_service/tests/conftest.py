@@ -0,0 +1,6 @@
+"""ml_service modülleri düz import edildiğinden (from config import ...) dizin path'e eklenir"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,64 @@
+from degraded import DegradedModeSwitch
+
+
+def _switch(cpu: float, **kwargs) -> DegradedModeSwitch:
+    """CPU ölçümü sabitlenmiş anahtar (aralık hiç dolmaz, cpu değişmez)"""
+    params = dict(queue_wait_threshold_ms=20.0, cpu_threshold=0.9, min_hold_sec=0.0,
+                  exit_ratio=0.5, smoothing=1.0, cpu_interval_sec=float('inf'))
+    params.update(kwargs)
+    switch = DegradedModeSwitch(**params)
+    switch.cpu = cpu
+    return switch
+
+
+def test_busy_but_unqueued_stays_on_primary():
+    switch = _switch(cpu=1.0)
+    for _ in range(100):
+        switch.observe_queue_wait(0.0005)
+        assert not switch.active()
+    assert switch.snapshot()['switches'] == 0
+
+
+def test_queued_and_busy_degrades():
+    switch = _switch(cpu=1.0)
+    switch.observe_queue_wait(0.1)
+    assert switch.active()
+
+
+def test_queued_but_idle_cpu_stays_on_primary():
+    switch = _switch(cpu=0.2)
+    switch.observe_queue_wait(0.1)
+    assert not switch.active()
+
+
+def test_cpu_check_disabled_uses_queue_only():
+    switch = _switch(cpu=0.0, cpu_threshold=None)
+    switch.observe_queue_wait(0.1)
+    assert switch.active()
+
+
+def test_exit_ignores_cpu():
+    switch = _switch(cpu=1.0)
+    switch.observe_queue_wait(0.1)
+    assert switch.active()
+    switch.observe_queue_wait(0.0)
+    assert not switch.active()
+
+
+def test_executor_exposes_submit_time_to_queued_job():
+    import threading
+    import time
+
+    from degraded import QueueTimingExecutor, submitted_ns
+
+    release = threading.Event()
+    with QueueTimingExecutor(max_workers=1) as executor:
+        executor.submit(release.wait)
+        before = time.time_ns()
+        queued = executor.submit(submitted_ns)
+        time.sleep(0.05)
+        release.set()
+        arrival = queued.result()
+    # Kuyruğa girdiği an, worker'ın aldığı an değil
+    assert before <= arrival < before + 40_000_000
+    assert submitted_ns() is None
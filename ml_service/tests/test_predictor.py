@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pytest
+
+from config import BUNDLE_DIR, FALLBACK_BUNDLE_DIR
+
+pytestmark = pytest.mark.skipif(
+    not (os.path.isdir(BUNDLE_DIR) and os.path.isdir(FALLBACK_BUNDLE_DIR)),
+    reason='model bundle yok (önce train_model.py)')
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    from predictor import PricePredictor
+    return PricePredictor()
+
+
+def test_degraded_outputs_respect_price_floor(predictor, monkeypatch):
+    from predictor import MIN_PRICE
+    assert predictor.degraded is not None
+    monkeypatch.setattr(predictor.degraded, 'active', lambda: True)
+
+    rows = [{'model_name': 'iPhone 8', 'ram_gb': 2, 'storage_gb': storage, 'condition': condition}
+            for storage in (64, 128, 256) for condition in ('Mükemmel', 'İyi', 'Orta', 'Outlet')]
+    X = np.vstack([predictor.encoder.encode(row) for row in rows])
+    scores = predictor.predict_matrix(X)
+
+    assert scores['degraded']
+    assert np.all(scores['predicted_price'] >= MIN_PRICE)
+    assert np.all(scores['min_price'] >= MIN_PRICE)
+    assert np.all(scores['min_price'] <= scores['predicted_price'])
+    assert np.all(scores['max_price'] >= scores['predicted_price'])
+
+
+def test_price_grid_has_one_cell_per_storage_and_condition_score(predictor):
+    from config import CONDITION_SCORES, MODEL_STORAGE_OPTIONS
+    cells = predictor.price_grid('iPhone 13')
+    keys = [(cell['storage_gb'], CONDITION_SCORES[cell['condition']]) for cell in cells]
+    assert len(keys) == len(set(keys))
+    assert len(keys) == len(MODEL_STORAGE_OPTIONS['iPhone 13']) * len(set(CONDITION_SCORES.values()))
@@ -0,0 +1,36 @@
+import os
+import time
+
+import pytest
+
+from config import BUNDLE_DIR, SHADOW_CONFIG
+from shadow import ShadowEvaluator, ShadowSampler
+
+
+def test_sampler_rate():
+    assert not any(ShadowSampler(0.0).sample() for _ in range(1000))
+    assert all(ShadowSampler(1.0).sample() for _ in range(1000))
+    hits = sum(ShadowSampler(0.3).sample() for _ in range(20000))
+    assert 5400 < hits < 6600
+
+
+@pytest.mark.skipif(not os.path.isdir(BUNDLE_DIR), reason='model bundle yok (önce train_model.py)')
+def test_shadow_scores_with_public_encoder_path():
+    from predictor import PricePredictor
+    primary = PricePredictor(with_shadow=False)
+    shadow = ShadowEvaluator(PricePredictor(with_shadow=False), primary.model_version, SHADOW_CONFIG)
+
+    input_data = {'model_name': 'iPhone 13', 'ram_gb': 4, 'storage_gb': 128, 'condition': 'İyi'}
+    result = primary.predict(input_data)
+    shadow.submit(input_data, result['predicted_price'], 0.001)
+    # Cache isabeti: birincil gecikmesi yok
+    shadow.submit(input_data, result['predicted_price'], None)
+
+    deadline = time.monotonic() + 5
+    while shadow.deltas.count < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    report = shadow.report()
+    assert report['samples'] == 2
+    assert report['errors'] == 0
+    assert abs(report['mean_delta']) < 1
+    assert shadow.primary_latency.count == 1
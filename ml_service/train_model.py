@@ -5,7 +5,7 @@ iPhone Fiyat Tahmin - ML Model Eğitimi
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, cross_val_score, cross_val_predict, KFold
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.tree import DecisionTreeRegressor
@@ -13,6 +13,11 @@ from sklearn.linear_model import Ridge, LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import joblib
 import os
+from artifact import export_bundle, read_manifest
+from config import DRIFT_CONFIG, DRIFT_REFERENCE_PATH, FALLBACK_BUNDLE_DIR
+from data_quality import validate_dataset, format_report
+from drift import build_reference, save_reference
+from intervals import GROUP_COLS, build_residual_index
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -20,27 +25,26 @@ warnings.filterwarnings('ignore')
 DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'dataset.csv')
 MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models')
 
+# Yeni veri seti feature sırası
+FEATURE_COLS = ['segment', 'seri_no', 'ram_gb', 'kamera_mp', 'ekran_boyutu',
+                'batarya_mah', 'storage_gb', 'cihaz_durum', 'cikis_yili']
+
 def load_and_prepare_data():
     """Veriyi yükle ve hazırla - Yeni veri seti formatı"""
     print("="*60)
     print("VERİ YÜKLEME")
     print("="*60)
     
-    df = pd.read_csv(DATA_PATH)
-    print(f"Toplam veri: {len(df)} satır")
-    print(f"Kolonlar: {list(df.columns)}")
-    
-    # Yeni veri seti feature sırası:
-    # segment, seri_no, ram_gb, kamera_mp, ekran_boyutu, batarya_mah, storage_gb, cihaz_durum, cikis_yili
-    feature_cols = ['segment', 'seri_no', 'ram_gb', 'kamera_mp', 'ekran_boyutu', 
-                    'batarya_mah', 'storage_gb', 'cihaz_durum', 'cikis_yili']
+    columns = list(pd.read_csv(DATA_PATH, nrows=0).columns)
+    print(f"Kolonlar: {columns}")
     
     # Eksik kolonları kontrol et
-    available_cols = [col for col in feature_cols if col in df.columns]
+    available_cols = [col for col in FEATURE_COLS if col in columns]
     print(f"Kullanılan özellikler: {available_cols}")
     
-    X = df[available_cols].copy()
-    y = df['cihaz_fiyat'].copy()
+    # Tekrar silme, aralık kontrolü ve grup bazlı aykırı fiyat filtresi (tek geçiş)
+    X, y, report = validate_dataset(DATA_PATH, available_cols)
+    print(f"\n[+] Veri kalitesi:\n{format_report(report)}")
     
     # Eksik değerleri doldur
     X = X.fillna(X.median())
@@ -52,8 +56,24 @@ def load_and_prepare_data():
     return X, y, available_cols
 
 
-def train_and_evaluate():
-    """3 farklı algoritma ile eğit ve karşılaştır"""
+def residual_index(model, X, y, use_scaler, scaler):
+    """
+    Conformal aralıklar için 5-fold out-of-fold residual'lar (gerçek - tahmin),
+    (seri_no, storage_gb) kovalarına göre sıralı (bkz. intervals.py)
+    """
+    features = scaler.transform(X) if use_scaler else X
+    oof = cross_val_predict(model, features, y, cv=KFold(5, shuffle=True, random_state=42))
+    return build_residual_index(X[GROUP_COLS[0]].to_numpy(), X[GROUP_COLS[1]].to_numpy(),
+                                y.to_numpy() - oof)
+
+
+def train_and_evaluate(forest_trees=200):
+    """
+    3 farklı algoritma ile eğit ve karşılaştır
+    
+    forest_trees: Random Forest ağaç sayısı (binlerce ağaçlı modeller için
+    config.py'de SHARDING_CONFIG ile sharded inference açılabilir)
+    """
     X, y, feature_cols = load_and_prepare_data()
     
     # Train-test split
@@ -73,7 +93,7 @@ def train_and_evaluate():
     # 5 farklı algoritma
     models = {
         'Random Forest': RandomForestRegressor(
-            n_estimators=200,
+            n_estimators=forest_trees,
             max_depth=15,
             min_samples_split=5,
             min_samples_leaf=2,
@@ -160,9 +180,7 @@ def train_and_evaluate():
     scaler_file = os.path.join(MODEL_PATH, 'scaler.pkl')
     config_file = os.path.join(MODEL_PATH, 'model_config.pkl')
     
-    joblib.dump(best_result['model'], model_file)
-    joblib.dump(scaler, scaler_file)
-    joblib.dump({
+    model_config = {
         'model_name': best_name,
         'feature_cols': feature_cols,
         'use_scaler': best_result['use_scaler'],
@@ -171,11 +189,47 @@ def train_and_evaluate():
             'mae': best_result['mae'],
             'rmse': best_result['rmse']
         }
-    }, config_file)
+    }
+    
+    joblib.dump(best_result['model'], model_file)
+    joblib.dump(scaler, scaler_file)
+    joblib.dump(model_config, config_file)
+    
+    # Tahmin aralıkları seri_no/storage_gb kovalarına göre; veri setinde yoksa ±2*MAE kullanılır
+    has_groups = all(col in feature_cols for col in GROUP_COLS)
+    
+    # Servis için mmap'lenebilir bundle (predictor önce bunu kullanır)
+    bundle_dir = export_bundle(
+        best_result['model'], scaler, model_config, os.path.join(MODEL_PATH, 'bundle'),
+        residual_index(best_result['model'], X, y, best_result['use_scaler'], scaler) if has_groups else None
+    )
+    
+    # Aşırı yükte kullanılan ucuz yedek model (doğrusal modellerin en iyisi)
+    fallback_name = max(['Linear Regression', 'Ridge Regression'], key=lambda x: results[x]['r2'])
+    fallback_result = results[fallback_name]
+    fallback_dir = export_bundle(fallback_result['model'], scaler, {
+        'model_name': fallback_name,
+        'feature_cols': feature_cols,
+        'use_scaler': fallback_result['use_scaler'],
+        'metrics': {
+            'r2': fallback_result['r2'],
+            'mae': fallback_result['mae'],
+            'rmse': fallback_result['rmse']
+        }
+    }, FALLBACK_BUNDLE_DIR,
+        residual_index(fallback_result['model'], X, y, True, scaler) if has_groups else None)
+    
+    # Canlı drift izleme için referans profil (tüm temiz veri + modelin tahminleri)
+    reference_prices = best_result['model'].predict(scaler.transform(X) if best_result['use_scaler'] else X)
+    save_reference(build_reference(X.values, feature_cols, reference_prices, DRIFT_CONFIG,
+                                   read_manifest(bundle_dir)['model_version']), DRIFT_REFERENCE_PATH)
     
     print(f"\n[OK] Model kaydedildi: {model_file}")
     print(f"[OK] Scaler kaydedildi: {scaler_file}")
     print(f"[OK] Config kaydedildi: {config_file}")
+    print(f"[OK] Bundle kaydedildi: {bundle_dir}")
+    print(f"[OK] Yedek model kaydedildi: {fallback_dir} ({fallback_name}, R² {fallback_result['r2']:.4f})")
+    print(f"[OK] Drift referansı kaydedildi: {DRIFT_REFERENCE_PATH}")
     
     # Feature importance (Random Forest veya Gradient Boosting için)
     if hasattr(best_result['model'], 'feature_importances_'):
@@ -234,4 +288,9 @@ def predict_price(ram_gb, storage_gb, condition, model_name):
 
 
 if __name__ == "__main__":
-    train_and_evaluate()
+    import argparse
+    parser = argparse.ArgumentParser(description='iPhone fiyat modelini eğit')
+    parser.add_argument('--forest-trees', type=int, default=200,
+                        help='Random Forest ağaç sayısı')
+    args = parser.parse_args()
+    train_and_evaluate(forest_trees=args.forest_trees)